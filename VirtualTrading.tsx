@@ -23,7 +23,7 @@ import {
   X,
   Tag,
 } from "lucide-react";
-import { searchNasdaqStocks, getYFinanceQuotes } from "./services/stockService";
+import { searchNasdaqStocks, getYFinanceQuotes, subscribeQuotes } from "./services/stockService";
 
 const QUOTE_CACHE_KEY = "finguide_live_quotes_v1";
 
@@ -231,7 +231,7 @@ const VirtualTrading: React.FC = () => {
     }
   };
 
-  // --- 실시간 시세 업데이트 (폴링) ---
+  // --- 실시간 시세 업데이트 (SSE 스트림, 불가능하면 폴링) ---
   useEffect(() => {
     const symbols = Array.from(
       new Set([
@@ -243,31 +243,39 @@ const VirtualTrading: React.FC = () => {
     if (symbols.length === 0) return;
 
     let isCancelled = false;
+    let pollId: number | undefined;
+
+    const applyQuotes = (quotes: Record<string, { price: number; change_pct: number }>) => {
+      if (isCancelled) return;
+      setLivePrices((prev) => {
+        const merged = { ...prev, ...quotes };
+        try {
+          localStorage.setItem(QUOTE_CACHE_KEY, JSON.stringify(merged));
+        } catch (e) {
+          console.warn("Failed to save quote cache", e);
+        }
+        return merged;
+      });
+    };
 
     const fetchQuotes = async () => {
       try {
-        const quotes = await getYFinanceQuotes(symbols);
-        if (!isCancelled) {
-          setLivePrices((prev) => {
-            const merged = { ...prev, ...quotes };
-            try {
-              localStorage.setItem(QUOTE_CACHE_KEY, JSON.stringify(merged));
-            } catch (e) {
-              console.warn("Failed to save quote cache", e);
-            }
-            return merged;
-          });
-        }
+        applyQuotes(await getYFinanceQuotes(symbols));
       } catch (err) {
         console.error("Realtime quote fetch error:", err);
       }
     };
 
-    fetchQuotes();
-    const id = window.setInterval(fetchQuotes, 3 * 60 * 1000);
+    const unsubscribe = subscribeQuotes(symbols, applyQuotes, () => {
+      if (isCancelled || pollId !== undefined) return;
+      fetchQuotes();
+      pollId = window.setInterval(fetchQuotes, 3 * 60 * 1000);
+    });
+
     return () => {
       isCancelled = true;
-      window.clearInterval(id);
+      unsubscribe();
+      if (pollId !== undefined) window.clearInterval(pollId);
     };
   }, [searchResults, portfolio?.assets]);
 
@@ -0,0 +1,138 @@
+// api/knowledge/search.ts
+// Vercel Serverless Function: same contract as the Python /api/knowledge/search
+// (services/knowledge_search.py), so the frontend works with or without VITE_BACKEND_URL.
+// The connection string stays on the server (DATABASE_URL env), never in the bundle.
+
+import { Pool } from "@neondatabase/serverless";
+
+const MAX_TOP_K = 20;
+
+// Same stop phrases / query variants as services/knowledge_search.py
+const STOP_PHRASES = [
+  "어떻게", "왜", "요즘", "지금", "좀", "알려줘", "궁금", "가능", "해줘",
+  "뭐야", "뭔가", "어떤", "관련", "대해", "대한", "정리", "설명", "뉴스",
+  "같은", "거", "것", "수", "있어", "있나", "해줄래", "부탁", "해봐",
+];
+
+// Uses the stored tsv column + GIN index (python -m services.knowledge_search migration).
+const SEARCH_SQL = `
+  SELECT doc_id,
+         coalesce(title,'') AS title,
+         coalesce(body,'')  AS body,
+         press,
+         published_at,
+         ts_rank_cd(tsv, q) AS rank
+    FROM doc, websearch_to_tsquery('simple', $1) AS q
+   WHERE tsv @@ q
+   ORDER BY rank DESC
+   LIMIT $2;
+`;
+
+// Before the migration has run: compute the tsvector per row (no index).
+const SEARCH_SQL_UNINDEXED = `
+  SELECT doc_id,
+         coalesce(title,'') AS title,
+         coalesce(body,'')  AS body,
+         press,
+         published_at,
+         ts_rank_cd(
+           to_tsvector('simple', coalesce(title,'') || ' ' || coalesce(body,'')), q
+         ) AS rank
+    FROM doc, websearch_to_tsquery('simple', $1) AS q
+   WHERE to_tsvector('simple', coalesce(title,'') || ' ' || coalesce(body,'')) @@ q
+   ORDER BY rank DESC
+   LIMIT $2;
+`;
+
+// Reused across warm invocations of the same function instance.
+let pool: Pool | null = null;
+
+function getPool(): Pool | null {
+  const conn = process.env.DATABASE_URL || process.env.NEON_DATABASE_URL;
+  if (!conn) return null;
+  if (!pool) pool = new Pool({ connectionString: conn });
+  return pool;
+}
+
+function normalizeKo(q: string, maxLen: number = 60): string {
+  let s = (q || "").trim();
+  if (!s) return "";
+  for (const w of STOP_PHRASES) {
+    s = s.split(w).join(" ");
+  }
+  return s.replace(/\s+/g, " ").trim().substring(0, maxLen);
+}
+
+function fallbackOr(q: string, maxTerms: number = 5): string {
+  const toks = normalizeKo(q, 120)
+    .split(/\s+/)
+    .filter((t) => t.length >= 2)
+    .slice(0, maxTerms);
+  return toks.length > 0 ? toks.join(" OR ") : q || "";
+}
+
+function queryVariants(userQuery: string): string[] {
+  const raw = (userQuery || "").trim();
+  const tries: string[] = [];
+  for (const q of [raw, normalizeKo(raw), fallbackOr(raw)]) {
+    if (q && !tries.includes(q)) tries.push(q);
+  }
+  return tries;
+}
+
+let indexed = true;
+
+async function runFts(db: Pool, q: string, topK: number): Promise<any[]> {
+  try {
+    const { rows } = await db.query(indexed ? SEARCH_SQL : SEARCH_SQL_UNINDEXED, [q, topK]);
+    return rows;
+  } catch (err: any) {
+    // 42703 = undefined_column: the tsv migration has not been applied yet
+    if (indexed && err?.code === "42703") {
+      indexed = false;
+      return runFts(db, q, topK);
+    }
+    throw err;
+  }
+}
+
+export default async function handler(req: any, res: any) {
+  const q = (req.query?.q || req.query?.query || "").toString().trim();
+  if (!q) {
+    res.status(200).json({ query: "", docs: [] });
+    return;
+  }
+  const topK = Math.max(1, Math.min(MAX_TOP_K, parseInt((req.query?.top_k || "6").toString(), 10) || 6));
+
+  const db = getPool();
+  if (!db) {
+    res.status(503).json({ error: "DATABASE_URL not configured" });
+    return;
+  }
+
+  try {
+    let used = q;
+    let docs: any[] = [];
+    for (const variant of queryVariants(q)) {
+      docs = await runFts(db, variant, topK);
+      used = variant;
+      if (docs.length > 0) break;
+    }
+    res.setHeader("Cache-Control", "public, max-age=60");
+    res.status(200).json({
+      query: used,
+      docs: docs.map((r) => ({
+        doc_id: r.doc_id,
+        title: r.title || "",
+        body: r.body || "",
+        press: r.press,
+        published_at:
+          r.published_at instanceof Date ? r.published_at.toISOString() : r.published_at,
+        rank: Number(r.rank || 0),
+      })),
+    });
+  } catch (err: any) {
+    console.error("[api/knowledge/search] error:", err);
+    res.status(500).json({ error: String(err?.message || err || "Unknown error") });
+  }
+}
@@ -0,0 +1,155 @@
+# backend/backtest_engine.py
+"""
+로컬 히스토리 저장소(backend/history_store.py)의 일봉 위에서 도는 벡터화 백테스트 엔진.
+
+- 모든 심볼을 (날짜 x 심볼) 종가 행렬 하나로 정렬한 뒤, 리밸런싱 구간별 성장률을
+  fancy indexing 으로 한 번에 계산한다 (날짜/심볼에 대한 Python 루프 없음).
+- 리밸런싱 시점 r_k 사이의 포트폴리오 가치:
+      V(t) = V(r_k) * sum_i w_i * P_i(t) / P_i(r_k)
+"""
+import logging
+
+import numpy as np
+
+from backend import history_store
+
+log = logging.getLogger(__name__)
+
+REBALANCE_RULES = ("none", "daily", "weekly", "monthly", "quarterly")
+TRADING_DAYS = 252
+
+
+def _day_keys(ts):
+    # 일봉 timestamp 는 거래소 현지 자정 기준 → +12h 후 UTC 날짜로 자르면 현지 날짜와 같다
+    return (np.asarray(ts, dtype=np.int64) + 43200) // 86400
+
+
+def align_closes(series):
+    """
+    series: [(ts int64[], close float64[]), ...] (심볼 순서)
+    Returns: (days int64[T], closes float64[T, N]) - 날짜 합집합 기준, forward-fill 적용
+    """
+    day_lists = [_day_keys(ts) for ts, _ in series]
+    days = np.unique(np.concatenate(day_lists)) if day_lists else np.empty(0, dtype=np.int64)
+    closes = np.full((len(days), len(series)), np.nan)
+    for i, (d, (_, close)) in enumerate(zip(day_lists, series)):
+        closes[np.searchsorted(days, d), i] = close
+
+    # forward-fill (휴장일이 다른 시장이 섞여 있어도 직전 종가 유지)
+    valid = ~np.isnan(closes)
+    idx = np.where(valid, np.arange(len(days))[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    closes = closes[idx, np.arange(len(series))]
+    return days, closes
+
+
+def rebalance_points(days, rule):
+    """리밸런싱이 일어나는 행 인덱스 (항상 0 포함)."""
+    n = len(days)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    if rule == "none":
+        return np.zeros(1, dtype=np.int64)
+    if rule == "daily":
+        return np.arange(n)
+    dates = days.astype("datetime64[D]")
+    if rule == "weekly":
+        period = (days + 3) // 7  # 1970-01-01 은 목요일 → 월요일 시작 주 번호
+    elif rule == "monthly":
+        period = dates.astype("datetime64[M]").astype(np.int64)
+    elif rule == "quarterly":
+        period = dates.astype("datetime64[M]").astype(np.int64) // 3
+    else:
+        raise ValueError(f"rebalance must be one of: {', '.join(REBALANCE_RULES)}")
+    change = np.flatnonzero(period[1:] != period[:-1]) + 1
+    return np.concatenate(([0], change))
+
+
+def run(days, closes, weights, rebalance="monthly", initial_capital=10000.0):
+    """
+    days: int64[T], closes: float64[T, N] (NaN 없음), weights: float64[N] (합 1)
+    Returns dict: equity[T], drawdown[T], asset_returns[N] + 요약 지표
+    """
+    t = closes.shape[0]
+    rb = rebalance_points(days, rebalance)
+
+    # k(t): t 보다 앞선 마지막 리밸런싱 구간 번호, s(t): 그 구간의 시작 행
+    k = np.searchsorted(rb, np.arange(t), side="left") - 1
+    k[0] = 0
+    start_rows = rb[k]
+
+    # 구간 시작 대비 성장률 g(t) = sum_i w_i * P_i(t) / P_i(s(t))
+    growth = (closes / closes[start_rows]) @ weights
+    # 리밸런싱 시점까지 누적된 구간 성장률 (cum[k] = prod_{j<=k} g(r_j))
+    seg_factor = np.concatenate(([1.0], growth[rb[1:]]))
+    cum = np.cumprod(seg_factor)
+    equity = initial_capital * cum[k] * growth
+    equity[0] = initial_capital
+
+    running_max = np.maximum.accumulate(equity)
+    drawdown = equity / running_max - 1.0
+    daily_ret = equity[1:] / equity[:-1] - 1.0 if t > 1 else np.zeros(0)
+
+    years = max((days[-1] - days[0]) / 365.25, 1e-9) if t > 1 else 0.0
+    total_return = equity[-1] / initial_capital - 1.0
+    cagr = (equity[-1] / initial_capital) ** (1.0 / years) - 1.0 if years > 0 else 0.0
+    vol = float(daily_ret.std(ddof=1) * np.sqrt(TRADING_DAYS)) if len(daily_ret) > 1 else 0.0
+    mean = float(daily_ret.mean() * TRADING_DAYS) if len(daily_ret) else 0.0
+
+    return {
+        "equity": equity,
+        "drawdown": drawdown,
+        "asset_returns": closes[-1] / closes[0] - 1.0,
+        "total_return": float(total_return),
+        "cagr": float(cagr),
+        "volatility": vol,
+        "sharpe": mean / vol if vol > 0 else 0.0,
+        "max_drawdown": float(drawdown.min()) if t else 0.0,
+        "rebalance_count": int(len(rb) - 1),
+    }
+
+
+def backtest(symbols, weights=None, rebalance="monthly", start=None, end=None,
+             initial_capital=10000.0, refresh=True):
+    """
+    심볼 목록과 비중으로 일봉 백테스트를 수행한다.
+    start/end: "YYYY-MM-DD" (모든 심볼의 데이터가 있는 첫 날 이후로 자동 보정)
+    """
+    if rebalance not in REBALANCE_RULES:
+        raise ValueError(f"rebalance must be one of: {', '.join(REBALANCE_RULES)}")
+    if weights is None:
+        weights = np.full(len(symbols), 1.0 / len(symbols))
+    weights = np.asarray(weights, dtype=float)
+    if weights.shape != (len(symbols),) or np.any(weights < 0) or weights.sum() <= 0:
+        raise ValueError("weights must be non-negative numbers, one per symbol")
+    weights = weights / weights.sum()
+
+    series = []
+    for sym in symbols:
+        if refresh:
+            try:
+                history_store.ensure(sym, "1d")
+            except Exception as e:
+                log.warning("history refresh error for %s: %s", sym, e)
+        cols = history_store.load(sym, "1d")
+        if len(cols["ts"]) == 0:
+            raise ValueError(f"no price history for {sym}")
+        series.append((cols["ts"], cols["close"]))
+
+    days, closes = align_closes(series)
+    # 모든 심볼의 가격이 존재하는 첫 날부터 시작
+    first_common = int(np.max(np.argmax(~np.isnan(closes), axis=0)))
+    lo = first_common
+    hi = len(days)
+    if start:
+        lo = max(lo, int(np.searchsorted(days, np.datetime64(start, "D").astype(np.int64), side="left")))
+    if end:
+        hi = int(np.searchsorted(days, np.datetime64(end, "D").astype(np.int64), side="right"))
+    if hi - lo < 2:
+        raise ValueError("not enough overlapping history for the requested period")
+
+    days = days[lo:hi]
+    result = run(days, closes[lo:hi], weights, rebalance, float(initial_capital))
+    result["days"] = days
+    result["weights"] = weights
+    return result
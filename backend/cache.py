@@ -0,0 +1,75 @@
+# backend/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+
+# 선택적 계측 훅 (backend/metrics.py 가 설정): fn(cache_name, hit: bool)
+_lookup_hook = None
+
+
+def set_lookup_hook(fn):
+    global _lookup_hook
+    _lookup_hook = fn
+
+
+class TTLCache:
+    """
+    프로세스 로컬 TTL + LRU 캐시 (thread-safe).
+    - ttl 초가 지난 항목은 조회 시 만료 처리
+    - maxsize 를 넘으면 가장 오래 사용되지 않은 항목부터 제거
+    """
+
+    _MISSING = object()
+
+    def __init__(self, ttl: float, maxsize: int = 1024, name: str = ""):
+        self.ttl = float(ttl)
+        self.maxsize = int(maxsize)
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        value = self._lookup(key)
+        hit = value is not self._MISSING
+        if _lookup_hook is not None:
+            _lookup_hook(self.name, hit)
+        return value if hit else default
+
+    def _lookup(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING:
+                self.misses += 1
+                return self._MISSING
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return self._MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else float(ttl))
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
@@ -1,7 +1,11 @@
 # backend/db.py
 import os
+import threading
+from contextlib import contextmanager
+
 import psycopg2
 import psycopg2.extras
+import psycopg2.pool
 
 from dotenv import load_dotenv
 
@@ -9,8 +13,8 @@ from dotenv import load_dotenv
 load_dotenv(".env.backend")
 
 
-def get_connection():
-    conn = psycopg2.connect(
+def _connection_kwargs():
+    return dict(
         host=os.getenv("DB_HOST"),
         port=os.getenv("DB_PORT", "5432"),
         database=os.getenv("DB_NAME"),
@@ -18,4 +22,53 @@ def get_connection():
         password=os.getenv("DB_PASSWORD"),
         sslmode=os.getenv("DB_SSLMODE", "require"),
     )
+
+
+def get_connection():
+    conn = psycopg2.connect(**_connection_kwargs())
     return conn
+
+
+# ---- Connection pool (요청마다 새로 connect 하지 않도록) ----
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """
+    프로세스 단위 ThreadedConnectionPool 을 lazy 하게 만든다.
+    gunicorn fork 이후 각 worker 에서 처음 호출될 때 생성되므로 소켓이 공유되지 않는다.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = psycopg2.pool.ThreadedConnectionPool(
+                    int(os.getenv("DB_POOL_MIN", "1")),
+                    int(os.getenv("DB_POOL_MAX", "5")),
+                    **_connection_kwargs(),
+                )
+    return _pool
+
+
+@contextmanager
+def pooled_connection():
+    """
+    with pooled_connection() as conn: ...
+    - 정상 종료 시 commit, 예외 시 rollback 후 pool 로 반환
+    - 끊어진 connection 은 pool 에서 버린다
+    """
+    pool = get_pool()
+    conn = pool.getconn()
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        try:
+            conn.rollback()
+        except psycopg2.Error:
+            broken = True
+        raise
+    finally:
+        pool.putconn(conn, close=broken or bool(conn.closed))
@@ -0,0 +1,298 @@
+# backend/history_store.py
+"""
+Symbol 별 OHLCV 를 디스크에 컬럼 단위(raw little-endian 배열)로 저장하는 로컬 히스토리 저장소.
+
+레이아웃:
+    {HISTORY_DIR}/{interval}/{SYMBOL}/ts.i8      int64   epoch seconds (bar 시작 시각, UTC)
+                                     open.f8 ... float64
+                                     volume.f8   float64
+
+- 처음 한 번 전체 기간을 채우고(backfill), 이후에는 마지막 bar 이후의 tail 만 받아 append 한다.
+- 읽기는 np.memmap 으로 하므로 여러 worker 가 같은 파일을 페이지 캐시로 공유한다.
+- 파일 잠금(fcntl)으로 gunicorn worker 간 동시 쓰기를 막는다. 컬럼 파일은 임시 파일에 쓴 뒤 os.replace 로
+  바꿔 끼우므로, 이미 memmap 으로 열어 둔 reader 는 예전 내용을 그대로 본다 (제자리 truncate 로 SIGBUS 나지 않음).
+
+CLI:
+    python -m backend.history_store refresh AAPL TSLA 005930.KS --interval 1d
+"""
+import fcntl
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+from backend import negative_cache, rate_limit
+from backend.rate_limit import yahoo_call
+
+HISTORY_DIR = os.getenv("HISTORY_DIR", os.path.join("data", "history"))
+
+COLUMNS = ("open", "high", "low", "close", "volume")
+_SOURCE_COLUMNS = {"open": "Open", "high": "High", "low": "Low", "close": "Close", "volume": "Volume"}
+_TS_FILE = "ts.i8"
+# 디렉터리 이름으로 쓰이므로 Yahoo 심볼 문자만 (".", ".." 같은 점만 있는 이름 제외)
+_SYMBOL_RE = re.compile(r"^(?!\.+$)[A-Z0-9.\-^=]{1,15}$")
+
+# interval -> (최초 backfill period, tail 갱신 주기(초))
+# Yahoo 제한: 5m 는 최근 60일, 1h 는 최근 730일까지만 제공
+INTERVALS = {
+    "1d": ("10y", 6 * 3600),
+    "1h": ("730d", 15 * 60),
+    "5m": ("60d", 5 * 60),
+}
+
+# /api/history 의 range 파라미터 -> 초 단위 길이 (None 이면 전체)
+RANGES = {
+    "1d": 86400,
+    "5d": 5 * 86400,
+    "1mo": 31 * 86400,
+    "3mo": 92 * 86400,
+    "6mo": 183 * 86400,
+    "1y": 366 * 86400,
+    "2y": 2 * 366 * 86400,
+    "5y": 5 * 366 * 86400,
+    "10y": 10 * 366 * 86400,
+    "max": None,
+}
+
+# range 에 맞는 기본 interval (짧은 구간은 intraday)
+DEFAULT_INTERVAL_FOR_RANGE = {"1d": "5m", "5d": "1h", "1mo": "1h"}
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def valid_symbol(symbol: str) -> bool:
+    return bool(_SYMBOL_RE.match(symbol or ""))
+
+
+def _symbol_dir(symbol: str, interval: str) -> str:
+    safe = (symbol or "").upper()
+    if not valid_symbol(safe):
+        raise ValueError(f"invalid symbol: {symbol!r}")
+    if interval not in INTERVALS:
+        raise ValueError(f"unsupported interval: {interval}")
+    return os.path.join(HISTORY_DIR, interval, safe)
+
+
+def _column_path(sdir: str, col: str) -> str:
+    return os.path.join(sdir, f"{col}.f8")
+
+
+@contextmanager
+def _write_lock(sdir: str):
+    """같은 프로세스의 스레드 + 다른 worker 프로세스 모두에 대해 배타적 쓰기 잠금."""
+    with _thread_locks_guard:
+        tlock = _thread_locks.setdefault(sdir, threading.Lock())
+    with tlock:
+        os.makedirs(sdir, exist_ok=True)
+        with open(os.path.join(sdir, ".lock"), "w") as lf:
+            fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lf, fcntl.LOCK_UN)
+
+
+def _row_count(sdir: str) -> int:
+    """컬럼 파일 중 가장 짧은 길이 (중간에 끊긴 append 가 있어도 일관된 행 수)."""
+    try:
+        n = os.path.getsize(os.path.join(sdir, _TS_FILE)) // 8
+        for col in COLUMNS:
+            n = min(n, os.path.getsize(_column_path(sdir, col)) // 8)
+        return n
+    except OSError:
+        return 0
+
+
+def _memmap(path: str, dtype, n: int):
+    if n == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(n,))
+
+
+def load(symbol: str, interval: str = "1d", start_ts: int = None):
+    """
+    저장된 히스토리를 memmap 으로 읽는다 (upstream 호출 없음).
+    Returns dict: {"ts": int64[], "open": float64[], ...} (start_ts 이후 slice)
+    """
+    sdir = _symbol_dir(symbol, interval)
+    n = _row_count(sdir)
+    ts = _memmap(os.path.join(sdir, _TS_FILE), "<i8", n)
+    lo = int(np.searchsorted(ts, start_ts, side="left")) if start_ts is not None else 0
+    out = {"ts": ts[lo:]}
+    for col in COLUMNS:
+        out[col] = _memmap(_column_path(sdir, col), "<f8", n)[lo:]
+    return out
+
+
+def last_timestamp(symbol: str, interval: str = "1d"):
+    sdir = _symbol_dir(symbol, interval)
+    n = _row_count(sdir)
+    if n == 0:
+        return None
+    return int(_memmap(os.path.join(sdir, _TS_FILE), "<i8", n)[-1])
+
+
+def _frame_to_columns(df):
+    """yfinance history DataFrame -> (ts int64[], {col: float64[]})."""
+    ts = np.array([int(t.timestamp()) for t in df.index], dtype="<i8")
+    cols = {}
+    for col in COLUMNS:
+        src = _SOURCE_COLUMNS[col]
+        if src in df.columns:
+            cols[col] = df[src].to_numpy(dtype="<f8", na_value=np.nan)
+        else:
+            cols[col] = np.full(len(ts), np.nan, dtype="<f8")
+    # close 가 없는 행은 의미가 없으므로 제거, 나머지 결측은 close / 0 으로 채움 (JSON 에 NaN 이 나가지 않도록)
+    mask = ~np.isnan(cols["close"])
+    ts = ts[mask]
+    cols = {c: v[mask] for c, v in cols.items()}
+    for col in ("open", "high", "low"):
+        cols[col] = np.where(np.isnan(cols[col]), cols["close"], cols[col])
+    cols["volume"] = np.nan_to_num(cols["volume"], nan=0.0)
+    return ts, cols
+
+
+def _fetch(symbol: str, interval: str, start_ts: int = None):
+    """
+    start_ts 가 없으면 전체 backfill, 있으면 그 이후 tail.
+    backfill 이 no data / delisted 로 비면 negative cache 에 기록한다 (429 / 일시 오류로 빈 것은 제외).
+    """
+    import yfinance as yf
+
+    ticker = yf.Ticker(symbol)
+    if start_ts is None:
+        df, error = rate_limit.history(ticker, period=INTERVALS[interval][0], interval=interval)
+        if (df is None or df.empty) and rate_limit.is_no_data_error(error):
+            negative_cache.mark_bad(symbol, error)
+    else:
+        # tail 갱신은 새 bar 가 없으면 원래 비어 있으므로 빈 결과도 정상으로 본다
+        start = datetime.fromtimestamp(start_ts, tz=timezone.utc)
+        with yahoo_call("history"):
+            df = ticker.history(start=start, interval=interval)
+    if df is None or df.empty:
+        return np.empty(0, dtype="<i8"), {c: np.empty(0, dtype="<f8") for c in COLUMNS}
+    return _frame_to_columns(df)
+
+
+def update(symbol: str, interval: str = "1d") -> int:
+    """
+    비어 있으면 전체 backfill, 아니면 마지막 bar 부터 tail 만 받아서 append.
+    마지막 bar 는 장중에 갱신 중일 수 있으므로 항상 다시 받아서 교체한다.
+    Returns: 저장소의 최종 행 수
+    """
+    sdir = _symbol_dir(symbol, interval)
+    try:
+        with _write_lock(sdir):
+            return _update_locked(symbol, interval, sdir)
+    finally:
+        _discard(sdir)
+
+
+def _discard(sdir: str):
+    """첫 backfill 이 비었거나 실패했으면 잠금 파일만 남은 디렉터리를 지운다 (없는 심볼로 디렉터리가 쌓이지 않도록)."""
+    if _row_count(sdir) == 0:
+        shutil.rmtree(sdir, ignore_errors=True)
+
+
+def _replace_column(path: str, keep: int, arr, dtype) -> str:
+    """앞의 keep 행 + arr 를 임시 파일에 쓰고 그 경로를 돌려준다 (교체는 호출하는 쪽에서 os.replace)."""
+    head = np.fromfile(path, dtype=dtype, count=keep) if keep else np.empty(0, dtype=dtype)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(head.tobytes())
+        f.write(np.ascontiguousarray(arr, dtype=dtype).tobytes())
+    return tmp
+
+
+def _update_locked(symbol: str, interval: str, sdir: str) -> int:
+    n = _row_count(sdir)
+    last_ts = None
+    if n:
+        last_ts = int(_memmap(os.path.join(sdir, _TS_FILE), "<i8", n)[-1])
+    ts, cols = _fetch(symbol, interval, start_ts=last_ts)
+    if n == 0 and len(ts) == 0:
+        # 빈 backfill: 파일도 .checked 도 남기지 않는다 (호출한 쪽에서 디렉터리를 지움)
+        return 0
+
+    keep = n
+    if last_ts is not None:
+        # 저장된 마지막 bar 와 겹치는 구간부터 교체
+        new_mask = ts >= last_ts
+        ts = ts[new_mask]
+        cols = {c: v[new_mask] for c, v in cols.items()}
+        if len(ts) and ts[0] == last_ts:
+            keep = n - 1
+
+    # 중간에 끊긴 쓰기나 교체 대상 bar 를 잘라낸 새 파일을 모두 만든 뒤 교체 (ts 를 마지막에)
+    paths = [(_column_path(sdir, c), cols[c], "<f8") for c in COLUMNS] + [
+        (os.path.join(sdir, _TS_FILE), ts, "<i8")
+    ]
+    # 다른 worker 가 빈 backfill 뒤 디렉터리를 지웠을 수 있다
+    os.makedirs(sdir, exist_ok=True)
+    tmps = [(_replace_column(path, keep, arr, dtype), path) for path, arr, dtype in paths]
+    for tmp, path in tmps:
+        os.replace(tmp, path)
+    # 마지막 확인 시각 (갱신 주기 판단용, worker 간 공유)
+    with open(os.path.join(sdir, ".checked"), "w") as f:
+        f.write(str(int(time.time())))
+    return keep + len(ts)
+
+
+def _last_checked(sdir: str) -> float:
+    try:
+        return os.path.getmtime(os.path.join(sdir, ".checked"))
+    except OSError:
+        return 0.0
+
+
+def ensure(symbol: str, interval: str = "1d") -> bool:
+    """
+    비어 있으면 한 번 채우고, 갱신 주기가 지났을 때만 tail 을 받는다.
+    대부분의 호출은 upstream 없이 바로 반환된다.
+    저장된 데이터가 없고 negative cache 에 있는 심볼은 backfill 하지 않는다 (디렉터리도 만들지 않음).
+    Returns: upstream 호출 여부
+    """
+    sdir = _symbol_dir(symbol, interval)
+    refresh_every = INTERVALS[interval][1]
+    if time.time() - _last_checked(sdir) < refresh_every:
+        return False
+    if _row_count(sdir) == 0 and negative_cache.is_known_bad(symbol):
+        return False
+    try:
+        with _write_lock(sdir):
+            # 잠금을 기다리는 동안 다른 스레드 / worker 가 이미 갱신했으면 다시 받지 않는다
+            if time.time() - _last_checked(sdir) < refresh_every:
+                return False
+            _update_locked(symbol, interval, sdir)
+    finally:
+        _discard(sdir)
+    return True
+
+
+def _main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fill / refresh the local OHLCV history store")
+    parser.add_argument("command", choices=["refresh"])
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--interval", default="1d", choices=sorted(INTERVALS))
+    args = parser.parse_args(argv)
+
+    for sym in args.symbols:
+        try:
+            with rate_limit.background():
+                rows = update(sym, args.interval)
+            print(f"[history_store] {sym} {args.interval}: {rows} rows")
+        except Exception as e:
+            print(f"[history_store] {sym} {args.interval} error: {e}")
+
+
+if __name__ == "__main__":
+    _main(sys.argv[1:])
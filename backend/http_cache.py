@@ -0,0 +1,111 @@
+# backend/http_cache.py
+"""
+HTTP 응답 최적화 헬퍼.
+
+- json_response(): orjson 으로 직렬화하고 endpoint 별 Cache-Control max-age 를 붙인다.
+- init_app(app): before_request / after_request 훅
+    * GET JSON 응답에 content-hash ETag 를 달고 If-None-Match 가 같으면 304 (body 없음)
+    * Cache-Control max-age 가 있는 응답은 (path + query) -> ETag 를 max-age 동안 기억해 두고,
+      그 안에 같은 ETag 로 다시 온 조건부 요청은 handler 를 돌리지 않고 바로 304
+      (/api/news, /api/search 처럼 handler 가 upstream 을 부르는 경로에서 body 를 다시 만들지 않음)
+    * 큰 JSON body 는 Accept-Encoding 에 맞춰 brotli(설치된 경우) / gzip 으로 압축
+  스트리밍 응답(SSE 등)은 건드리지 않는다.
+"""
+import gzip
+import hashlib
+import os
+from urllib.parse import urlencode
+
+import orjson
+from flask import Response, request
+
+from backend.cache import TTLCache
+
+try:
+    import brotli
+except ImportError:  # brotli 는 선택 사항, 없으면 gzip 만 사용
+    brotli = None
+
+COMPRESS_MIN_BYTES = 1024
+_GZIP_LEVEL = 5
+_BROTLI_QUALITY = 5
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+# (path + query) -> 마지막 200 응답의 ETag, 그 응답의 max-age 동안만
+_recent_etags = TTLCache(ttl=60, maxsize=int(os.getenv("ETAG_CACHE_SIZE", "4096")), name="etags")
+
+
+def json_response(payload, status: int = 200, max_age: int = None) -> Response:
+    """jsonify 대체: orjson 직렬화 + (선택) Cache-Control: public, max-age=N."""
+    resp = Response(orjson.dumps(payload, option=_ORJSON_OPTIONS), status=status, mimetype="application/json")
+    if max_age is not None and status == 200:
+        resp.headers["Cache-Control"] = f"public, max-age={int(max_age)}"
+    return resp
+
+
+def _content_etag(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _accepts(encoding: str) -> bool:
+    return request.accept_encodings[encoding] > 0
+
+
+def _compress(resp: Response):
+    if resp.status_code != 200 or "Content-Encoding" in resp.headers:
+        return
+    data = resp.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return
+    if brotli is not None and _accepts("br"):
+        body, encoding = brotli.compress(data, quality=_BROTLI_QUALITY), "br"
+    elif _accepts("gzip"):
+        body, encoding = gzip.compress(data, compresslevel=_GZIP_LEVEL), "gzip"
+    else:
+        return
+    resp.set_data(body)
+    resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    # 압축본은 바이트가 달라지므로 weak ETag 로 표시 (If-None-Match 는 weak 비교라 304 는 그대로 동작)
+    etag, weak = resp.get_etag()
+    if etag and not weak:
+        resp.set_etag(etag, weak=True)
+
+
+def _request_key() -> str:
+    return request.path + "?" + urlencode(sorted(request.args.items(multi=True)))
+
+
+def _before_request():
+    """max-age 안에 같은 ETag 로 다시 온 GET 은 handler 없이 304."""
+    if request.method != "GET" or not request.if_none_match:
+        return None
+    found = _recent_etags.get(_request_key())
+    if found is None or not request.if_none_match.contains_weak(found[0]):
+        return None
+    resp = Response(status=304)
+    resp.set_etag(found[0])
+    resp.headers["Cache-Control"] = found[1]
+    return resp
+
+
+def _after_request(resp: Response):
+    if resp.is_streamed or resp.direct_passthrough or resp.mimetype != "application/json":
+        return resp
+    if request.method == "GET" and resp.status_code == 200:
+        if resp.get_etag()[0] is None:
+            resp.set_etag(_content_etag(resp.get_data()))
+        max_age = resp.cache_control.max_age
+        if max_age:
+            _recent_etags.set(_request_key(), (resp.get_etag()[0], resp.headers["Cache-Control"]), ttl=max_age)
+        # If-None-Match 가 일치하면 304 + 빈 body
+        resp = resp.make_conditional(request)
+        if resp.status_code == 304:
+            return resp
+    _compress(resp)
+    return resp
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
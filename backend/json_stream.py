@@ -0,0 +1,88 @@
+# backend/json_stream.py
+"""
+LLM 이 만든 JSON 배열('[{...}, {...}, ...]')을 조각 단위로 읽으면서 완성된 원소부터 꺼낸다.
+
+- 스트리밍: 응답 조각(delta)을 feed() 에 넣을 때마다 그 사이 닫힌 원소들을 돌려준다.
+  카드 / 퀴즈를 생성이 끝나기 전에 클라이언트로 먼저 보낼 수 있다.
+- 구조 복구: 배열 앞뒤의 잡문이나 ``` 코드 펜스는 무시하고, 깨진 원소 하나는 건너뛴 뒤
+  나머지를 살린다. 잘린 출력이면 마지막 미완성 원소만 버린다.
+
+    parser = ArrayStreamParser()
+    for delta in llm_gateway.stream(messages):
+        for item in parser.feed(delta):
+            ...
+    items = salvage_array(text)   # 이미 받은 전체 문자열에서 살릴 수 있는 원소만
+"""
+import json
+
+
+class ArrayStreamParser:
+    def __init__(self):
+        self.broken = 0  # 파싱에 실패해서 버린 원소 수
+        self.done = False  # 최상위 배열의 ']' 를 봤는지
+        self._started = False
+        self._depth = 0
+        self._in_str = False
+        self._escape = False
+        self._buf = []
+
+    @property
+    def pending(self) -> bool:
+        """닫히지 않은 원소가 남아 있는지 (= 출력이 중간에 잘렸는지)."""
+        return bool("".join(self._buf).strip())
+
+    def _finish(self, out):
+        text = "".join(self._buf).strip()
+        self._buf = []
+        if not text:
+            return  # "[]" 나 trailing comma
+        try:
+            out.append(json.loads(text))
+        except ValueError:
+            self.broken += 1
+
+    def feed(self, chunk: str) -> list:
+        out = []
+        buf = self._buf
+        for c in chunk:
+            if self.done:
+                break
+            if not self._started:
+                if c == "[":
+                    self._started = True
+                    self._depth = 1
+                continue
+            if self._in_str:
+                buf.append(c)
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_str = False
+                continue
+            if c == '"':
+                self._in_str = True
+                buf.append(c)
+            elif c in "{[":
+                self._depth += 1
+                buf.append(c)
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._finish(out)
+                    buf = self._buf
+                    self.done = True
+                else:
+                    buf.append(c)
+            elif c == "," and self._depth == 1:
+                self._finish(out)
+                buf = self._buf
+            else:
+                buf.append(c)
+        return out
+
+
+def salvage_array(text: str) -> list:
+    """text 안의 첫 JSON 배열에서 온전한 원소들만 꺼낸다 (없으면 빈 리스트)."""
+    return ArrayStreamParser().feed(text or "")
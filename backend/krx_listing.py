@@ -0,0 +1,179 @@
+# backend/krx_listing.py
+"""
+KRX 상장 종목 테이블 (종목코드 → 시장, 한글명, 영문명).
+
+- 파일(KRX_LISTING_PATH, 기본 data/krx_listing.tsv)을 처음 사용할 때 한 번 읽어서 메모리에 둔다.
+- 파일은 하루 한 번 오프라인으로 갱신한다 (cron 등):
+      python -m backend.krx_listing refresh
+  서버는 파일 mtime 이 바뀌면 다음 조회 때 다시 읽는다.
+- 파일이 없으면 빈 테이블로 동작하고, 호출하는 쪽은 기존처럼 .KS / .KQ 를 모두 시도한다.
+
+TSV 형식 (헤더 없음): code \\t market(KOSPI|KOSDAQ) \\t name_ko \\t name_en
+"""
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+KRX_LISTING_PATH = os.getenv("KRX_LISTING_PATH", os.path.join("data", "krx_listing.tsv"))
+_RELOAD_CHECK_INTERVAL = 60.0
+
+log = logging.getLogger(__name__)
+
+MARKET_SUFFIX = {"KOSPI": "KS", "KOSDAQ": "KQ"}
+
+
+class KrxListing:
+    """
+    값은 종목별 dict / tuple 대신 컬럼별 numpy 배열(고정폭 문자열) 몇 개에 담는다.
+    객체 수가 적어서 gunicorn --preload 로 master 에서 만든 뒤 fork 하면 worker 들이
+    참조 카운트 변경 없이 같은 메모리 페이지를 그대로 공유한다 (backend.preload).
+    """
+
+    def __init__(self, rows=()):
+        # 같은 코드가 여러 번 있으면 마지막 줄 우선, 코드 순으로 정렬해 searchsorted 로 찾는다
+        dedup = {}
+        for code, market, name_ko, name_en in rows:
+            if market in MARKET_SUFFIX:
+                dedup[code] = (code, market, name_ko or "", name_en or "")
+        rows = [dedup[code] for code in sorted(dedup)]
+        self._codes = np.array([r[0] for r in rows], dtype=str)
+        self._markets = np.array([r[1] == "KOSDAQ" for r in rows], dtype=bool)
+        self._names_ko = np.array([r[2] for r in rows], dtype=str)
+        self._names_en = np.array([r[3] for r in rows], dtype=str)
+        # 이름 검색용 (공백 제거 + 소문자) 키
+        self._keys_ko = np.array([_name_key(r[2]) for r in rows], dtype=str)
+        self._keys_en = np.array([_name_key(r[3]) for r in rows], dtype=str)
+        for arr in (self._codes, self._markets, self._names_ko, self._names_en, self._keys_ko, self._keys_en):
+            arr.flags.writeable = False
+
+    def __len__(self):
+        return len(self._codes)
+
+    def _index(self, code):
+        if not len(self._codes):
+            return None
+        i = int(np.searchsorted(self._codes, code))
+        return i if i < len(self._codes) and self._codes[i] == code else None
+
+    def market_for(self, code: str):
+        i = self._index(code)
+        if i is None:
+            return None
+        return "KOSDAQ" if self._markets[i] else "KOSPI"
+
+    def symbol_for(self, code: str):
+        """'005930' -> '005930.KS' (모르는 코드면 None)."""
+        market = self.market_for(code)
+        return f"{code}.{MARKET_SUFFIX[market]}" if market else None
+
+    def names_for(self, code: str):
+        i = self._index(code)
+        return (str(self._names_ko[i]), str(self._names_en[i])) if i is not None else (None, None)
+
+    def rows(self):
+        """(code, market, name_ko, name_en) 순회."""
+        for i, code in enumerate(self._codes):
+            yield str(code), ("KOSDAQ" if self._markets[i] else "KOSPI"), str(self._names_ko[i]), str(self._names_en[i])
+
+    def search_names(self, query: str, limit: int = 5):
+        """
+        한글/영문 종목명으로 검색해서 yfinance 심볼 목록을 돌려준다.
+        정확히 일치 → 접두 일치 → 부분 일치 순서, 같은 순위에서는 이름이 짧은 것 우선.
+        """
+        key = _name_key(query)
+        if not key or not len(self._codes):
+            return []
+        ranks = []
+        for names in (self._keys_ko, self._keys_en):
+            pos = np.char.find(names, key)
+            ranks.append(np.select([names == key, pos == 0, pos > 0], [0, 1, 2], default=3))
+        rank = np.minimum(*ranks)
+        hits = np.nonzero(rank < 3)[0]
+        if not len(hits):
+            return []
+        lengths = np.char.str_len(self._keys_ko[hits])
+        lengths = np.where(lengths > 0, lengths, np.char.str_len(self._keys_en[hits]))
+        order = np.lexsort((self._codes[hits], lengths, rank[hits]))[:limit]
+        return [self.symbol_for(str(self._codes[i])) for i in hits[order]]
+
+
+def _name_key(name):
+    return "".join((name or "").split()).lower()
+
+
+def load_tsv(path):
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) < 3 or not parts[0]:
+                continue
+            name_en = parts[3] if len(parts) > 3 else ""
+            rows.append((parts[0], parts[1], parts[2], name_en))
+    return KrxListing(rows)
+
+
+_listing = KrxListing()
+_loaded_mtime = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def get_listing() -> KrxListing:
+    """현재 테이블 (파일이 갱신되었으면 다시 읽음, mtime 확인은 최대 1분에 한 번)."""
+    global _listing, _loaded_mtime, _last_check
+    now = time.monotonic()
+    if _loaded_mtime is not None and now - _last_check < _RELOAD_CHECK_INTERVAL:
+        return _listing
+    with _lock:
+        _last_check = now
+        try:
+            mtime = os.path.getmtime(KRX_LISTING_PATH)
+        except OSError:
+            _loaded_mtime = _loaded_mtime or 0.0
+            return _listing
+        if mtime != _loaded_mtime:
+            try:
+                _listing = load_tsv(KRX_LISTING_PATH)
+                log.info("loaded %d KRX listings from %s", len(_listing), KRX_LISTING_PATH)
+            except Exception as e:
+                log.warning("failed to load %s: %s", KRX_LISTING_PATH, e)
+            _loaded_mtime = mtime
+    return _listing
+
+
+def refresh(path=KRX_LISTING_PATH):
+    """
+    pykrx 로 KOSPI / KOSDAQ 상장 목록을 받아 TSV 로 저장 (오프라인 작업).
+    pykrx 는 영문명을 제공하지 않으므로 기존 파일에 있던 영문명은 유지한다.
+    """
+    from pykrx import stock
+
+    previous = {}
+    if os.path.exists(path):
+        previous = {code: name_en for code, _, _, name_en in load_tsv(path).rows()}
+
+    lines = []
+    for market in MARKET_SUFFIX:
+        for code in stock.get_market_ticker_list(market=market):
+            name_ko = stock.get_market_ticker_name(code) or ""
+            name_en = previous.get(code, "")
+            lines.append(f"{code}\t{market}\t{name_ko}\t{name_en}\n")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    os.replace(tmp, path)  # 서버가 읽는 도중에도 반쯤 쓴 파일이 보이지 않도록
+    return len(lines)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["refresh"]:
+        print(f"[krx_listing] wrote {refresh()} listings to {KRX_LISTING_PATH}")
+    else:
+        print("usage: python -m backend.krx_listing refresh")
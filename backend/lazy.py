@@ -0,0 +1,36 @@
+# backend/lazy.py
+"""
+무거운 모듈(yfinance → pandas 등)을 첫 속성 접근 시점에 import 하는 proxy.
+
+    yf = lazy_module("yfinance")
+    yf.Ticker("AAPL")   # 여기서 처음 import
+
+매 접근마다 실제 모듈에서 속성을 읽으므로, 나중에 모듈 속성을 바꿔 끼워도 (테스트용 fake 등) 그대로 반영된다.
+"""
+import importlib
+
+
+class _LazyModule:
+    __slots__ = ("_name", "_module")
+
+    def __init__(self, name):
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_module", None)
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            module = importlib.import_module(self._name)
+            object.__setattr__(self, "_module", module)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_module(name: str):
+    return _LazyModule(name)
@@ -0,0 +1,63 @@
+# backend/llm_client.py
+"""
+GPT-5 (mlapi, OpenAI 호환) 클라이언트를 프로세스당 한 번, 처음 필요할 때 만든다.
+openai 패키지 import 만으로 수백 ms 가 걸리므로 LLM 을 쓰지 않는 요청 / worker 는 비용을 내지 않는다.
+
+- get_openai_client(): 설정이 없거나 생성에 실패하면 None
+- set_openai_client(): 벤치마크 / 테스트에서 가짜 클라이언트 주입
+"""
+import logging
+import os
+import threading
+
+DEFAULT_SENTIMENT_API_URL = "https://mlapi.run/daef5150-72ef-48ff-8861-df80052ea7ac/v1"
+
+_client = None
+_initialized = False
+_lock = threading.Lock()
+
+log = logging.getLogger(__name__)
+
+
+def api_url() -> str:
+    # VITE_ 접두사 (.env.local) 와 일반 이름 둘 다 지원
+    return (
+        os.getenv("VITE_MLAPI_BASE_URL")
+        or os.getenv("MLAPI_BASE_URL")
+        or os.getenv("SENTIMENT_API_URL")
+        or DEFAULT_SENTIMENT_API_URL
+    )
+
+
+def api_key() -> str:
+    return os.getenv("VITE_SENTIMENT_API_KEY") or os.getenv("SENTIMENT_API_KEY") or ""
+
+
+def get_openai_client():
+    global _client, _initialized
+    if _initialized:
+        return _client
+    with _lock:
+        if _initialized:
+            return _client
+        key, url = api_key(), api_url()
+        if key and url:
+            try:
+                from openai import OpenAI
+
+                _client = OpenAI(base_url=url, api_key=key)
+                log.info("OpenAI client initialized (%s...)", url[:60])
+            except Exception as e:
+                log.error("failed to initialize OpenAI client: %s", e)
+                _client = None
+        else:
+            log.warning("OpenAI client not initialized: SENTIMENT_API_KEY or SENTIMENT_API_URL not set")
+        _initialized = True
+        return _client
+
+
+def set_openai_client(client):
+    global _client, _initialized
+    with _lock:
+        _client = client
+        _initialized = True
@@ -0,0 +1,305 @@
+# backend/llm_gateway.py
+"""
+모든 GPT-5 (mlapi) 호출이 지나가는 단일 창구.
+
+- 캐시: (model, messages, params) 가 같으면 LLM_CACHE_TTL 초 동안 같은 답을 돌려준다 (TTL + LRU)
+- single-flight: 같은 키의 호출이 이미 진행 중이면 새로 보내지 않고 그 결과를 같이 기다린다
+  (대시보드를 동시에 연 사용자들이 같은 count / seed 로 카드를 만들 때 생성은 한 번)
+- 모델별 동시 호출 수 제한 (LLM_MAX_CONCURRENCY, 모델별 덮어쓰기는 LLM_MODEL_CONCURRENCY)
+- 지연 / 토큰 / 출처(upstream, cache, coalesced) 집계: Prometheus 지표 + stats()
+
+    content = llm_gateway.chat([{"role": "user", "content": prompt}], operation="json")
+    data = llm_gateway.chat(messages, operation="json", parse=json.loads)   # 파싱 결과를 캐시
+    for delta in llm_gateway.stream(messages, operation="json"):           # 생성되는 대로 조각 단위
+        ...
+
+parse 를 주면 파싱에 성공한 값만 캐시 / 공유된다 (키에 parse 도 들어가므로 같은 프롬프트라도 parse 가 다르면 따로).
+parse 가 Partial(value) 를 돌려주면 (잘린 JSON 에서 살린 일부 등) 그 호출에만 쓰고 캐시하지 않는다.
+캐시된 값은 여러 요청이 같이 보므로 수정하지 말 것.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from types import SimpleNamespace
+
+from backend import metrics
+from backend.cache import TTLCache
+from backend.llm_client import get_openai_client
+
+DEFAULT_MODEL = "openai/gpt-5"
+UPSTREAM = "gpt5"  # metrics 의 upstream label
+
+LLM_CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "600"))
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "512"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_QUEUE_TIMEOUT = float(os.getenv("LLM_QUEUE_TIMEOUT", "60"))
+
+
+def _parse_model_limits(raw: str) -> dict:
+    """"openai/gpt-5=8,other=2" -> {"openai/gpt-5": 8, "other": 2}"""
+    limits = {}
+    for part in raw.split(","):
+        name, _, value = part.strip().rpartition("=")
+        if name and value.isdigit():
+            limits[name] = int(value)
+    return limits
+
+
+LLM_MODEL_CONCURRENCY = _parse_model_limits(os.getenv("LLM_MODEL_CONCURRENCY", ""))
+
+log = logging.getLogger(__name__)
+
+
+class LLMUnavailable(RuntimeError):
+    """클라이언트 설정이 없음 (SENTIMENT_API_KEY / URL)."""
+
+
+class LLMBusy(RuntimeError):
+    """모델 동시 호출 한도가 LLM_QUEUE_TIMEOUT 안에 비지 않음."""
+
+
+class Partial:
+    """parse 결과가 온전하지 않음: 이번 호출에는 value 를 돌려주되 캐시하지 않는다."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class _Flight:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+_MISSING = object()
+_cache = TTLCache(ttl=LLM_CACHE_TTL, maxsize=LLM_CACHE_SIZE, name="llm")
+_flights = {}
+_flights_lock = threading.Lock()
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+_stats = defaultdict(lambda: defaultdict(float))
+_stats_lock = threading.Lock()
+
+
+def available() -> bool:
+    return get_openai_client() is not None
+
+
+def _parse_name(parse) -> str:
+    if parse is None:
+        return ""
+    return f"{getattr(parse, '__module__', '')}.{getattr(parse, '__qualname__', repr(parse))}"
+
+
+def cache_key(model: str, messages, params: dict, parse=None) -> str:
+    raw = json.dumps([model, messages, params, _parse_name(parse)], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _semaphore(model: str):
+    with _semaphores_lock:
+        sem = _semaphores.get(model)
+        if sem is None:
+            sem = threading.BoundedSemaphore(LLM_MODEL_CONCURRENCY.get(model, LLM_MAX_CONCURRENCY))
+            _semaphores[model] = sem
+        return sem
+
+
+def _count(model: str, source: str, **values):
+    metrics.LLM_CALLS.labels(model, source).inc()
+    with _stats_lock:
+        s = _stats[model]
+        s[source] += 1
+        for k, v in values.items():
+            s[k] += v
+
+
+def _call_upstream(model, messages, params, operation):
+    client = get_openai_client()
+    if client is None:
+        raise LLMUnavailable("SENTIMENT_API_KEY not configured")
+    sem = _semaphore(model)
+    queued = time.perf_counter()
+    if not sem.acquire(timeout=LLM_QUEUE_TIMEOUT):
+        _count(model, "rejected")
+        raise LLMBusy(f"{model}: too many concurrent calls")
+    try:
+        started = time.perf_counter()
+        try:
+            with metrics.track_upstream(UPSTREAM, operation):
+                resp = client.chat.completions.create(model=model, messages=messages, **params)
+        except Exception:
+            _count(model, "errors")
+            raise
+        latency = time.perf_counter() - started
+    finally:
+        sem.release()
+    metrics.record_llm_usage(model, resp)
+    usage = getattr(resp, "usage", None)
+    _count(
+        model, "upstream",
+        queue_seconds=started - queued,
+        latency_seconds=latency,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+    return resp.choices[0].message.content or ""
+
+
+def chat(messages, model: str = DEFAULT_MODEL, operation: str = "chat", parse=None, cache: bool = True, **params):
+    """
+    chat completion 한 번 (캐시 / single-flight / 동시성 제한 경유).
+    content 문자열(또는 parse(content) 결과)을 돌려준다. 빈 응답과 Partial 결과는 캐시하지 않는다.
+    """
+    key = cache_key(model, messages, params, parse)
+    if cache:
+        found = _cache.get(key, _MISSING)
+        if found is not _MISSING:
+            _count(model, "cache")
+            return found
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        _count(model, "coalesced")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    try:
+        content = _call_upstream(model, messages, params, operation)
+        value = parse(content) if parse is not None else content
+        cacheable = cache and content.strip()
+        if isinstance(value, Partial):
+            value, cacheable = value.value, False
+        if cacheable:
+            _cache.set(key, value)
+        flight.value = value
+        return value
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _stream_upstream(model, messages, params, operation):
+    """stream=True 호출의 content 조각들. 모델 슬롯은 스트림이 끝나거나 버려질 때까지 잡고 있는다."""
+    client = get_openai_client()
+    if client is None:
+        raise LLMUnavailable("SENTIMENT_API_KEY not configured")
+    sem = _semaphore(model)
+    queued = time.perf_counter()
+    if not sem.acquire(timeout=LLM_QUEUE_TIMEOUT):
+        _count(model, "rejected")
+        raise LLMBusy(f"{model}: too many concurrent calls")
+    usage = None
+    try:
+        started = time.perf_counter()
+        try:
+            with metrics.track_upstream(UPSTREAM, operation):
+                for chunk in client.chat.completions.create(model=model, messages=messages, stream=True, **params):
+                    usage = getattr(chunk, "usage", None) or usage
+                    choices = getattr(chunk, "choices", None)
+                    delta = choices[0].delta.content if choices else None
+                    if delta:
+                        yield delta
+        except Exception:
+            _count(model, "errors")
+            raise
+        latency = time.perf_counter() - started
+    finally:
+        sem.release()
+    if usage is not None:
+        metrics.record_llm_usage(model, SimpleNamespace(usage=usage))
+    _count(
+        model, "upstream",
+        queue_seconds=started - queued,
+        latency_seconds=latency,
+        prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+        completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+    )
+
+
+def stream(messages, model: str = DEFAULT_MODEL, operation: str = "chat", **params):
+    """
+    chat() 의 스트리밍 버전: content 조각을 생성되는 대로 yield.
+    캐시 hit 이나 이미 같은 호출이 진행 중이면 완성된 content 를 한 조각으로 준다.
+    """
+    key = cache_key(model, messages, dict(params, stream=True))
+    found = _cache.get(key, _MISSING)
+    if found is not _MISSING:
+        _count(model, "cache")
+        yield found
+        return
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        _count(model, "coalesced")
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        yield flight.value
+        return
+
+    parts = []
+    try:
+        for delta in _stream_upstream(model, messages, params, operation):
+            parts.append(delta)
+            yield delta
+        content = "".join(parts)
+        if content.strip():
+            _cache.set(key, content)
+        flight.value = content
+    except GeneratorExit:
+        # 소비자가 중간에 끊음 (클라이언트 연결 종료). 기다리던 쪽은 실패로 처리
+        flight.error = RuntimeError("LLM stream abandoned by its consumer")
+        raise
+    except Exception as e:
+        flight.error = e
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def stats() -> dict:
+    """모델별 호출 출처 / 평균 지연 / 누적 토큰."""
+    with _stats_lock:
+        models = {}
+        for model, s in _stats.items():
+            upstream = s.get("upstream", 0)
+            models[model] = {
+                "upstream": int(upstream),
+                "cache": int(s.get("cache", 0)),
+                "coalesced": int(s.get("coalesced", 0)),
+                "errors": int(s.get("errors", 0)),
+                "rejected": int(s.get("rejected", 0)),
+                "avg_latency_ms": round(s["latency_seconds"] / upstream * 1000, 1) if upstream else 0.0,
+                "avg_queue_ms": round(s["queue_seconds"] / upstream * 1000, 1) if upstream else 0.0,
+                "prompt_tokens": int(s.get("prompt_tokens", 0)),
+                "completion_tokens": int(s.get("completion_tokens", 0)),
+            }
+    return {"models": models, "cache_entries": len(_cache)}
@@ -0,0 +1,234 @@
+# backend/logging_config.py
+"""
+비동기 structured logging.
+
+- 요청 스레드는 QueueHandler 로 레코드를 큐에 넣기만 하고, 실제 stdout 쓰기는 QueueListener 스레드가 한다.
+  큐가 가득 차면 (stdout 이 막히는 등) 기다리지 않고 버린 뒤 개수만 센다 → 로깅이 요청 지연을 늘리지 않음.
+- 출력 형식: LOG_FORMAT=json (기본, 한 줄 JSON) | text
+- 레벨: LOG_LEVEL=INFO (root), LOG_LEVELS="backend.quote_stream=DEBUG,yfinance=WARNING" (logger 별)
+- DEBUG 레코드는 LOG_DEBUG_SAMPLE 비율로 샘플링하고, 호출 위치(파일:줄)마다 초당 LOG_DEBUG_RATE 개까지만 통과.
+- 요청마다 request id (X-Request-ID 헤더가 있으면 그 값, 없으면 생성) 를 모든 로그에 붙이고 응답 헤더로 돌려준다.
+
+사용:
+    import logging
+    log = logging.getLogger(__name__)
+    log.info("quote fetched", extra={"symbol": sym})
+"""
+import atexit
+import contextvars
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").strip().lower()
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+LOG_DEBUG_SAMPLE = float(os.getenv("LOG_DEBUG_SAMPLE", "1.0"))
+LOG_DEBUG_RATE = int(os.getenv("LOG_DEBUG_RATE", "20"))
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# 라이브러리 기본 레벨 (LOG_LEVELS 로 덮어쓸 수 있음)
+DEFAULT_LEVELS = {"yfinance": "WARNING", "urllib3": "WARNING", "peewee": "WARNING", "werkzeug": "INFO"}
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_request_id = contextvars.ContextVar("request_id", default="-")
+
+# LogRecord 기본 속성 (나머지는 extra 로 간주해 JSON 에 포함)
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+
+def get_request_id() -> str:
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    def filter(self, record):
+        record.request_id = _request_id.get()
+        return True
+
+
+class DebugSampler(logging.Filter):
+    """DEBUG 레코드 샘플링 + 호출 위치별 초당 상한. INFO 이상은 그대로 통과."""
+
+    def __init__(self, sample_rate=LOG_DEBUG_SAMPLE, per_second=LOG_DEBUG_RATE):
+        super().__init__()
+        self.sample_rate = sample_rate
+        self.per_second = per_second
+        self.dropped = 0
+        self._windows = {}  # (pathname, lineno) -> (second, count)
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno > logging.DEBUG:
+            return True
+        if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+            self.dropped += 1
+            return False
+        if self.per_second <= 0:
+            return True
+        key = (record.pathname, record.lineno)
+        now = int(time.monotonic())
+        with self._lock:
+            second, count = self._windows.get(key, (now, 0))
+            if second != now:
+                second, count = now, 0
+            if count >= self.per_second:
+                self.dropped += 1
+                return False
+            self._windows[key] = (second, count + 1)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RESERVED and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, q):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 포맷은 listener 스레드에서 하도록 메시지 / 예외만 문자열로 굳혀서 넘긴다
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_queue_handler = None
+_listener = None
+_sampler = None
+_setup_lock = threading.Lock()
+
+
+def _make_output_handler():
+    handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "text":
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"))
+    else:
+        handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def _parse_levels(spec):
+    levels = dict(DEFAULT_LEVELS)
+    for part in spec.split(","):
+        name, sep, level = part.partition("=")
+        if sep and name.strip() and level.strip():
+            levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def _start_listener():
+    global _listener
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, _make_output_handler(),
+                                               respect_handler_level=False)
+    _listener.start()
+
+
+def _after_fork_in_child():
+    # fork 이후 자식에는 listener 스레드가 없으므로 새 큐 / 스레드로 다시 시작
+    if _queue_handler is not None:
+        _queue_handler.queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+        _start_listener()
+
+
+def setup_logging():
+    """root logger 를 queue 기반 handler 로 구성 (여러 번 불러도 한 번만 적용)."""
+    global _queue_handler, _sampler
+    with _setup_lock:
+        if _queue_handler is not None:
+            return
+        _sampler = DebugSampler()
+        _queue_handler = _NonBlockingQueueHandler(queue.Queue(maxsize=LOG_QUEUE_SIZE))
+        _queue_handler.addFilter(RequestIdFilter())
+        _queue_handler.addFilter(_sampler)
+
+        root = logging.getLogger()
+        for h in list(root.handlers):
+            root.removeHandler(h)
+        root.addHandler(_queue_handler)
+        root.setLevel(LOG_LEVEL)
+        for name, level in _parse_levels(LOG_LEVELS).items():
+            logging.getLogger(name).setLevel(level)
+
+        _start_listener()
+        atexit.register(lambda: _listener and _listener.stop())
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def stats():
+    return {
+        "queued": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "dropped_queue_full": _queue_handler.dropped if _queue_handler else 0,
+        "dropped_debug_sampling": _sampler.dropped if _sampler else 0,
+    }
+
+
+# ---- Flask request id ----
+
+def _before_request():
+    from flask import g, request
+
+    rid = (request.headers.get(REQUEST_ID_HEADER) or "").strip()[:64] or uuid.uuid4().hex[:16]
+    g._log_request_id_token = _request_id.set(rid)
+
+
+def _after_request(resp):
+    rid = _request_id.get()
+    if rid != "-":
+        resp.headers[REQUEST_ID_HEADER] = rid
+    return resp
+
+
+def _teardown_request(exc):
+    from flask import g
+
+    token = g.pop("_log_request_id_token", None)
+    if token is not None:
+        try:
+            _request_id.reset(token)
+        except ValueError:
+            # 스트리밍 응답 등으로 다른 context 에서 teardown 되는 경우
+            _request_id.set("-")
+
+
+def init_app(app):
+    setup_logging()
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
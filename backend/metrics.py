@@ -0,0 +1,182 @@
+# backend/metrics.py
+"""
+Prometheus 지표 (/metrics).
+
+- route 별 latency histogram, in-flight 요청 수
+- upstream(yahoo / gpt5 / qwen) 호출 시간과 에러 수
+- upstream rate limiter 대기 시간 / 현재 rate / throttle 횟수 (backend.rate_limit)
+- LLM 토큰 사용량, 호출 출처 (upstream / cache / coalesced, backend.llm_gateway)
+- 모든 TTLCache 의 hit / miss (cache 이름 label)
+
+gunicorn 처럼 여러 worker 를 띄울 때는 PROMETHEUS_MULTIPROC_DIR 을 설정하면
+worker 들의 지표를 합쳐서 내보낸다 (prometheus_client multiprocess 모드).
+"""
+import os
+import time
+from contextlib import contextmanager
+
+from flask import Response, g, request
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+
+from backend import cache
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Flask request latency by route",
+    ["route", "method", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "http_requests_in_flight",
+    "Requests currently being handled",
+    ["route"],
+    multiprocess_mode="livesum",
+)
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Upstream call latency (yahoo, gpt5, qwen)",
+    ["upstream", "operation"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60, 120),
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total",
+    "Failed upstream calls",
+    ["upstream", "operation"],
+)
+RATE_LIMIT_WAIT = Histogram(
+    "upstream_rate_limit_wait_seconds",
+    "Time spent waiting for an upstream rate limit token",
+    ["upstream", "priority"],
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 30, 60),
+)
+RATE_LIMIT_REJECTED = Counter(
+    "upstream_rate_limit_rejected_total",
+    "Calls abandoned because no rate limit token was available in time",
+    ["upstream", "priority"],
+)
+UPSTREAM_RATE = Gauge(
+    "upstream_rate_limit_rate",
+    "Current adaptive request rate (req/s) shared by all workers",
+    ["upstream"],
+    multiprocess_mode="livemax",  # worker 들이 같은 공유 rate 를 본다
+)
+UPSTREAM_THROTTLED = Counter(
+    "upstream_throttled_total",
+    "429 / 5xx responses that made the rate limiter back off",
+    ["upstream"],
+)
+UPSTREAM_HEDGES = Counter(
+    "upstream_hedged_requests_total",
+    "Hedged (duplicate) upstream requests: sent, won by the hedge, or skipped for budget",
+    ["upstream", "outcome"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "LLM token usage reported by the upstream",
+    ["model", "kind"],
+)
+LLM_CALLS = Counter(
+    "llm_calls_total",
+    "LLM gateway calls by model and how they were served",
+    ["model", "source"],
+)
+STARTUP_SECONDS = Gauge(
+    "app_startup_seconds",
+    "Time from first import to app ready (see backend.startup)",
+    multiprocess_mode="max",
+)
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by cache name and result",
+    ["cache", "result"],
+)
+
+
+def _on_cache_lookup(name, hit):
+    CACHE_LOOKUPS.labels(name or "unnamed", "hit" if hit else "miss").inc()
+
+
+cache.set_lookup_hook(_on_cache_lookup)
+
+
+@contextmanager
+def track_upstream(upstream: str, operation: str):
+    """
+    with track_upstream("yahoo", "history"): ...
+    소요 시간을 기록하고, 예외가 나면 에러 카운트 후 그대로 다시 던진다.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(upstream, operation).inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(upstream, operation).observe(time.perf_counter() - start)
+
+
+def mark_upstream_error(upstream: str, operation: str):
+    """예외 없이 실패를 돌려주는 upstream (예: HTTP status != 200) 용."""
+    UPSTREAM_ERRORS.labels(upstream, operation).inc()
+
+
+def record_llm_usage(model: str, resp):
+    """OpenAI 호환 응답의 usage 필드에서 토큰 수를 기록 (없으면 무시)."""
+    usage = getattr(resp, "usage", None)
+    if usage is None:
+        return
+    for kind in ("prompt_tokens", "completion_tokens"):
+        n = getattr(usage, kind, None)
+        if n:
+            LLM_TOKENS.labels(model, kind.replace("_tokens", "")).inc(n)
+
+
+def _route_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "unmatched"
+
+
+def _before_request():
+    g._metrics_start = time.perf_counter()
+    g._metrics_route = _route_label()
+    REQUESTS_IN_FLIGHT.labels(g._metrics_route).inc()
+
+
+def _after_request(resp):
+    start = g.pop("_metrics_start", None)
+    if start is not None:
+        REQUEST_LATENCY.labels(g._metrics_route, request.method, str(resp.status_code)).observe(
+            time.perf_counter() - start
+        )
+    return resp
+
+
+def _teardown_request(exc):
+    route = g.pop("_metrics_route", None)
+    if route is not None:
+        REQUESTS_IN_FLIGHT.labels(route).dec()
+
+
+def metrics_view():
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        from prometheus_client import REGISTRY as registry
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    app.teardown_request(_teardown_request)
+    app.add_url_rule("/metrics", "metrics", metrics_view)
@@ -0,0 +1,45 @@
+# backend/negative_cache.py
+"""
+info / 가격 데이터가 없던 심볼(오타, 부분 입력, 상장폐지)을 짧은 TTL 동안 기억하는 negative cache.
+search / quote 경로에서 upstream 호출 전에 확인해서, 실패가 확정된 yfinance 호출을 반복하지 않는다.
+"""
+import os
+import threading
+
+from backend.cache import TTLCache
+
+NEGATIVE_CACHE_TTL = float(os.getenv("NEGATIVE_CACHE_TTL", "300"))
+
+_bad_symbols = TTLCache(ttl=NEGATIVE_CACHE_TTL, maxsize=10000, name="negative_symbols")
+_saved_calls = 0
+_saved_lock = threading.Lock()
+
+
+def is_known_bad(symbol: str, upstream_calls: int = 1) -> bool:
+    """
+    최근에 실패한 심볼이면 True.
+    upstream_calls: 이 확인으로 생략되는 upstream 호출 수 (절약 횟수 집계용)
+    """
+    if _bad_symbols.get(symbol.upper()) is None:
+        return False
+    record_saved(upstream_calls)
+    return True
+
+
+def record_saved(upstream_calls: int = 1):
+    global _saved_calls
+    with _saved_lock:
+        _saved_calls += upstream_calls
+
+
+def mark_bad(symbol: str, reason: str = "no data"):
+    _bad_symbols.set(symbol.upper(), reason)
+
+
+def stats():
+    return {
+        "entries": len(_bad_symbols),
+        "ttl_seconds": NEGATIVE_CACHE_TTL,
+        "hits": _bad_symbols.hits,
+        "saved_upstream_calls": _saved_calls,
+    }
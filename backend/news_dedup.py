@@ -0,0 +1,106 @@
+# backend/news_dedup.py
+"""
+제목이 조금씩 다른 같은 기사(배급처 / 매체별 헤드라인 변형)를 하나로 묶는다.
+
+- 제목 + 요약을 단어 unigram / bigram 집합으로 만들고 MinHash 서명(NEWS_MINHASH_PERM 개)을 계산
+- LSH: 서명을 band 로 나눠 band 가 하나라도 같은 기사끼리만 후보로 비교하므로
+  기사 수가 늘어도 전체 쌍을 비교하지 않는다 (대략 O(n))
+- 후보 쌍은 서명으로 추정한 Jaccard 가 NEWS_DUP_THRESHOLD 이상일 때만 같은 묶음 (union-find)
+- 묶음마다 가장 앞(최신순 정렬이면 가장 최근) 기사를 남기고 related_symbols 를 합친다
+"""
+import os
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+NEWS_DUP_THRESHOLD = float(os.getenv("NEWS_DUP_THRESHOLD", "0.5"))
+NEWS_MINHASH_PERM = 60
+_BANDS = 20  # 20 band x 3 row: Jaccard 0.5 -> 후보 확률 ~93%, 0.1 -> ~2%
+_ROWS = NEWS_MINHASH_PERM // _BANDS
+
+_PRIME = (1 << 31) - 1
+# 고정 seed: 프로세스가 달라도 같은 서명
+_A, _B = np.random.default_rng(20240601).integers(1, _PRIME, (2, NEWS_MINHASH_PERM), dtype=np.uint64)
+
+_WORD = re.compile(r"[0-9a-z가-힣]+")
+_STOPWORDS = frozenset(
+    "a an the and or of to in on for at by with from as is are was be it its this that after over".split()
+)
+
+
+def shingles(text: str) -> set:
+    words = [w for w in _WORD.findall((text or "").lower()) if w not in _STOPWORDS]
+    out = set(words)
+    out.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return out
+
+
+def signature(tokens) -> np.ndarray:
+    """MinHash 서명 (uint64 x NEWS_MINHASH_PERM). 토큰이 없으면 None."""
+    if not tokens:
+        return None
+    x = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+    # (a * x + b) mod p : a, x < 2^31 이라 곱이 uint64 를 넘지 않는다
+    hashed = (np.outer(x % _PRIME, _A) + _B) % _PRIME
+    return hashed.min(axis=0)
+
+
+def _find(parent, i):
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def cluster_indices(texts, threshold: float = NEWS_DUP_THRESHOLD) -> list:
+    """texts 중 near-duplicate 끼리 묶은 index 리스트들 (각 묶음은 오름차순, 묶음 순서는 첫 index 순)."""
+    n = len(texts)
+    sigs = [signature(shingles(t)) for t in texts]
+    parent = list(range(n))
+
+    buckets = defaultdict(list)
+    for i, sig in enumerate(sigs):
+        if sig is None:
+            continue
+        for b in range(_BANDS):
+            buckets[(b, sig[b * _ROWS:(b + 1) * _ROWS].tobytes())].append(i)
+
+    checked = set()
+    for members in buckets.values():
+        for k, j in enumerate(members):
+            for i in members[:k]:
+                if (i, j) in checked:
+                    continue
+                checked.add((i, j))
+                ri, rj = _find(parent, i), _find(parent, j)
+                if ri == rj:
+                    continue
+                if np.count_nonzero(sigs[i] == sigs[j]) / NEWS_MINHASH_PERM >= threshold:
+                    parent[max(ri, rj)] = min(ri, rj)
+
+    groups = defaultdict(list)
+    for i in range(n):
+        groups[_find(parent, i)].append(i)
+    return sorted(groups.values(), key=lambda g: g[0])
+
+
+def merge_near_duplicates(articles, threshold: float = NEWS_DUP_THRESHOLD) -> list:
+    """
+    get_news 기사 dict 리스트 -> 묶음마다 한 건. 남는 건 묶음의 첫 기사(입력 순서 기준),
+    related_symbols 는 묶음 전체의 합집합(정렬)으로 바뀐다.
+    """
+    if len(articles) < 2:
+        return list(articles)
+    texts = [f"{a.get('title', '')} {a.get('summary', '')}" for a in articles]
+    merged = []
+    for group in cluster_indices(texts, threshold):
+        keep = articles[group[0]]
+        if len(group) > 1:
+            related = set()
+            for i in group:
+                related.update(articles[i].get("related_symbols") or [])
+            keep["related_symbols"] = sorted(related)
+        merged.append(keep)
+    return merged
@@ -0,0 +1,130 @@
+# backend/preload.py
+"""
+gunicorn --preload 용: 읽기 전용 데이터를 master 에서 한 번 만들고 fork 로 worker 들과 공유한다.
+
+    gunicorn --preload -c gunicorn.conf.py 'yfinance_api:create_app()'
+
+- warm(): 무거운 모듈(PRELOAD_MODULES: yfinance / pandas / openai ...)과 읽기 전용 데이터
+  (KRX 종목표, last-known-good 스냅샷 등, register() 로 등록)를 fork 전에 읽어 둔다.
+  KRX 종목표는 컬럼별 numpy 배열이라 객체 수가 적다 (참조 카운트 변경으로 페이지가 복사되지 않음).
+- freeze(): gc.collect() 후 gc.freeze() 로 지금까지의 객체를 GC 대상에서 빼서
+  worker 의 GC 가 공유 페이지의 GC 헤더를 건드려 copy-on-write 가 일어나지 않게 한다.
+- after_fork(): worker 별 메모리(RSS / PSS / 공유 / 전용)를 시작 직후와 PRELOAD_REPORT_DELAY 초 뒤에 로그로 남긴다.
+  PSS 가 RSS 보다 충분히 작으면 공유가 유지되고 있는 것.
+
+--preload 없이 띄우면 worker 마다 create_app() 이 불리므로 예전처럼 각자 로드한다.
+확인용 CLI: python -m backend.preload  (master 에서 warm 전후 메모리)
+"""
+import gc
+import importlib
+import logging
+import os
+import threading
+import time
+
+PRELOAD_MODULES = [m for m in os.getenv("PRELOAD_MODULES", "numpy,pandas,yfinance,openai,requests").split(",") if m]
+PRELOAD_REPORT_DELAY = float(os.getenv("PRELOAD_REPORT_DELAY", "60"))
+
+_loaders = []  # (name, fn)
+_warmed = False
+
+log = logging.getLogger(__name__)
+
+
+def register(name, fn):
+    """fork 전에 한 번 불러 둘 읽기 전용 데이터 로더를 등록."""
+    _loaders.append((name, fn))
+
+
+def _register_defaults():
+    from backend import krx_listing, snapshots
+
+    register("krx_listing", krx_listing.get_listing)
+    register("snapshots", snapshots.warm_caches)
+
+
+def memory_report(pid="self") -> dict:
+    """/proc/<pid>/smaps_rollup 기준 MB (Linux 가 아니면 RSS 만, 그것도 없으면 빈 dict)."""
+    fields = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared_clean", "Shared_Dirty": "shared_dirty",
+              "Private_Clean": "private_clean", "Private_Dirty": "private_dirty"}
+    out = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in fields:
+                    out[fields[key]] = round(int(rest.split()[0]) / 1024, 1)
+    except OSError:
+        try:
+            import resource
+
+            rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            out["rss"] = round(rss / (1024 * 1024 if os.uname().sysname == "Darwin" else 1024), 1)
+        except Exception:
+            pass
+    if "shared_clean" in out:
+        out["shared"] = round(out.pop("shared_clean") + out.pop("shared_dirty"), 1)
+        out["private"] = round(out.pop("private_clean") + out.pop("private_dirty"), 1)
+    return out
+
+
+def warm():
+    """무거운 모듈 import + 등록된 데이터 로드. 항목별 소요 시간(ms)을 돌려준다."""
+    global _warmed
+    timings = {}
+    if _warmed:
+        return timings
+    _register_defaults()
+    for name in PRELOAD_MODULES:
+        start = time.perf_counter()
+        try:
+            importlib.import_module(name.strip())
+        except Exception as e:
+            log.warning("preload: import %s failed: %s", name, e)
+            continue
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    for name, fn in _loaders:
+        start = time.perf_counter()
+        try:
+            fn()
+        except Exception as e:
+            log.warning("preload: %s failed: %s", name, e)
+            continue
+        timings[name] = round((time.perf_counter() - start) * 1000, 1)
+    _warmed = True
+    return timings
+
+
+def freeze():
+    """지금까지 만든 객체를 GC 영구 세대로 (fork 직전에 부른다)."""
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def after_fork(worker_id=None):
+    """worker 에서 fork 직후 호출: 메모리 보고 (즉시 + PRELOAD_REPORT_DELAY 초 뒤)."""
+    label = worker_id if worker_id is not None else os.getpid()
+    log.info("worker %s memory at fork: %s", label, memory_report())
+    if PRELOAD_REPORT_DELAY > 0:
+        timer = threading.Timer(
+            PRELOAD_REPORT_DELAY,
+            lambda: log.info("worker %s memory after %.0fs: %s", label, PRELOAD_REPORT_DELAY, memory_report()),
+        )
+        timer.daemon = True
+        timer.start()
+
+
+def _main():
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+    before = memory_report()
+    timings = warm()
+    loaded = memory_report()
+    frozen = freeze()
+    log.info("preload before: %s", before)
+    log.info("preload warmed: %s", timings)
+    log.info("preload after: %s (gc frozen objects: %d)", loaded, frozen)
+
+
+if __name__ == "__main__":
+    _main()
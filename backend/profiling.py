@@ -0,0 +1,258 @@
+# backend/profiling.py
+"""
+런타임에 켜고 끄는 샘플링 요청 프로파일러 (flamegraph 용 collapsed stack 출력).
+
+- 켜져 있을 때만 app.wsgi_app 을 감싼다. 꺼져 있으면 원래 wsgi_app 으로 되돌리므로
+  요청 경로에 추가 코드가 전혀 없다 (overhead 0).
+- 대상 요청: sample_rate 확률로 뽑거나, routes 에 지정한 route rule (예: "/api/search") 은 항상.
+- 공용 sampler 스레드 하나가 PROFILE_INTERVAL 마다 프로파일 중인 요청 스레드의 stack 을 찍는다.
+  wall-clock 기준이라 DataFrame 처리뿐 아니라 네트워크 대기 시간도 보인다.
+- route 별로 합산한 stack 을 PROFILE_DIR/<route>.folded 로 dump
+  ("frame;frame;frame count" 형식, flamegraph.pl / speedscope / inferno 에서 바로 열 수 있음).
+
+설정:
+  env  PROFILE_SAMPLE_RATE=0.05  PROFILE_ROUTES=/api/search,/api/news   (부팅 시 켜기)
+  HTTP GET/POST /api/profiling, POST /api/profiling/dump   (X-Profiling-Token == PROFILING_TOKEN 필요)
+설정은 프로세스(worker) 단위다. gunicorn worker 가 여러 개면 worker 마다 따로 켜진다.
+"""
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from flask import abort, jsonify, request
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "profiles"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_DUMP_EVERY = int(os.getenv("PROFILE_DUMP_EVERY", "50"))
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+_MAX_DEPTH = 128
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _collapse(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def _route_slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+
+
+class _ActiveRequest:
+    __slots__ = ("route", "stacks", "started")
+
+    def __init__(self, route):
+        self.route = route
+        self.stacks = Counter()
+        self.started = time.perf_counter()
+
+
+class Profiler:
+    def __init__(self, interval=PROFILE_INTERVAL, out_dir=PROFILE_DIR, dump_every=PROFILE_DUMP_EVERY):
+        self.interval = interval
+        self.out_dir = out_dir
+        self.dump_every = dump_every
+        self.sample_rate = 0.0
+        self.routes = set()
+        self._app = None
+        self._original_wsgi = None
+        self._active = {}  # thread ident -> _ActiveRequest
+        self._profiles = {}  # route -> Counter(stack -> samples)
+        self._requests = Counter()  # route -> 프로파일한 요청 수
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+
+    # ---- on / off ----
+    @property
+    def enabled(self) -> bool:
+        return self._original_wsgi is not None
+
+    def configure(self, sample_rate=None, routes=None):
+        with self._lock:
+            if sample_rate is not None:
+                self.sample_rate = min(max(float(sample_rate), 0.0), 1.0)
+            if routes is not None:
+                self.routes = {r.strip() for r in routes if r and r.strip()}
+            want = self.sample_rate > 0 or bool(self.routes)
+        if want and not self.enabled:
+            self._install()
+        elif not want and self.enabled:
+            self._uninstall()
+
+    def _install(self):
+        self._original_wsgi = self._app.wsgi_app
+        self._app.wsgi_app = self._wsgi
+        self._start_sampler()
+
+    def _start_sampler(self):
+        # sampler 마다 새 Event: 껐다가 interval 안에 다시 켜도 이전 sampler 가 되살아나지 않는다
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample_loop, args=(self._stop,),
+                                         name="profiler-sampler", daemon=True)
+        self._sampler.start()
+
+    def _uninstall(self):
+        self._app.wsgi_app = self._original_wsgi
+        self._original_wsgi = None
+        self._stop.set()
+        self.dump()
+
+    # ---- request wrapper (켜져 있을 때만 사용) ----
+    def _match_route(self, environ):
+        try:
+            rule, _ = self._app.url_map.bind_to_environ(environ).match(return_rule=True)
+            return rule.rule
+        except Exception:
+            return None
+
+    def _wsgi(self, environ, start_response):
+        original = self._original_wsgi
+        if original is None:  # 방금 꺼진 경우
+            return self._app.wsgi_app(environ, start_response)
+        route = self._match_route(environ)
+        if route is None or not (route in self.routes or random.random() < self.sample_rate):
+            return original(environ, start_response)
+
+        ident = threading.get_ident()
+        active = _ActiveRequest(route)
+        with self._lock:
+            self._active[ident] = active
+        try:
+            return original(environ, start_response)
+        finally:
+            with self._lock:
+                self._active.pop(ident, None)
+            self._finish(active)
+
+    def _finish(self, active):
+        if not active.stacks:
+            return
+        with self._lock:
+            self._profiles.setdefault(active.route, Counter()).update(active.stacks)
+            self._requests[active.route] += 1
+            self._pending += 1
+            should_dump = self._pending >= self.dump_every
+        if should_dump:
+            self.dump()
+
+    # ---- sampler ----
+    def _sample_loop(self, stop):
+        me = threading.get_ident()
+        while not stop.wait(self.interval):
+            with self._lock:
+                if not self._active:
+                    continue
+                targets = dict(self._active)
+            frames = sys._current_frames()
+            for ident, active in targets.items():
+                frame = frames.get(ident)
+                if frame is not None and ident != me:
+                    active.stacks[_collapse(frame)] += 1
+
+    # ---- output ----
+    def dump(self):
+        """route 별 누적 stack 을 <out_dir>/<route>.folded 로 기록 (덮어쓰기). 기록한 파일 목록 반환."""
+        with self._lock:
+            profiles = {route: Counter(stacks) for route, stacks in self._profiles.items()}
+            self._pending = 0
+        if not profiles:
+            return []
+        os.makedirs(self.out_dir, exist_ok=True)
+        written = []
+        for route, stacks in profiles.items():
+            path = os.path.join(self.out_dir, _route_slug(route) + ".folded")
+            tmp = path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                for stack, count in stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            os.replace(tmp, path)
+            written.append(path)
+        return written
+
+    def reset(self):
+        with self._lock:
+            self._profiles.clear()
+            self._requests.clear()
+            self._pending = 0
+
+    def status(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "sample_rate": self.sample_rate,
+                "routes": sorted(self.routes),
+                "interval_seconds": self.interval,
+                "out_dir": self.out_dir,
+                "profiled_requests": dict(self._requests),
+                "samples": {route: sum(c.values()) for route, c in self._profiles.items()},
+            }
+
+
+profiler = Profiler()
+
+
+def _check_token():
+    # 토큰이 설정되지 않았으면 제어 endpoint 자체를 숨긴다
+    if not PROFILING_TOKEN:
+        abort(404)
+    if request.headers.get("X-Profiling-Token") != PROFILING_TOKEN:
+        abort(403)
+
+
+def profiling_view():
+    """
+    GET  /api/profiling -> 현재 설정 / 누적 샘플 수
+    POST /api/profiling  { "sample_rate": 0.1, "routes": ["/api/search"], "reset": false }
+         sample_rate 0 + routes [] 이면 끈다 (끌 때 자동 dump).
+    """
+    _check_token()
+    if request.method == "POST":
+        body = request.get_json(silent=True) or {}
+        if body.get("reset"):
+            profiler.reset()
+        routes = body.get("routes")
+        if isinstance(routes, str):
+            routes = routes.split(",")
+        try:
+            profiler.configure(sample_rate=body.get("sample_rate"), routes=routes)
+        except (TypeError, ValueError):
+            return jsonify({"error": "sample_rate must be a number between 0 and 1"}), 400
+    return jsonify(profiler.status())
+
+
+def profiling_dump_view():
+    """POST /api/profiling/dump -> { "files": [...] }"""
+    _check_token()
+    return jsonify({"files": profiler.dump()})
+
+
+def _after_fork_in_child():
+    # gunicorn --preload 로 master 에서 켜졌다면 worker 에는 sampler 스레드가 없다
+    if profiler.enabled:
+        profiler._lock = threading.Lock()
+        profiler._start_sampler()
+
+
+def init_app(app):
+    profiler._app = app
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+    app.add_url_rule("/api/profiling", "profiling", profiling_view, methods=["GET", "POST"])
+    app.add_url_rule("/api/profiling/dump", "profiling_dump", profiling_dump_view, methods=["POST"])
+    rate = float(os.getenv("PROFILE_SAMPLE_RATE", "0") or 0)
+    routes = [r for r in os.getenv("PROFILE_ROUTES", "").split(",") if r.strip()]
+    if rate > 0 or routes:
+        profiler.configure(sample_rate=rate, routes=routes)
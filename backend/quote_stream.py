@@ -0,0 +1,177 @@
+# backend/quote_stream.py
+"""
+구독형 실시간 시세 허브 (SSE 스트리밍용).
+
+- 클라이언트는 심볼 집합을 구독하고, 허브는 구독 중인 "서로 다른" 심볼 전체를
+  interval 마다 bulk quote 한 번으로 갱신한 뒤 각 구독자에게 필요한 심볼만 나눠준다.
+- upstream 부하는 접속자 수가 아니라 distinct 심볼 수에 비례한다.
+- 허브는 프로세스 단위이므로 gunicorn 은 worker 수를 적게, 스레드를 많이 (gthread) 쓰는 편이 유리하다.
+- gthread 에서는 SSE 연결 하나가 worker 스레드 하나를 연결 내내 잡는다. 일반 요청용 스레드가 남도록
+  동시 구독자 수를 QUOTE_STREAM_MAX_SUBSCRIBERS (기본: GUNICORN_THREADS 의 절반) 로 제한하고,
+  넘치면 StreamCapacityExceeded -> 503 (클라이언트는 폴링으로 fallback).
+"""
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+
+from backend import rate_limit
+from backend.quotes import fetch_quotes, normalize_symbols
+
+QUOTE_STREAM_INTERVAL = float(os.getenv("QUOTE_STREAM_INTERVAL", "15"))
+MAX_STREAM_SYMBOLS = 50
+QUOTE_STREAM_MAX_SUBSCRIBERS = int(
+    os.getenv("QUOTE_STREAM_MAX_SUBSCRIBERS", str(max(1, int(os.getenv("GUNICORN_THREADS", "32")) // 2)))
+)
+_SUBSCRIBER_QUEUE_SIZE = 8
+
+log = logging.getLogger(__name__)
+
+
+class StreamCapacityExceeded(Exception):
+    """이 worker 의 동시 스트림 수가 상한에 도달 (스레드를 더 잡지 않고 거절)."""
+
+
+class Subscription:
+    def __init__(self, sub_id, symbols):
+        self.id = sub_id
+        self.symbols = set(symbols)
+        self.queue = queue.Queue(maxsize=_SUBSCRIBER_QUEUE_SIZE)
+
+    def push(self, update):
+        """느린 클라이언트 때문에 허브가 막히지 않도록, 큐가 차면 가장 오래된 업데이트를 버린다."""
+        while True:
+            try:
+                self.queue.put_nowait(update)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class QuoteHub:
+    def __init__(self, interval=QUOTE_STREAM_INTERVAL, fetch=fetch_quotes,
+                 max_subscribers=QUOTE_STREAM_MAX_SUBSCRIBERS):
+        self.interval = interval
+        self.max_subscribers = max_subscribers
+        self._fetch = fetch
+        self._subs = {}
+        self._refcount = {}  # symbol -> 구독자 수
+        self._latest = {}  # symbol -> 마지막으로 보낸 quote
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self.polls = 0
+        self.rejected = 0
+
+    # ---- subscription management ----
+    def subscribe(self, symbols):
+        symbols = normalize_symbols(symbols)[:MAX_STREAM_SYMBOLS]
+        with self._lock:
+            if len(self._subs) >= self.max_subscribers:
+                self.rejected += 1
+                raise StreamCapacityExceeded(f"{len(self._subs)} streams open (max {self.max_subscribers})")
+            sub = Subscription(next(self._ids), symbols)
+            self._subs[sub.id] = sub
+            new_symbols = False
+            for sym in symbols:
+                self._refcount[sym] = self._refcount.get(sym, 0) + 1
+                new_symbols = new_symbols or sym not in self._latest
+            snapshot = {s: self._latest[s] for s in symbols if s in self._latest}
+            self._ensure_thread()
+        if snapshot:
+            sub.push(snapshot)
+        if new_symbols:
+            # 처음 보는 심볼은 다음 주기까지 기다리지 않고 바로 갱신
+            self._wakeup.set()
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            if self._subs.pop(sub.id, None) is None:
+                return
+            for sym in sub.symbols:
+                left = self._refcount.get(sym, 0) - 1
+                if left <= 0:
+                    self._refcount.pop(sym, None)
+                    self._latest.pop(sym, None)
+                else:
+                    self._refcount[sym] = left
+
+    def stats(self):
+        with self._lock:
+            return {
+                "subscribers": len(self._subs),
+                "max_subscribers": self.max_subscribers,
+                "rejected": self.rejected,
+                "distinct_symbols": len(self._refcount),
+                "polls": self.polls,
+                "interval_seconds": self.interval,
+            }
+
+    # ---- polling loop ----
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="quote-hub", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._subs:
+                    self._thread = None
+                    return
+                symbols = list(self._refcount)
+            try:
+                # 주기적 갱신은 사용자 요청보다 뒤로 (Yahoo rate limit 의 background 몫)
+                with rate_limit.background():
+                    self.poll_once(symbols)
+            except Exception as e:
+                log.warning("quote hub poll error: %s", e)
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+
+    def poll_once(self, symbols):
+        """distinct 심볼 전체를 한 번에 조회하고, 바뀐 시세만 해당 구독자들에게 전달."""
+        if not symbols:
+            return
+        quotes = self._fetch(symbols, fresh=True)
+        self.polls += 1
+        with self._lock:
+            changed = {}
+            for sym, q in quotes.items():
+                if sym in self._refcount and self._latest.get(sym) != q:
+                    self._latest[sym] = q
+                    changed[sym] = q
+            targets = list(self._subs.values())
+        if not changed:
+            return
+        for sub in targets:
+            update = {s: changed[s] for s in sub.symbols if s in changed}
+            if update:
+                sub.push(update)
+
+
+hub = QuoteHub()
+
+
+def stream_updates(sub, keepalive=15.0):
+    """
+    Subscription 을 기다리면서 (update dict | None) 을 yield 하는 제너레이터.
+    None 은 keepalive 타이밍 (SSE comment 전송용).
+    """
+    deadline = time.monotonic() + keepalive
+    while True:
+        timeout = max(0.0, deadline - time.monotonic())
+        try:
+            update = sub.queue.get(timeout=timeout)
+        except queue.Empty:
+            deadline = time.monotonic() + keepalive
+            yield None
+            continue
+        yield update
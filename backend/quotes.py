@@ -0,0 +1,168 @@
+# backend/quotes.py
+"""
+여러 심볼의 최신 시세를 yf.download 한 번으로 가져오는 bulk quote 헬퍼.
+- 심볼별로 짧은 TTL 캐시에 저장하므로 동시에 들어오는 요청들은 캐시를 공유한다.
+- 결과 계산(마지막 종가 / 직전 종가)은 (날짜 x 심볼) 행렬에서 한 번에 처리한다.
+- 받은 시세는 backend.snapshots 에도 남겨서, upstream 이 실패하면 마지막 값을 stale_since 와 함께 돌려준다.
+"""
+import logging
+import os
+import time
+
+import numpy as np
+
+from backend import negative_cache, rate_limit, snapshots
+from backend.cache import TTLCache
+
+QUOTE_CACHE_TTL = float(os.getenv("QUOTE_CACHE_TTL", "60"))
+
+_quote_cache = TTLCache(ttl=QUOTE_CACHE_TTL, maxsize=4096, name="quotes")
+
+log = logging.getLogger(__name__)
+
+
+def normalize_symbols(symbols):
+    """대문자/공백 제거 + 순서를 유지한 중복 제거."""
+    out = []
+    seen = set()
+    for s in symbols or []:
+        sym = str(s or "").strip().upper()
+        if sym and sym not in seen:
+            seen.add(sym)
+            out.append(sym)
+    return out
+
+
+def currency_for(symbol: str) -> str:
+    return "KRW" if symbol.endswith(".KS") or symbol.endswith(".KQ") else "USD"
+
+
+def _last_two_valid(close):
+    """
+    close: (T, N) float 행렬 (거래일이 다른 시장이 섞여 NaN 이 있을 수 있음)
+    Returns: (price[N], prev_close[N]) - 각 열의 마지막 유효값과 그 직전 유효값
+    """
+    t, n = close.shape
+    cols = np.arange(n)
+    valid = ~np.isnan(close)
+    has_any = valid.any(axis=0)
+    last_idx = t - 1 - np.argmax(valid[::-1], axis=0)
+    price = np.where(has_any, close[last_idx, cols], np.nan)
+
+    valid_prev = valid.copy()
+    valid_prev[last_idx, cols] = False
+    has_prev = valid_prev.any(axis=0)
+    prev_idx = t - 1 - np.argmax(valid_prev[::-1], axis=0)
+    prev = np.where(has_prev, close[prev_idx, cols], price)
+    return price, prev
+
+
+def _bulk_download(symbols):
+    """Returns (quotes, errors) - errors 는 yfinance 가 남긴 {SYMBOL: 오류 메시지}."""
+    import pandas as pd
+
+    df, errors = rate_limit.download(
+        symbols,
+        period="5d",
+        interval="1d",
+        group_by="column",
+        auto_adjust=True,
+        threads=True,
+    )
+    if df is None or df.empty:
+        return {}, errors
+    close = df["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(symbols[0])
+    close = close.reindex(columns=symbols)
+    price, prev = _last_two_valid(close.to_numpy(dtype=float))
+    change_pct = np.where(prev > 0, (price - prev) / np.where(prev > 0, prev, 1) * 100, 0.0)
+
+    out = {}
+    for i, sym in enumerate(symbols):
+        if np.isnan(price[i]) or price[i] <= 0:
+            continue
+        out[sym] = {
+            "symbol": sym,
+            "price": float(price[i]),
+            "prev_close": float(prev[i]),
+            "change_pct": float(change_pct[i]),
+        }
+    return out, errors
+
+
+def fetch_quotes(symbols, fresh=False):
+    """
+    Returns {SYMBOL: {"symbol", "price", "prev_close", "change_pct"}}.
+    캐시에 없는 심볼만 모아서 upstream 에 한 번 요청한다.
+    - negative cache 에는 심볼 문제로 확인된 것만 기록한다: yfinance 가 그 심볼에 no data / delisted 오류를
+      남겼거나, 같은 호출에서 다른 심볼은 시세가 왔는데 그 심볼만 오류 없이 빠진 경우
+      (429 / timeout / 연결 오류 등 다른 오류가 남았으면 제외).
+    - 결과가 통째로 비면 (yfinance 는 429 / 일시 오류에도 빈 frame 을 준다) upstream 장애로 보고
+      스냅샷 시세를 stale_since 와 함께 돌려준다 (스냅샷이 없으면 예외는 다시 던지고, 빈 결과는 그대로).
+    fresh=True 면 캐시를 읽지 않고 모두 다시 받는다 (받은 값은 캐시에 저장).
+    """
+    symbols = normalize_symbols(symbols)
+    quotes = {}
+    missing = []
+    skipped = 0
+    for sym in symbols:
+        q = None if fresh else _quote_cache.get(sym)
+        if q is not None:
+            quotes[sym] = q
+        elif negative_cache.is_known_bad(sym, upstream_calls=0):
+            skipped += 1
+        else:
+            missing.append(sym)
+    if skipped and not missing:
+        # 남은 심볼이 모두 negative cache 로 걸러져서 bulk 호출 자체를 생략
+        negative_cache.record_saved(1)
+
+    if missing:
+        failure = None
+        try:
+            fetched, errors = _bulk_download(missing)
+        except Exception as e:
+            fetched, errors, failure = {}, {}, e
+        for sym, q in fetched.items():
+            _quote_cache.set(sym, q)
+            snapshots.quotes.put(sym, q)
+        for sym in missing:
+            if sym in fetched:
+                continue
+            error = errors.get(sym)
+            if rate_limit.is_no_data_error(error) or (fetched and error is None):
+                negative_cache.mark_bad(sym, error or "no price data")
+        quotes.update(fetched)
+        if not fetched:
+            stale = stale_quotes(missing)
+            if failure is not None and not stale:
+                raise failure
+            if stale:
+                log.warning("bulk quote returned nothing (%s), serving %d snapshot quotes",
+                            failure or "empty result", len(stale))
+            quotes.update(stale)
+    return quotes
+
+
+def stale_quotes(symbols):
+    """스냅샷에 남은 마지막 시세 (캐시에는 넣지 않음). 각 dict 에 stale_since 가 붙는다."""
+    out = {}
+    for sym in symbols:
+        found = snapshots.quotes.get(sym)
+        if found is not None:
+            q, saved_at = found
+            out[sym] = dict(q, stale_since=snapshots.stale_since(saved_at))
+    return out
+
+
+def warm_cache(entries):
+    """부팅 시 스냅샷 (symbol, quote, saved_at) 들을 남은 TTL 만큼 캐시에 채운다."""
+    now = time.time()
+    warmed = 0
+    for sym, q, saved_at in entries:
+        remaining = QUOTE_CACHE_TTL - (now - saved_at)
+        if remaining > 0:
+            _quote_cache.set(sym, q, ttl=remaining)
+            warmed += 1
+    return warmed
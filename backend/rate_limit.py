@@ -0,0 +1,397 @@
+# backend/rate_limit.py
+"""
+Yahoo(yfinance / 검색 API) 호출용 공유 token bucket + AIMD.
+
+- bucket 상태(토큰 수, 현재 rate)는 작은 상태 파일 하나에 두고 fcntl 로 잠가서
+  같은 호스트의 gunicorn worker 전체가 하나의 호출 예산을 나눠 쓴다.
+  (fcntl 이 없거나 파일을 못 열면 프로세스 단위 bucket 으로 동작)
+- 429 / 5xx 가 오면 rate 를 곱으로 줄이고(multiplicative decrease) 남은 토큰을 비운다.
+  성공할 때마다 rate 를 조금씩 올린다(additive increase). 한 번의 폭주로 동시에 들어온
+  실패들이 rate 를 연달아 깎지 않도록 감소는 YAHOO_RATE_COOLDOWN 초에 한 번만.
+- 우선순위: interactive(사용자 요청) / background(시세 허브 폴링, history 채우기 등).
+  background 는 bucket 의 YAHOO_INTERACTIVE_RESERVE 비율만큼은 남겨두고 가져가므로
+  바쁠 때도 사용자 요청이 먼저 토큰을 얻는다.
+
+    with yahoo_call("history"):          # 토큰 획득 + 지표 기록 + 429/5xx 피드백
+        df = ticker.history(period="2d")
+
+    with background():                   # 이 블록 안의 Yahoo 호출은 background 우선순위
+        hub.poll_once(symbols)
+
+    df, errors = download(symbols, period="5d")   # yf.download: 토큰은 종목 수만큼, 삼켜진 429 감지
+
+yfinance 는 429 를 예외 대신 종목별 오류(로그 / shared._ERRORS)로만 남기고 빈 frame 을 돌려주는 경우가 있다.
+그래서 빈 결과는 성공으로 치지 않고(rate 를 올리지 않음), 종목별 오류에 429 가 있으면 throttle 로 본다.
+"""
+import ast
+import contextvars
+import logging
+import os
+import random
+import struct
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경
+    fcntl = None
+
+from backend import metrics
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+YAHOO_RATE = float(os.getenv("YAHOO_RATE", "5"))  # 시작 rate (req/s)
+YAHOO_RATE_MIN = float(os.getenv("YAHOO_RATE_MIN", "0.5"))
+YAHOO_RATE_MAX = float(os.getenv("YAHOO_RATE_MAX", "20"))
+YAHOO_BURST = float(os.getenv("YAHOO_BURST", "10"))
+YAHOO_RATE_STEP = float(os.getenv("YAHOO_RATE_STEP", "0.05"))  # 성공 1회당 증가량
+YAHOO_RATE_BACKOFF = float(os.getenv("YAHOO_RATE_BACKOFF", "0.5"))  # 실패 시 곱
+YAHOO_RATE_COOLDOWN = float(os.getenv("YAHOO_RATE_COOLDOWN", "2"))
+YAHOO_INTERACTIVE_RESERVE = float(os.getenv("YAHOO_INTERACTIVE_RESERVE", "0.3"))
+YAHOO_MAX_WAIT = float(os.getenv("YAHOO_MAX_WAIT", "10"))  # interactive 최대 대기 (초)
+YAHOO_BACKGROUND_MAX_WAIT = float(os.getenv("YAHOO_BACKGROUND_MAX_WAIT", "60"))
+YAHOO_RATE_STATE = os.getenv(
+    "YAHOO_RATE_STATE", os.path.join(tempfile.gettempdir(), "yahoo-rate-limit.state")
+)
+
+# tokens, updated_at, rate, paused_until, last_cut
+_STATE = struct.Struct("<5d")
+_MAX_SLEEP = 0.25
+
+_priority = contextvars.ContextVar("upstream_priority", default=INTERACTIVE)
+
+log = logging.getLogger(__name__)
+
+
+class RateLimitTimeout(Exception):
+    """max_wait 안에 토큰을 얻지 못함 (upstream 을 호출하지 않고 포기)."""
+
+
+class YahooThrottled(Exception):
+    """yf.download 가 삼킨 429 로 결과가 통째로 비었음."""
+
+    status_code = 429
+
+
+def is_throttle_error(exc) -> bool:
+    """
+    429 / 5xx 로 보이는 예외인지 (urllib HTTPError, requests, yfinance YFRateLimitError).
+    yfinance 가 남긴 종목별 오류 문자열을 그대로 넘겨도 된다.
+    """
+    if type(exc).__name__ == "YFRateLimitError":
+        return True
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    response = getattr(exc, "response", None)
+    if code is None and response is not None:
+        code = getattr(response, "status_code", None)
+    if isinstance(code, int):
+        return code == 429 or 500 <= code < 600
+    text = str(exc)
+    return "429" in text or "Too Many Requests" in text or "YFRateLimitError" in text
+
+
+def is_no_data_error(message) -> bool:
+    """
+    yfinance 의 종목별 오류가 '그 심볼에 데이터가 없음' 인지 (429 / 일시 오류와 구분).
+    Yahoo 가 status_code 를 돌려준 경우는 같은 문구라도 upstream 오류로 본다.
+    """
+    text = str(message or "").lower()
+    if "status_code" in text:
+        return False
+    return "delisted" in text or "no price data" in text or "no data found" in text
+
+
+def _retry_after(exc) -> float:
+    headers = getattr(exc, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None)
+    try:
+        return float(headers.get("Retry-After")) if headers else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class SharedTokenBucket:
+    def __init__(self, name, path, rate, burst, rate_min, rate_max,
+                 step=YAHOO_RATE_STEP, backoff=YAHOO_RATE_BACKOFF, cooldown=YAHOO_RATE_COOLDOWN,
+                 reserve=YAHOO_INTERACTIVE_RESERVE):
+        self.name = name
+        self.path = path
+        self.initial_rate = rate
+        self.burst = burst
+        self.rate_min = rate_min
+        self.rate_max = rate_max
+        self.step = step
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._fd = None
+        self._fd_pid = None
+        self._local_state = None  # 공유 파일을 못 쓸 때
+
+    # ---- 상태 파일 ----
+
+    def _file(self):
+        """worker(pid) 마다 따로 연다. fork 전에 연 fd 를 공유하면 flock 이 서로를 막지 못한다."""
+        if fcntl is None:
+            return None
+        pid = os.getpid()
+        if self._fd_pid != pid:
+            self._fd = None
+            self._fd_pid = pid
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            except OSError as e:
+                log.warning("%s rate limit state %s unavailable, using per-process bucket: %s",
+                            self.name, self.path, e)
+        return self._fd
+
+    @contextmanager
+    def _state(self):
+        """잠근 상태에서 [tokens, updated_at, rate, paused_until, last_cut] 를 넘기고, 수정분을 저장."""
+        with self._lock:
+            fd = self._file()
+            if fd is None:
+                if self._local_state is None:
+                    self._local_state = self._fresh()
+                yield self._local_state
+                return
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(fd, _STATE.size, 0)
+                state = list(_STATE.unpack(raw)) if len(raw) == _STATE.size else self._fresh()
+                # 설정이 바뀌었을 수도 있으니 범위를 다시 맞춘다
+                state[2] = min(self.rate_max, max(self.rate_min, state[2]))
+                yield state
+                os.pwrite(fd, _STATE.pack(*state), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def _fresh(self):
+        return [self.burst, time.time(), self.initial_rate, 0.0, 0.0]
+
+    # ---- 토큰 ----
+
+    def _try_take(self, cost, floor):
+        """가져갔으면 0, 아니면 다시 시도하기까지 기다릴 초."""
+        with self._state() as st:
+            now = time.time()
+            tokens, updated, rate, paused_until, _ = st
+            tokens = min(self.burst, tokens + max(0.0, now - updated) * rate)
+            st[0], st[1] = tokens, now
+            if now < paused_until:
+                return paused_until - now
+            if tokens - cost >= floor:
+                st[0] = tokens - cost
+                return 0.0
+            return (cost + floor - tokens) / rate
+
+    def acquire(self, priority=None, cost=1.0, max_wait=None):
+        """토큰을 얻을 때까지 기다린다. 기다린 초를 돌려주고, max_wait 을 넘기면 RateLimitTimeout."""
+        priority = priority or _priority.get()
+        background_call = priority == BACKGROUND
+        floor = self.burst * self.reserve if background_call else 0.0
+        if max_wait is None:
+            max_wait = YAHOO_BACKGROUND_MAX_WAIT if background_call else YAHOO_MAX_WAIT
+        # burst 보다 큰 비용은 영원히 못 얻으므로 (bulk 호출) 얻을 수 있는 최대치로 자른다
+        cost = max(1.0, min(float(cost), self.burst - floor))
+        start = time.monotonic()
+        while True:
+            wait = self._try_take(cost, floor)
+            waited = time.monotonic() - start
+            if wait <= 0:
+                metrics.RATE_LIMIT_WAIT.labels(self.name, priority).observe(waited)
+                return waited
+            if waited + wait > max_wait:
+                metrics.RATE_LIMIT_REJECTED.labels(self.name, priority).inc()
+                raise RateLimitTimeout(f"{self.name} rate limit: no token within {max_wait:.0f}s ({priority})")
+            # 여러 worker 가 같은 순간에 깨어나 몰리지 않도록 약간의 jitter
+            time.sleep(min(wait, _MAX_SLEEP) * random.uniform(0.8, 1.2))
+
+    # ---- AIMD 피드백 ----
+
+    def on_success(self):
+        with self._state() as st:
+            st[2] = min(self.rate_max, st[2] + self.step)
+            rate = st[2]
+        metrics.UPSTREAM_RATE.labels(self.name).set(rate)
+
+    def on_throttle(self, retry_after=0.0):
+        with self._state() as st:
+            now = time.time()
+            if now - st[4] < self.cooldown:
+                return
+            st[2] = max(self.rate_min, st[2] * self.backoff)
+            st[0] = 0.0
+            st[1] = now
+            st[3] = now + retry_after if retry_after > 0 else 0.0
+            st[4] = now
+            rate = st[2]
+        metrics.UPSTREAM_RATE.labels(self.name).set(rate)
+        metrics.UPSTREAM_THROTTLED.labels(self.name).inc()
+        log.warning("%s throttled, rate -> %.2f req/s%s", self.name, rate,
+                    f" (retry after {retry_after:.0f}s)" if retry_after > 0 else "")
+
+    def stats(self):
+        with self._state() as st:
+            tokens, _, rate, paused_until, last_cut = st
+        return {
+            "rate": round(rate, 3),
+            "tokens": round(tokens, 2),
+            "burst": self.burst,
+            "paused_for": round(max(0.0, paused_until - time.time()), 2),
+            "last_cut": last_cut or None,
+            "shared": self._fd is not None,
+        }
+
+
+yahoo = SharedTokenBucket(
+    "yahoo", YAHOO_RATE_STATE,
+    rate=YAHOO_RATE, burst=YAHOO_BURST, rate_min=YAHOO_RATE_MIN, rate_max=YAHOO_RATE_MAX,
+)
+
+
+@contextmanager
+def background():
+    """이 블록 안의 upstream 호출은 background 우선순위로 토큰을 얻는다."""
+    token = _priority.set(BACKGROUND)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class YahooCall:
+    """yahoo_call 블록 안에서 예외가 아닌 실패를 알려주는 핸들."""
+
+    __slots__ = ("outcome",)
+
+    def __init__(self):
+        self.outcome = "ok"
+
+    def empty(self):
+        """결과가 비었음: 없는 심볼일 수도, 삼켜진 오류일 수도 있으므로 rate 를 올리지 않는다."""
+        if self.outcome == "ok":
+            self.outcome = "empty"
+
+    def throttled(self):
+        """예외 없이 돌아온 429 (yfinance 종목별 오류 등)."""
+        self.outcome = "throttled"
+
+
+@contextmanager
+def yahoo_call(operation: str, priority=None, cost=1.0):
+    """
+    Yahoo 호출 한 번: 토큰 획득(cost 개) -> track_upstream 지표 -> 결과를 AIMD 로 피드백.
+    429 / 5xx 가 아닌 실패(없는 심볼 등)는 rate 에 영향을 주지 않는다.
+    블록은 YahooCall 을 받아 빈 결과 / 삼켜진 429 를 알려줄 수 있다.
+    """
+    yahoo.acquire(priority, cost=cost)
+    call = YahooCall()
+    try:
+        with metrics.track_upstream("yahoo", operation):
+            yield call
+    except Exception as e:
+        if is_throttle_error(e):
+            yahoo.on_throttle(_retry_after(e))
+        raise
+    if call.outcome == "ok":
+        yahoo.on_success()
+        return
+    metrics.mark_upstream_error("yahoo", operation)
+    if call.outcome == "throttled":
+        yahoo.on_throttle()
+
+
+class _YFErrorCapture(logging.Handler):
+    """
+    yf.download 가 끝날 때 "['AAPL', 'MSFT']: YFRateLimitError(...)" 형태로 남기는 종목별 오류를
+    호출한 스레드 것만 모은다 (동시에 도는 다른 download 의 오류는 섞지 않음).
+    """
+
+    def __init__(self):
+        super().__init__(logging.ERROR)
+        self.thread = threading.get_ident()
+        self.errors = {}
+
+    def emit(self, record):
+        if record.thread != self.thread:
+            return
+        text = record.getMessage().strip()
+        head, sep, message = text.partition("]: ")
+        if sep and head.startswith("["):
+            try:
+                symbols = ast.literal_eval(head + "]")
+            except (ValueError, SyntaxError):
+                return
+        else:
+            # Ticker.history: "$AAPL: possibly delisted; ..." / "AAPL: auto_adjust failed ..."
+            head, sep, message = text.partition(": ")
+            if not sep or not head or " " in head:
+                return
+            symbols = [head.lstrip("$")]
+        for sym in symbols:
+            self.errors[str(sym).upper()] = message
+
+
+def history(ticker, operation="history", priority=None, **kwargs):
+    """
+    Ticker.history 를 yahoo_call 로 감싼다.
+    Returns (df, error): error 는 yfinance 가 삼키고 로그로만 남긴 이 종목의 오류 메시지 (없으면 None).
+    빈 frame 이 429 때문이면 YahooThrottled, 그 외에는 rate 를 올리지 않고 그대로 돌려준다.
+    """
+    capture = _YFErrorCapture()
+    yf_logger = logging.getLogger("yfinance")
+    with yahoo_call(operation, priority) as call:
+        yf_logger.addHandler(capture)
+        try:
+            df = ticker.history(**kwargs)
+        finally:
+            yf_logger.removeHandler(capture)
+        error = next(iter(capture.errors.values()), None)
+        if df is None or df.empty:
+            if error is not None and is_throttle_error(error):
+                raise YahooThrottled(f"yahoo {operation}: {error}")
+            call.empty()
+    return df, error
+
+
+def download(symbols, operation="download", priority=None, **kwargs):
+    """
+    yf.download 를 yahoo_call 로 감싼다 (토큰은 종목 수만큼).
+    Returns (df, errors): errors 는 {SYMBOL: yfinance 오류 메시지}.
+    - 종목별 오류에 429 가 있으면 throttle 피드백, 그 때문에 결과가 통째로 비었으면 YahooThrottled
+    - 오류 없이 비었으면 rate 를 올리지 않고 빈 df 를 그대로 돌려준다
+    """
+    import yfinance as yf
+
+    symbols = list(symbols)
+    capture = _YFErrorCapture()
+    yf_logger = logging.getLogger("yfinance")
+    with yahoo_call(operation, priority, cost=len(symbols)) as call:
+        yf_logger.addHandler(capture)
+        try:
+            df = yf.download(symbols, progress=False, **kwargs)
+        finally:
+            yf_logger.removeHandler(capture)
+        errors = capture.errors
+        # 0.2.x 는 같은 내용을 전역 dict 에도 남긴다 (다른 호출 것이 섞일 수 있어 요청한 심볼만)
+        shared_errors = getattr(getattr(yf, "shared", None), "_ERRORS", None) or {}
+        for sym in symbols:
+            if sym.upper() in shared_errors:
+                errors.setdefault(sym.upper(), str(shared_errors[sym.upper()]))
+        empty = df is None or df.empty
+        throttled = sorted(s for s, message in errors.items() if is_throttle_error(message))
+        if throttled and empty:
+            raise YahooThrottled(f"yahoo {operation}: 429 for {', '.join(throttled)}")
+        if throttled:
+            call.throttled()
+        elif empty:
+            call.empty()
+    return df, errors
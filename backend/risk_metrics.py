@@ -0,0 +1,195 @@
+# backend/risk_metrics.py
+"""
+최근 일봉으로 실현 변동성 / 전일 종가 / 벤치마크 대비 beta 를 한 번에 계산하는 배치 리스크 지표.
+
+- 캐시에 없는 심볼 + 필요한 벤치마크를 yf.download 한 번으로 받는다.
+- (날짜 x 심볼) 수익률 행렬에서 변동성, beta 를 열 단위 벡터 연산으로 계산한다.
+- 결과는 (심볼, 해당 시장의 현지 거래일) 단위로 캐시하므로 같은 날 재요청은 upstream 비용이 없다.
+"""
+import os
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from backend.cache import TTLCache
+from backend import rate_limit
+from backend.quotes import normalize_symbols, currency_for
+
+RISK_LOOKBACK = os.getenv("RISK_LOOKBACK", "3mo")
+TRADING_DAYS = 252
+
+# 연율화 변동성 구간 (UI 의 low / medium / high)
+VOLATILITY_BUCKETS = ((0.25, "low"), (0.45, "medium"))
+
+# 심볼 → 벤치마크 (KOSPI / KOSDAQ / S&P 500)
+BENCHMARKS = {".KS": "^KS11", ".KQ": "^KQ11"}
+DEFAULT_BENCHMARK = "^GSPC"
+
+_MARKET_TZ = {"KRW": ZoneInfo("Asia/Seoul"), "USD": ZoneInfo("America/New_York")}
+
+# 하루 단위 키를 쓰므로 TTL 은 넉넉하게, 날짜가 바뀌면 키 자체가 달라진다
+_risk_cache = TTLCache(ttl=26 * 3600, maxsize=8192, name="risk_metrics")
+
+
+def benchmark_for(symbol: str) -> str:
+    for suffix, bench in BENCHMARKS.items():
+        if symbol.endswith(suffix):
+            return bench
+    return DEFAULT_BENCHMARK
+
+
+def _local_day(symbol: str, now=None) -> int:
+    """해당 심볼 시장의 현지 날짜 (epoch day)."""
+    now = now or datetime.now(tz=_MARKET_TZ["USD"])
+    local = now.astimezone(_MARKET_TZ[currency_for(symbol)]).date()
+    return local.toordinal() - 719163  # date(1970, 1, 1).toordinal()
+
+
+def volatility_bucket(annual_vol) -> str:
+    if annual_vol is None or not np.isfinite(annual_vol):
+        return "medium"
+    for limit, label in VOLATILITY_BUCKETS:
+        if annual_vol < limit:
+            return label
+    return "high"
+
+
+def _last_valid_index(valid):
+    """valid: bool[T, N] → 각 열의 마지막 True 행 인덱스 (없으면 -1)."""
+    t = valid.shape[0]
+    idx = t - 1 - np.argmax(valid[::-1], axis=0)
+    return np.where(valid.any(axis=0), idx, -1)
+
+
+def _log_returns(closes):
+    """forward-fill 후 로그수익률, 실제 bar 가 있는 날만 valid 로 표시."""
+    valid = ~np.isnan(closes)
+    idx = np.where(valid, np.arange(closes.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = closes[idx, np.arange(closes.shape[1])]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets = np.diff(np.log(filled), axis=0)
+    r_valid = valid[1:] & np.isfinite(rets)
+    return rets, r_valid
+
+
+def compute_metrics(closes, bench_closes):
+    """
+    closes: float[T, N], bench_closes: float[T, N] (각 심볼의 벤치마크 종가)
+    Returns dict of arrays: annual_vol, beta, prev_close, last_close
+    """
+    t, n = closes.shape
+    cols = np.arange(n)
+    valid = ~np.isnan(closes)
+
+    # 마지막 유효 bar 와 그 직전 유효 bar (quotes._last_two_valid 와 같은 기준).
+    # 주말 / 휴장일에도 마지막 거래일의 등락이 나온다. 직전 bar 가 없으면 NaN
+    last_idx = _last_valid_index(valid)
+    before_last = valid & (np.arange(t)[:, None] < last_idx[None, :])
+    prev_idx = _last_valid_index(before_last)
+    prev_close = np.where(prev_idx >= 0, closes[np.maximum(prev_idx, 0), cols], np.nan)
+    last_close = np.where(last_idx >= 0, closes[np.maximum(last_idx, 0), cols], np.nan)
+
+    # 일간 로그수익률: 다른 시장 거래일로 생긴 NaN 행은 건너뛰고 직전 유효 종가 대비로 계산
+    rets, r_valid = _log_returns(closes)
+    cnt = r_valid.sum(axis=0)
+    r0 = np.where(r_valid, rets, 0.0)
+    mean = np.divide(r0.sum(axis=0), cnt, out=np.zeros(n), where=cnt > 0)
+    dev = np.where(r_valid, rets - mean, 0.0)
+    var = np.divide((dev ** 2).sum(axis=0), cnt - 1, out=np.full(n, np.nan), where=cnt > 1)
+    annual_vol = np.sqrt(var * TRADING_DAYS)
+
+    # beta = cov(r_i, r_b) / var(r_b), 두 시리즈가 모두 있는 날만 사용
+    bench, b_valid = _log_returns(bench_closes)
+    both = r_valid & b_valid
+    m = both.sum(axis=0)
+    ri = np.where(both, rets, 0.0)
+    rb = np.where(both, bench, 0.0)
+    mi = np.divide(ri.sum(axis=0), m, out=np.zeros(n), where=m > 0)
+    mb = np.divide(rb.sum(axis=0), m, out=np.zeros(n), where=m > 0)
+    cov = (np.where(both, rets - mi, 0.0) * np.where(both, bench - mb, 0.0)).sum(axis=0)
+    var_b = (np.where(both, bench - mb, 0.0) ** 2).sum(axis=0)
+    beta = np.divide(cov, var_b, out=np.full(n, np.nan), where=(var_b > 0) & (m > 2))
+
+    return {"annual_vol": annual_vol, "beta": beta, "prev_close": prev_close, "last_close": last_close}
+
+
+def _fetch_and_compute(symbols, now=None):
+    import pandas as pd
+
+    benches = normalize_symbols(benchmark_for(s) for s in symbols)
+    columns = normalize_symbols(list(symbols) + benches)
+    df, _ = rate_limit.download(
+        columns,
+        period=RISK_LOOKBACK,
+        interval="1d",
+        group_by="column",
+        auto_adjust=True,
+        threads=True,
+    )
+    if df is None or df.empty:
+        return {}
+    close = df["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(columns[0])
+    close = close.reindex(columns=columns)
+
+    pos = {c: i for i, c in enumerate(columns)}
+    closes = close.to_numpy(dtype=float)
+    metrics = compute_metrics(
+        closes[:, [pos[s] for s in symbols]],
+        closes[:, [pos[benchmark_for(s)] for s in symbols]],
+    )
+
+    out = {}
+    for i, sym in enumerate(symbols):
+        prev_close = metrics["prev_close"][i]
+        last_close = metrics["last_close"][i]
+        if not np.isfinite(last_close):
+            continue
+        vol = metrics["annual_vol"][i]
+        beta = metrics["beta"][i]
+        prev = float(prev_close) if np.isfinite(prev_close) else None
+        out[sym] = {
+            "symbol": sym,
+            "volatility": volatility_bucket(vol),
+            "volatility_annual": float(vol) if np.isfinite(vol) else None,
+            "beta": float(beta) if np.isfinite(beta) else None,
+            "benchmark": benchmark_for(sym),
+            "prev_close": prev,
+            "last_close": float(last_close),
+            "change_pct": change_pct(float(last_close), prev),
+        }
+    return out
+
+
+def change_pct(price, prev_close) -> float:
+    if not prev_close or prev_close <= 0 or price is None:
+        return 0.0
+    return (price - prev_close) / prev_close * 100
+
+
+def get_metrics(symbols, now=None):
+    """
+    Returns {SYMBOL: {"volatility", "volatility_annual", "beta", "benchmark",
+                      "prev_close", "last_close", "change_pct"}}
+    캐시 키는 (심볼, 현지 거래일) 이므로 같은 날 재요청은 upstream 호출이 없다.
+    히스토리가 없는 심볼은 결과에서 빠진다.
+    """
+    symbols = normalize_symbols(symbols)
+    out = {}
+    missing = []
+    for sym in symbols:
+        m = _risk_cache.get((sym, _local_day(sym, now)))
+        if m is not None:
+            out[sym] = m
+        else:
+            missing.append(sym)
+
+    if missing:
+        fetched = _fetch_and_compute(missing, now)
+        for sym, m in fetched.items():
+            _risk_cache.set((sym, _local_day(sym, now)), m)
+        out.update(fetched)
+    return out
@@ -0,0 +1,209 @@
+# backend/snapshots.py
+"""
+마지막으로 성공한 upstream 응답(last-known-good)을 로컬 디스크에 보관한다.
+
+- 저장소: quotes / news / sentiment / learning. 항목마다 (저장 시각, 값).
+- 파일: SNAPSHOT_DIR/<name>.snap = b"LKG1" + zlib(orjson({key: [saved_at, value]})).
+  SNAPSHOT_INTERVAL 초마다 바뀐 저장소만 백그라운드 스레드가 기록한다.
+  여러 worker 가 같은 파일을 쓰므로 fcntl 잠금 안에서 디스크 내용과 합친 뒤(더 최근 값 우선) 교체한다.
+- 부팅 시 warm_caches(): 파일을 읽고, 아직 TTL 안인 시세는 backend.quotes 캐시에 바로 채운다.
+- upstream 실패 시 호출하는 쪽이 get() 으로 꺼내 stale_since(saved_at) 와 함께 돌려준다.
+"""
+import atexit
+import logging
+import os
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+
+import orjson
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 잠금 없이 (단일 프로세스 가정)
+    fcntl = None
+
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", os.path.join("data", "snapshots"))
+SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", "60"))
+SNAPSHOT_MAX_AGE = float(os.getenv("SNAPSHOT_MAX_AGE", str(7 * 86400)))  # 이보다 오래된 항목은 버림
+
+_MAGIC = b"LKG1"
+
+log = logging.getLogger(__name__)
+
+
+def stale_since(saved_at: float) -> str:
+    """응답에 붙이는 ISO-8601 (UTC) 시각."""
+    return datetime.fromtimestamp(saved_at, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def encode(entries: dict) -> bytes:
+    return _MAGIC + zlib.compress(orjson.dumps(entries, option=orjson.OPT_SERIALIZE_NUMPY), 6)
+
+
+def decode(data: bytes) -> dict:
+    if not data.startswith(_MAGIC):
+        raise ValueError("not a snapshot file")
+    return orjson.loads(zlib.decompress(data[len(_MAGIC):]))
+
+
+class SnapshotStore:
+    def __init__(self, name, max_entries=5000):
+        self.name = name
+        self.max_entries = max_entries
+        self._entries = {}  # key -> [saved_at, value]
+        self._dirty = False
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self):
+        return os.path.join(SNAPSHOT_DIR, f"{self.name}.snap")
+
+    def _read_file(self):
+        try:
+            with open(self.path, "rb") as f:
+                return decode(f.read())
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            log.warning("snapshot %s unreadable, ignoring: %s", self.path, e)
+            return {}
+
+    def load(self):
+        """디스크 내용을 읽어 메모리에 합친다 (처음 한 번은 get / put 이 알아서 부른다)."""
+        entries = self._read_file()
+        with self._lock:
+            self._merge(entries)
+            self._loaded = True
+        return len(self._entries)
+
+    def _ensure_loaded(self):
+        if not self._loaded:
+            self.load()
+
+    def _merge(self, entries):
+        cutoff = time.time() - SNAPSHOT_MAX_AGE
+        for key, entry in entries.items():
+            if entry[0] < cutoff:
+                continue
+            mine = self._entries.get(key)
+            if mine is None or mine[0] < entry[0]:
+                self._entries[key] = entry
+        if len(self._entries) > self.max_entries:
+            newest = sorted(self._entries.items(), key=lambda kv: kv[1][0], reverse=True)
+            self._entries = dict(newest[: self.max_entries])
+
+    def put(self, key, value):
+        self._ensure_loaded()
+        with self._lock:
+            self._entries[key] = [time.time(), value]
+            self._dirty = True
+        _ensure_flusher()
+
+    def get(self, key, max_age=None):
+        """(value, saved_at) 또는 None. max_age 를 주면 그보다 오래된 항목은 없는 것으로 본다."""
+        self._ensure_loaded()
+        entry = self._entries.get(key)
+        if entry is None or (max_age is not None and time.time() - entry[0] > max_age):
+            return None
+        return entry[1], entry[0]
+
+    def latest(self, prefix=""):
+        """key 가 prefix 로 시작하는 항목 중 가장 최근 것 (key, value, saved_at) 또는 None."""
+        self._ensure_loaded()
+        with self._lock:
+            found = None
+            for key, (saved_at, value) in self._entries.items():
+                if key.startswith(prefix) and (found is None or saved_at > found[2]):
+                    found = (key, value, saved_at)
+        return found
+
+    def items(self, max_age=None):
+        self._ensure_loaded()
+        now = time.time()
+        with self._lock:
+            return [(k, v, t) for k, (t, v) in self._entries.items() if max_age is None or now - t <= max_age]
+
+    def flush(self):
+        """바뀐 게 있으면 디스크 내용과 합쳐서 원자적으로 교체."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            self._dirty = False
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        with open(self.path + ".lock", "w") as lf:
+            if fcntl is not None:
+                fcntl.flock(lf, fcntl.LOCK_EX)
+            try:
+                on_disk = self._read_file()
+                with self._lock:
+                    self._merge(on_disk)
+                    data = encode(self._entries)
+                tmp = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, self.path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lf, fcntl.LOCK_UN)
+        return True
+
+    def stats(self):
+        self._ensure_loaded()
+        with self._lock:
+            oldest = min((e[0] for e in self._entries.values()), default=None)
+            return {"entries": len(self._entries), "oldest": stale_since(oldest) if oldest else None}
+
+
+quotes = SnapshotStore("quotes", max_entries=5000)
+news = SnapshotStore("news", max_entries=500)
+sentiment = SnapshotStore("sentiment", max_entries=20000)
+learning = SnapshotStore("learning", max_entries=500)
+STORES = (quotes, news, sentiment, learning)
+
+_flusher_pid = None
+_flusher_lock = threading.Lock()
+
+
+def flush_all():
+    for store in STORES:
+        try:
+            store.flush()
+        except Exception as e:
+            log.warning("snapshot %s flush failed: %s", store.name, e)
+
+
+def _flush_loop():
+    while True:
+        time.sleep(SNAPSHOT_INTERVAL)
+        flush_all()
+
+
+def _ensure_flusher():
+    """프로세스(worker)마다 기록 스레드 하나. fork 이후 자식에서 처음 put 할 때 새로 뜬다."""
+    global _flusher_pid
+    pid = os.getpid()
+    if _flusher_pid == pid:
+        return
+    with _flusher_lock:
+        if _flusher_pid == pid:
+            return
+        threading.Thread(target=_flush_loop, name="snapshot-flusher", daemon=True).start()
+        if _flusher_pid is None:
+            atexit.register(flush_all)
+        _flusher_pid = pid
+
+
+def warm_caches():
+    """부팅 시: 저장소를 읽고 TTL 이 남은 시세는 quote 캐시에 채운다."""
+    from backend import quotes as quotes_module
+
+    counts = {store.name: store.load() for store in STORES}
+    counts["warm_quotes"] = quotes_module.warm_cache(quotes.items(max_age=quotes_module.QUOTE_CACHE_TTL))
+    return counts
+
+
+def stats():
+    return {store.name: store.stats() for store in STORES}
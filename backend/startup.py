@@ -0,0 +1,103 @@
+# backend/startup.py
+"""
+Cold start 측정.
+
+Import-time budget
+------------------
+`import yfinance_api` (앱 생성 + blueprint 등록까지) 는 IMPORT_TIME_BUDGET_MS (기본 500ms) 안에 끝나야 한다.
+그래야 배포 / worker 재시작 직후에도 `/`, 캐시된 quote 같은 가벼운 요청을 바로 처리할 수 있다.
+이를 위해 부팅 경로에서는 다음을 import / 생성하지 않는다 (LAZY_MODULES):
+  - yfinance (+ pandas): backend.lazy.lazy_module 또는 함수 안 import 로 첫 upstream 호출 때
+  - openai: backend.llm_client.get_openai_client() 가 첫 LLM 요청 때
+  - requests: yfinance 와 함께 (qwen_client 는 http.client 를 쓴다)
+
+- 앱은 import 가 끝날 때 record_ready() 로 소요 시간을 한 줄 로그로 남기고,
+  budget 을 넘으면 경고한다. 값은 /metrics 의 app_startup_seconds 에도 노출된다.
+- CI / 로컬 점검용:
+      python -m backend.startup            # 새 인터프리터에서 import 시간 + 가장 느린 직접 import top 15
+      python -m backend.startup --strict   # budget 초과 또는 LAZY_MODULES 가 import 되면 exit 1
+"""
+import logging
+import os
+import subprocess
+import sys
+import time
+
+IMPORT_TIME_BUDGET_MS = float(os.getenv("IMPORT_TIME_BUDGET_MS", "500"))
+LAZY_MODULES = ("yfinance", "pandas", "openai", "requests")
+
+# 이 모듈은 yfinance_api 의 첫 import 중 하나이므로 부팅 시작 시각으로 쓴다
+BOOT_STARTED = time.perf_counter()
+startup_seconds = None
+
+log = logging.getLogger(__name__)
+
+
+def record_ready(name: str = "yfinance_api") -> float:
+    """부팅 완료 시각을 기록하고 한 줄 리포트를 로그로 남긴다. 소요 시간(초) 반환."""
+    global startup_seconds
+    startup_seconds = time.perf_counter() - BOOT_STARTED
+    ms = startup_seconds * 1000
+    eager = [m for m in LAZY_MODULES if m in sys.modules]
+    log.info("%s ready in %.0f ms (budget %.0f ms)", name, ms, IMPORT_TIME_BUDGET_MS,
+             extra={"startup_ms": round(ms, 1), "eager_imports": eager})
+    if ms > IMPORT_TIME_BUDGET_MS:
+        log.warning("import time is over budget by %.0f ms", ms - IMPORT_TIME_BUDGET_MS)
+    return startup_seconds
+
+
+def _parse_importtime(stderr: str):
+    """python -X importtime 출력 -> [(module, self_us, cumulative_us, depth)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            parts = line[len("import time:"):].split("|")
+            self_us, cumulative, raw = int(parts[0]), int(parts[1]), parts[2]
+        except (ValueError, IndexError):
+            continue
+        name = raw.strip()
+        depth = (len(raw) - len(raw.lstrip()) - 1) // 2
+        rows.append((name, self_us, cumulative, depth))
+    return rows
+
+
+def measure(module: str = "yfinance_api"):
+    """새 인터프리터에서 module 을 import 해 (총 ms, importtime rows, eager LAZY_MODULES) 반환."""
+    probe = (
+        "import sys, time; t = time.perf_counter(); import {m}; "
+        "print('__import_ms__', round((time.perf_counter() - t) * 1000, 1)); "
+        "print('__eager__', ','.join(x for x in {lazy!r} if x in sys.modules))"
+    ).format(m=module, lazy=LAZY_MODULES)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=root, capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+    marks = dict(line.split(" ", 1) for line in proc.stdout.splitlines() if line.startswith("__"))
+    total_ms = float(marks["__import_ms__"])
+    eager = [m for m in marks.get("__eager__", "").split(",") if m.strip()]
+    return total_ms, _parse_importtime(proc.stderr), eager
+
+
+def _main(argv):
+    strict = "--strict" in argv
+    total_ms, rows, eager = measure()
+    print(f"import yfinance_api: {total_ms:.0f} ms (budget {IMPORT_TIME_BUDGET_MS:.0f} ms)")
+    print("slowest direct imports of yfinance_api (cumulative ms):")
+    top = sorted((r for r in rows if r[3] == 1), key=lambda r: r[2], reverse=True)[:15]
+    for name, _, cumulative, _ in top:
+        print(f"  {cumulative / 1000:8.1f}  {name}")
+    if eager:
+        print("eagerly imported (should be lazy): " + ", ".join(eager))
+    failed = total_ms > IMPORT_TIME_BUDGET_MS or bool(eager)
+    if failed:
+        print("over budget" if total_ms > IMPORT_TIME_BUDGET_MS else "lazy import regression")
+    return 1 if (strict and failed) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
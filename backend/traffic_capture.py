@@ -0,0 +1,162 @@
+# backend/traffic_capture.py
+"""
+선택적 요청 기록기 (부하 재현용). TRAFFIC_CAPTURE_DIR 이 설정된 경우에만 훅을 건다.
+
+- 요청 하나당 한 줄짜리 compact JSON 을 gzip 파일에 append:
+    {"t": epoch초, "m": "GET", "p": "/api/quote?symbol=AAPL", "b": {...}, "s": 200, "d": 12.3}
+  (b = JSON body, 있을 때만 / s = status / d = 처리 시간 ms)
+- 민감 정보는 남기지 않는다: 헤더는 기록하지 않고, 토큰류 query 파라미터는 제거,
+  대화 / 답변 같은 자유 텍스트는 길이만 남기고 가린다 (replay 시 prompt 크기는 비슷하게 유지).
+- 파일 쓰기는 백그라운드 스레드가 하므로 요청 경로는 큐에 넣기만 한다.
+- 파일은 worker(pid) / 시간 단위로 나뉜다: capture-<pid>-<YYYYmmddHH>.jsonl.gz
+
+재생은 `python -m bench.replay` 참고.
+"""
+import atexit
+import gzip
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode
+
+from flask import g, request
+
+TRAFFIC_CAPTURE_DIR = os.getenv("TRAFFIC_CAPTURE_DIR", "")
+TRAFFIC_CAPTURE_SAMPLE = float(os.getenv("TRAFFIC_CAPTURE_SAMPLE", "1.0"))
+
+# 기록하지 않는 경로 (운영용 / 장시간 스트림)
+EXCLUDED_PATHS = {"/metrics", "/api/profiling", "/api/profiling/dump", "/api/quotes/stream"}
+# 값을 통째로 버리는 query 파라미터
+DROP_PARAMS = {"token", "key", "api_key", "apikey", "access_token", "password", "secret"}
+# 자유 텍스트 필드: 같은 길이의 placeholder 로 치환
+REDACT_KEYS = {"content", "answer", "question", "message", "summary", "title", "text", "prompt"}
+
+_QUEUE_SIZE = 10000
+_FLUSH_INTERVAL = 1.0
+
+log = logging.getLogger(__name__)
+
+
+def sanitize_query(query_string: str) -> str:
+    pairs = [(k, v) for k, v in parse_qsl(query_string, keep_blank_values=True) if k.lower() not in DROP_PARAMS]
+    return urlencode(pairs)
+
+
+def sanitize_body(value, key=None):
+    if isinstance(value, dict):
+        return {k: sanitize_body(v, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [sanitize_body(v, key) for v in value]
+    if isinstance(value, str) and key is not None and key.lower() in REDACT_KEYS:
+        return "x" * len(value)
+    return value
+
+
+class CaptureWriter:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=_QUEUE_SIZE)
+        self._file = None
+        self._file_hour = None
+        self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+        self._thread.start()
+
+    def write(self, record):
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            # 디스크가 밀려도 요청 처리는 막지 않는다
+            self.dropped += 1
+
+    def _open_for(self, ts):
+        hour = time.strftime("%Y%m%d%H", time.gmtime(ts))
+        if hour != self._file_hour:
+            if self._file is not None:
+                self._file.close()
+            os.makedirs(self.out_dir, exist_ok=True)
+            path = os.path.join(self.out_dir, f"capture-{os.getpid()}-{hour}.jsonl.gz")
+            self._file = gzip.open(path, "at", encoding="utf-8")
+            self._file_hour = hour
+        return self._file
+
+    def _run(self):
+        while True:
+            try:
+                record = self._queue.get(timeout=_FLUSH_INTERVAL)
+            except queue.Empty:
+                if self._file is not None:
+                    self._file.flush()
+                continue
+            if record is None:
+                break
+            try:
+                f = self._open_for(record["t"])
+                f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            except Exception as e:
+                log.warning("capture write error: %s", e)
+        if self._file is not None:
+            self._file.close()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join(timeout=5)
+
+
+_writer = None
+
+
+def _before_request():
+    if request.path in EXCLUDED_PATHS or request.method == "OPTIONS":
+        return
+    if TRAFFIC_CAPTURE_SAMPLE < 1.0 and random.random() >= TRAFFIC_CAPTURE_SAMPLE:
+        return
+    g._capture_start = (time.time(), time.perf_counter())
+
+
+def _after_request(resp):
+    started = g.pop("_capture_start", None)
+    if started is None:
+        return resp
+    wall, perf = started
+    path = request.path
+    query = sanitize_query(request.query_string.decode("utf-8", "replace"))
+    if query:
+        path = f"{path}?{query}"
+    record = {
+        "t": round(wall, 3),
+        "m": request.method,
+        "p": path,
+        "s": resp.status_code,
+        "d": round((time.perf_counter() - perf) * 1000, 1),
+    }
+    if request.is_json:
+        body = request.get_json(silent=True)
+        if body is not None:
+            record["b"] = sanitize_body(body)
+    _writer.write(record)
+    return resp
+
+
+def _after_fork_in_child():
+    # gunicorn --preload: master 에서 만든 writer 스레드는 worker 에 없으므로 새로 만든다
+    global _writer
+    _writer = CaptureWriter(TRAFFIC_CAPTURE_DIR)
+
+
+def init_app(app):
+    """TRAFFIC_CAPTURE_DIR 이 없으면 아무 훅도 걸지 않는다."""
+    global _writer
+    if not TRAFFIC_CAPTURE_DIR:
+        return
+    _writer = CaptureWriter(TRAFFIC_CAPTURE_DIR)
+    atexit.register(lambda: _writer.close())
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_after_fork_in_child)
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    log.info("recording requests to %s (sample=%s)", TRAFFIC_CAPTURE_DIR, TRAFFIC_CAPTURE_SAMPLE)
@@ -0,0 +1,5 @@
+"""
+오프라인 벤치마크: 가짜 upstream (yfinance / GPT-5 / Qwen) 위에서 Flask 라우트 처리량과 지연 분포를 잰다.
+
+    python -m bench.run --requests 200 --concurrency 16 --yahoo-latency-ms 80
+"""
@@ -0,0 +1,367 @@
+# bench/fakes.py
+"""
+네트워크 없이 돌리는 가짜 upstream 들.
+
+- FakeTicker / fake_download / fake_urlopen : yfinance Ticker(history, info, news), yf.download,
+  Yahoo 검색 API (urllib) 대체
+- FakeOpenAI : openai.OpenAI 의 chat.completions.create 대체 (프롬프트 종류별로 그럴듯한 응답)
+- FakeQwenServer : 로컬 HTTP 서버로 띄우는 Qwen /generate (requests 경로까지 그대로 탄다)
+
+각 upstream 은 Upstream(latency_ms, jitter_ms, error_rate, max_rps) 로 지연과 실패율을 조절한다.
+slow_rate / slow_ms 를 주면 그 비율의 호출이 slow_ms 만큼 더 걸린다 (느린 replica 흉내, hedging 확인용).
+max_rps 를 주면 직전 1초 동안 그보다 많이 들어온 호출은 "429 Too Many Requests" 로 실패한다
+(Yahoo 의 throttling 흉내, backend.rate_limit 의 backoff 확인용).
+데이터는 심볼 이름으로 seed 를 잡아 실행할 때마다 같은 값이 나온다.
+"""
+import io
+import json
+import logging
+import random
+import threading
+import time
+import zlib
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+
+class FakeUpstreamError(Exception):
+    pass
+
+
+class FakeThrottleError(FakeUpstreamError):
+    status_code = 429
+
+
+class Upstream:
+    """지연 / 실패율 / 초당 허용량 설정 + 호출 수 집계."""
+
+    def __init__(self, name, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, seed=0, max_rps=0.0,
+                 slow_rate=0.0, slow_ms=0.0):
+        self.name = name
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.max_rps = max_rps
+        self.slow_rate = slow_rate
+        self.slow_ms = slow_ms
+        self.calls = 0
+        self.errors = 0
+        self.throttled = 0
+        self.slow = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._recent = deque()
+
+    def hit(self, operation="", sleep=True):
+        """호출 한 번. sleep=False 면 지연(ms)을 직접 기다리지 않고 돌려준다 (스트리밍 흉내용)."""
+        with self._lock:
+            self.calls += 1
+            if self.max_rps > 0:
+                now = time.monotonic()
+                while self._recent and now - self._recent[0] > 1.0:
+                    self._recent.popleft()
+                if len(self._recent) >= self.max_rps:
+                    self.throttled += 1
+                    raise FakeThrottleError(f"fake {self.name} {operation}: 429 Too Many Requests")
+                self._recent.append(now)
+            delay = self.latency_ms + (self._rng.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+            if self.slow_rate > 0 and self._rng.random() < self.slow_rate:
+                delay += self.slow_ms
+                self.slow += 1
+            fail = self.error_rate > 0 and self._rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if delay > 0 and sleep:
+            time.sleep(delay / 1000.0)
+        if fail:
+            raise FakeUpstreamError(f"fake {self.name} {operation} failure")
+        return delay
+
+    def stats(self):
+        return {"calls": self.calls, "errors": self.errors, "throttled": self.throttled, "slow": self.slow}
+
+
+# ---- yfinance ----
+
+_BAR_COUNT = 2600  # 약 10년치 영업일
+_INTERVAL_FREQ = {"1d": "B", "1h": "h", "5m": "5min"}
+
+
+def _seed(symbol):
+    return zlib.crc32(symbol.encode("utf-8"))
+
+
+def _closes(symbol, n):
+    rng = np.random.default_rng(_seed(symbol))
+    start = 20 + (_seed(symbol) % 500)
+    return start * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+
+
+def _period_bars(period, interval):
+    if not period or period == "max":
+        return _BAR_COUNT
+    unit = period[-1] if not period.endswith("mo") else "mo"
+    num = int(period[: -len(unit)] or 1)
+    days = {"d": 1, "mo": 30, "y": 365}.get(unit, 1) * num
+    if interval == "1d":
+        return min(_BAR_COUNT, max(1, days * 5 // 7))
+    per_day = 7 if interval == "1h" else 78
+    return max(1, days * 5 // 7) * per_day
+
+
+def _bars(symbol, n, interval="1d"):
+    end = pd.Timestamp.now(tz="America/New_York").floor("D")
+    idx = pd.date_range(end=end, periods=n, freq=_INTERVAL_FREQ.get(interval, "B"))
+    close = _closes(symbol, n)
+    return pd.DataFrame(
+        {"Open": close * 0.995, "High": close * 1.01, "Low": close * 0.99, "Close": close, "Volume": 1e6},
+        index=idx,
+    )
+
+
+def _fake_news(symbol, count=12):
+    now = int(time.time())
+    items = []
+    for i in range(count):
+        items.append({
+            "id": f"{symbol}-{i}",
+            "content": {
+                "id": f"{symbol}-{i}",
+                "title": f"{symbol} headline {i}: quarterly update",
+                "summary": f"Synthetic summary {i} about {symbol} for offline benchmarks.",
+                "pubDate": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now - i * 3600)),
+                "provider": {"displayName": "Bench Wire"},
+                "canonicalUrl": {"url": f"https://example.com/{symbol}/{i}"},
+                "relatedTickers": [symbol],
+            },
+        })
+    return items
+
+
+class FakeTicker:
+    upstream = Upstream("yahoo")
+
+    def __init__(self, symbol, session=None):
+        self.ticker = symbol.upper()
+
+    def history(self, period=None, interval="1d", start=None, **kwargs):
+        self.upstream.hit("history")
+        if self.ticker.startswith("BAD"):
+            # 실제 Ticker.history 처럼 예외 대신 로그만 남기고 빈 frame
+            logging.getLogger("yfinance").error(
+                "$%s: possibly delisted; no price data found  (period=%s)", self.ticker, period)
+            return pd.DataFrame()
+        df = _bars(self.ticker, _period_bars(period or "1mo", interval) if start is None else _BAR_COUNT, interval)
+        if start is not None:
+            df = df[df.index >= pd.Timestamp(start).tz_convert(df.index.tz)]
+        return df
+
+    @property
+    def info(self):
+        self.upstream.hit("info")
+        if self.ticker.startswith("BAD"):
+            return {}
+        return {
+            "symbol": self.ticker,
+            "shortName": f"{self.ticker} Corp",
+            "longName": f"{self.ticker} Corporation",
+            "exchange": "KSC" if self.ticker.endswith(".KS") else "NMS",
+            "currency": "KRW" if self.ticker.endswith((".KS", ".KQ")) else "USD",
+            "sector": "Technology",
+            "industry": "Software",
+            "marketCap": 10 ** 9 + _seed(self.ticker) % 10 ** 9,
+        }
+
+    @property
+    def news(self):
+        self.upstream.hit("news")
+        return _fake_news(self.ticker)
+
+    def _get_news(self):
+        return self.news
+
+
+def fake_download(tickers, period="5d", interval="1d", **kwargs):
+    """
+    실제 yf.download 처럼 실패를 예외로 올리지 않는다: 종목별 오류를 "yfinance" logger 에
+    "['AAPL', 'MSFT']: YFRateLimitError(...)" 형태로 남기고 빈 frame (BAD* 는 NaN 열)을 돌려준다.
+    """
+    symbols = [tickers] if isinstance(tickers, str) else list(tickers)
+    yf_log = logging.getLogger("yfinance")
+    try:
+        FakeTicker.upstream.hit("download")
+    except FakeThrottleError:
+        yf_log.error("\n%d Failed download%s:", len(symbols), "s" if len(symbols) > 1 else "")
+        yf_log.error("%s: YFRateLimitError('Too Many Requests. Rate limited. Try after a while.')", symbols)
+        return pd.DataFrame()
+    except FakeUpstreamError as e:
+        yf_log.error("\n%d Failed download%s:", len(symbols), "s" if len(symbols) > 1 else "")
+        yf_log.error("%s: %r", symbols, e)
+        return pd.DataFrame()
+    n = _period_bars(period, interval)
+    end = pd.Timestamp.now(tz="America/New_York").floor("D")
+    idx = pd.date_range(end=end, periods=n, freq="B")
+    bad = [s for s in symbols if s.upper().startswith("BAD")]
+    data = {
+        ("Close", s): (np.full(n, np.nan) if s in bad else _closes(s, n))
+        for s in symbols
+    }
+    if bad:
+        yf_log.error("\n%d Failed download%s:", len(bad), "s" if len(bad) > 1 else "")
+        yf_log.error("%s: possibly delisted; no price data found  (period=%s)", bad, period)
+    df = pd.DataFrame(data, index=idx)
+    df.columns = pd.MultiIndex.from_tuples(df.columns, names=["Price", "Ticker"])
+    return df
+
+
+_SEARCH_HOSTS = ("query1.finance.yahoo.com", "query2.finance.yahoo.com")
+
+
+def make_fake_urlopen(real_urlopen):
+    """Yahoo 검색 API 만 가짜로 응답하고 나머지 URL 은 원래 urlopen 으로 넘긴다."""
+
+    def fake_urlopen(url, *args, **kwargs):
+        target = url if isinstance(url, str) else url.full_url
+        parsed = urlparse(target)
+        if parsed.hostname not in _SEARCH_HOSTS:
+            return real_urlopen(url, *args, **kwargs)
+        FakeTicker.upstream.hit("search")
+        q = (parse_qs(parsed.query).get("q") or [""])[0].strip().upper() or "X"
+        base = "".join(ch for ch in q if ch.isalnum())[:5] or "X"
+        quotes = [{"symbol": base, "shortname": f"{base} Corp"}] + [
+            {"symbol": f"{base}{i}", "shortname": f"{base}{i} Holdings"} for i in range(1, 4)
+        ]
+        body = json.dumps({"quotes": quotes}).encode("utf-8")
+        return io.BytesIO(body)
+
+    return fake_urlopen
+
+
+# ---- GPT-5 (OpenAI 호환) ----
+
+def _llm_reply(prompt):
+    low = prompt.lower()
+    if "sentiment classifier" in low:
+        return "POSITIVE"
+    if "persona classifier" in low or "closest persona" in low:
+        return "OPTIMIST"
+    if "learning\" cards" in low or "5-minute learning" in low:
+        cards = [
+            {"title": f"Concept {i}", "duration": "3 min", "category": "Basic Term",
+             "content": "Diversification spreads risk. " * 8}
+            for i in range(3)
+        ]
+        return json.dumps(cards)
+    if "quiz" in low:
+        quizzes = [
+            {"question": f"Question {i}?", "options": ["A", "B", "C", "D"], "correctIndex": i % 4,
+             "explanation": "Because B is the textbook answer."}
+            for i in range(3)
+        ]
+        return json.dumps(quizzes)
+    return "{}"
+
+
+class _FakeCompletions:
+    def __init__(self, upstream):
+        self._upstream = upstream
+
+    def create(self, model=None, messages=None, stream=False, **kwargs):
+        prompt = "\n".join(str(m.get("content", "")) for m in messages or [])
+        content = _llm_reply(prompt)
+        usage = SimpleNamespace(prompt_tokens=len(prompt) // 4, completion_tokens=len(content) // 4)
+        if stream:
+            return stream_chunks(content, usage, upstream=self._upstream)
+        self._upstream.hit("chat")
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content), finish_reason="stop")],
+            usage=usage,
+            model=model,
+        )
+
+
+def stream_chunks(content, usage=None, upstream=None, pieces=8):
+    """stream=True 응답 흉내: content 를 pieces 조각으로 나눠 지연도 조각마다 나눠서 흘린다."""
+    step = max(1, -(-len(content) // pieces))
+    parts = [content[i:i + step] for i in range(0, len(content), step)] or [""]
+    latency_ms = upstream.hit("chat", sleep=False) if upstream is not None else 0.0
+    for part in parts:
+        if latency_ms:
+            time.sleep(latency_ms / len(parts) / 1000.0)
+        yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=part))], usage=None)
+    yield SimpleNamespace(choices=[], usage=usage)
+
+
+class FakeOpenAI:
+    def __init__(self, upstream=None, **kwargs):
+        self.upstream = upstream or Upstream("gpt5")
+        self.chat = SimpleNamespace(completions=_FakeCompletions(self.upstream))
+
+
+# ---- Qwen /generate ----
+
+class FakeQwenServer:
+    """127.0.0.1 임의 포트에 뜨는 /generate 서버. url 을 MY_API_URL 로 넘기면 된다."""
+
+    def __init__(self, upstream=None):
+        self.upstream = upstream or Upstream("qwen")
+        upstream_ref = self.upstream
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                try:
+                    upstream_ref.hit("generate")
+                    status, body = 200, json.dumps("Zero trust means every request is verified.\\nAlways.")
+                except FakeUpstreamError as e:
+                    status, body = 500, json.dumps({"detail": str(e)})
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # hedging 으로 취소된 요청 (클라이언트가 소켓을 닫음)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-qwen", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def install_yahoo(upstream):
+    """yfinance / urllib 을 가짜로 교체. yfinance_api 를 import 하기 전에 호출해야 한다."""
+    import urllib.request
+
+    import yfinance as yf
+
+    FakeTicker.upstream = upstream
+    yf.Ticker = FakeTicker
+    yf.download = fake_download
+    urllib.request.urlopen = make_fake_urlopen(urllib.request.urlopen)
@@ -0,0 +1,251 @@
+# bench/fixtures.py
+"""
+upstream 응답 fixture 저장소 (replay 용).
+
+- record 모드: 진짜 yfinance / GPT-5 / Qwen 을 호출하면서 응답과 소요 시간을 저장
+- replay 모드: 저장된 응답을 (기록된 지연 x latency_scale 만큼 기다린 뒤) 돌려준다.
+  fixture 에 없는 호출은 bench.fakes 의 합성 응답으로 대체하고 miss 로 센다.
+
+키는 (upstream, operation, 인자) 의 sha1 이라 같은 요청 로그를 다시 돌리면 같은 응답이 나온다.
+저장 형식: <root>/<upstream>/<key>.pkl.gz  (DataFrame 도 그대로 저장하기 위해 pickle 사용,
+직접 기록한 파일만 읽을 것)
+"""
+import gzip
+import hashlib
+import os
+import pickle
+import threading
+import time
+from types import SimpleNamespace
+
+from bench import fakes
+
+_YAHOO_HOSTS = ("query1.finance.yahoo.com", "query2.finance.yahoo.com")
+
+
+def _canon(value):
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{k}:{_canon(value[k])}" for k in sorted(value)) + "}"
+    if isinstance(value, (list, tuple)):
+        return "[" + ",".join(_canon(v) for v in value) + "]"
+    return repr(value)
+
+
+class FixtureStore:
+    def __init__(self, root, mode="replay", latency_scale=1.0):
+        if mode not in ("record", "replay"):
+            raise ValueError("mode must be 'record' or 'replay'")
+        self.root = root
+        self.mode = mode
+        self.latency_scale = latency_scale
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(upstream, operation, *args, **kwargs):
+        raw = _canon([upstream, operation, list(args), kwargs])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, upstream, key):
+        return os.path.join(self.root, upstream, key + ".pkl.gz")
+
+    def load(self, upstream, key):
+        path = self._path(upstream, key)
+        try:
+            with gzip.open(path, "rb") as f:
+                value, elapsed = pickle.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return value, elapsed
+
+    def save(self, upstream, key, value, elapsed):
+        path = self._path(upstream, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with gzip.open(tmp, "wb") as f:
+            pickle.dump((value, elapsed), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        with self._lock:
+            self.recorded += 1
+
+    def call(self, upstream, operation, args, kwargs, real, fallback):
+        """
+        record: real() 결과를 저장하고 반환 (예외는 저장하지 않음)
+        replay: 저장된 값 or fallback()
+        """
+        key = self.key(upstream, operation, *args, **kwargs)
+        if self.mode == "record":
+            start = time.perf_counter()
+            value = real()
+            self.save(upstream, key, value, time.perf_counter() - start)
+            return value
+        found = self.load(upstream, key)
+        if found is None:
+            return fallback()
+        value, elapsed = found
+        if self.latency_scale > 0 and elapsed > 0:
+            time.sleep(elapsed * self.latency_scale)
+        return value
+
+    def stats(self):
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+
+# ---- yfinance ----
+
+def install_yahoo(store, fallback_upstream):
+    """yf.Ticker / yf.download / Yahoo 검색 urlopen 을 fixture 경유로 교체."""
+    import urllib.request
+
+    import yfinance as yf
+
+    real_ticker, real_download, real_urlopen = yf.Ticker, yf.download, urllib.request.urlopen
+    fakes.FakeTicker.upstream = fallback_upstream
+    fake_urlopen = fakes.make_fake_urlopen(real_urlopen)
+
+    class FixtureTicker:
+        def __init__(self, symbol, session=None):
+            self.ticker = symbol.upper()
+            self._real = None
+
+        def _real_ticker(self):
+            if self._real is None:
+                self._real = real_ticker(self.ticker)
+            return self._real
+
+        def history(self, *args, **kwargs):
+            return store.call(
+                "yahoo", "history", (self.ticker,) + args, kwargs,
+                real=lambda: self._real_ticker().history(*args, **kwargs),
+                fallback=lambda: fakes.FakeTicker(self.ticker).history(*args, **kwargs),
+            )
+
+        @property
+        def info(self):
+            return store.call("yahoo", "info", (self.ticker,), {},
+                              real=lambda: self._real_ticker().info,
+                              fallback=lambda: fakes.FakeTicker(self.ticker).info)
+
+        @property
+        def news(self):
+            return store.call("yahoo", "news", (self.ticker,), {},
+                              real=lambda: self._real_ticker().news,
+                              fallback=lambda: fakes.FakeTicker(self.ticker).news)
+
+        def _get_news(self):
+            return self.news
+
+    def download(tickers, *args, **kwargs):
+        return store.call("yahoo", "download", (tickers,) + args, kwargs,
+                          real=lambda: real_download(tickers, *args, **kwargs),
+                          fallback=lambda: fakes.fake_download(tickers, *args, **kwargs))
+
+    def urlopen(url, *args, **kwargs):
+        target = url if isinstance(url, str) else url.full_url
+        if not any(host in target for host in _YAHOO_HOSTS):
+            return real_urlopen(url, *args, **kwargs)
+
+        def real():
+            with real_urlopen(url, *args, **kwargs) as resp:
+                return resp.read()
+
+        def fallback():
+            return fake_urlopen(url).read()
+
+        return _BytesResponse(store.call("yahoo", "search", (target,), {}, real=real, fallback=fallback))
+
+    yf.Ticker = FixtureTicker
+    yf.download = download
+    urllib.request.urlopen = urlopen
+
+
+class _BytesResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def read(self):
+        return self._data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+# ---- GPT-5 ----
+
+class FixtureOpenAI:
+    """chat.completions.create 만 흉내내는 OpenAI 클라이언트 proxy."""
+
+    def __init__(self, store, real_client=None, fallback_upstream=None):
+        fallback = fakes.FakeOpenAI(fallback_upstream)
+
+        def create(model=None, messages=None, stream=False, **kwargs):
+            if stream:
+                # fixture 는 완성된 응답 단위로 저장 / 재생하고 조각으로만 나눠서 흘린다
+                resp = create(model=model, messages=messages, **kwargs)
+                return fakes.stream_chunks(resp.choices[0].message.content, resp.usage)
+
+            def real():
+                resp = real_client.chat.completions.create(model=model, messages=messages, **kwargs)
+                usage = getattr(resp, "usage", None)
+                return {
+                    "content": resp.choices[0].message.content,
+                    "prompt_tokens": getattr(usage, "prompt_tokens", 0),
+                    "completion_tokens": getattr(usage, "completion_tokens", 0),
+                }
+
+            def fake():
+                resp = fallback.chat.completions.create(model=model, messages=messages, **kwargs)
+                return {
+                    "content": resp.choices[0].message.content,
+                    "prompt_tokens": resp.usage.prompt_tokens,
+                    "completion_tokens": resp.usage.completion_tokens,
+                }
+
+            value = store.call("gpt5", "chat", (model, messages), kwargs, real=real, fallback=fake)
+            return SimpleNamespace(
+                choices=[SimpleNamespace(message=SimpleNamespace(content=value["content"]), finish_reason="stop")],
+                usage=SimpleNamespace(prompt_tokens=value["prompt_tokens"],
+                                      completion_tokens=value["completion_tokens"]),
+                model=model,
+            )
+
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=create))
+
+
+# ---- Qwen ----
+
+def install_qwen(store, fallback_upstream):
+    """qwen_client 가 쓰는 requests.post 중 /generate 호출만 fixture 경유로 교체."""
+    import requests
+
+    real_post = requests.post
+
+    def post(url, *args, **kwargs):
+        if not str(url).rstrip("/").endswith("/generate"):
+            return real_post(url, *args, **kwargs)
+        payload = kwargs.get("json") or {}
+
+        def real():
+            resp = real_post(url, *args, **kwargs)
+            return {"status_code": resp.status_code, "text": resp.text}
+
+        def fallback():
+            try:
+                fallback_upstream.hit("generate")
+                return {"status_code": 200, "text": '"Zero trust means every request is verified."'}
+            except fakes.FakeUpstreamError as e:
+                return {"status_code": 500, "text": str(e)}
+
+        value = store.call("qwen", "generate", (payload,), {}, real=real, fallback=fallback)
+        return SimpleNamespace(**value)
+
+    requests.post = post
@@ -0,0 +1,173 @@
+# bench/replay.py
+"""
+backend.traffic_capture 로 기록한 요청 로그를 앱에 그대로 다시 흘려보낸다.
+
+    # 1) 한 번만 (네트워크 필요): 로그를 진짜 upstream 에 돌려 fixture 를 만든다
+    python -m bench.replay captures/*.jsonl.gz --fixtures fixtures/ --record --speed 0
+
+    # 2) 이후엔 오프라인으로: 원래 속도 / 2배속 / 최대 속도로 재생
+    python -m bench.replay captures/*.jsonl.gz --fixtures fixtures/
+    python -m bench.replay captures/*.jsonl.gz --fixtures fixtures/ --speed 2 --json out/replay.json
+    python -m bench.replay captures/*.jsonl.gz --fixtures fixtures/ --speed 0 --baseline out/replay.json
+
+- 요청은 기록된 시각 간격 / speed 에 맞춰 발사한다 (--speed 0 이면 간격 없이 동시성 한도까지).
+- upstream 응답은 fixture 에서 꺼내고, 기록 당시 걸린 시간 x --latency-scale 만큼 기다린다.
+  fixture 에 없는 호출은 bench.fakes 합성 응답으로 대체되고 miss 로 집계된다.
+- 보고: route 별 req/s, p50/p95/p99 (bench.run 과 같은 형식), 발사 지연(lag), 기록과 다른 status 수.
+"""
+import argparse
+import contextlib
+import glob
+import gzip
+import io
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+import numpy as np
+
+from bench import fakes
+from bench.fixtures import FixtureOpenAI, FixtureStore, install_qwen, install_yahoo
+from bench.run import compare, load_app, prepare_environment, print_report, summarize
+
+
+def load_records(patterns, limit=None):
+    paths = sorted({p for pattern in patterns for p in glob.glob(pattern)})
+    records = []
+    for path in paths:
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    # 강제 종료로 잘린 마지막 줄 등
+                    continue
+    records.sort(key=lambda r: r["t"])
+    return records[:limit] if limit else records
+
+
+def build_app(args):
+    prepare_environment(args.verbose)
+    store = FixtureStore(args.fixtures, mode="record" if args.record else "replay",
+                         latency_scale=args.latency_scale)
+    fallback = fakes.Upstream("fallback", args.miss_latency_ms)
+    install_yahoo(store, fallback)
+    install_qwen(store, fallback)
+    if args.record:
+        from backend.llm_client import get_openai_client
+
+        real_client = get_openai_client()
+        if real_client is None:
+            print("[replay] GPT-5 client is not configured, LLM calls will not be recorded")
+        llm = FixtureOpenAI(store, real_client=real_client) if real_client is not None else None
+    else:
+        llm = FixtureOpenAI(store, fallback_upstream=fallback)
+    return load_app(llm=llm), store
+
+
+def replay(app, records, speed, concurrency):
+    """기록 간격 / speed 에 맞춰 요청을 발사. route -> (latencies, statuses), lag 목록, status 불일치 수."""
+    local = threading.local()
+    lock = threading.Lock()
+    per_route = defaultdict(lambda: ([], Counter()))
+    lags = []
+    mismatched = [0]
+
+    def one(rec, due):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        start = time.perf_counter()
+        resp = client.open(rec["p"], method=rec["m"], json=rec.get("b"))
+        resp.get_data()
+        elapsed = time.perf_counter() - start
+        route = urlsplit(rec["p"]).path
+        with lock:
+            latencies, statuses = per_route[route]
+            latencies.append(elapsed)
+            statuses[resp.status_code] += 1
+            lags.append(max(0.0, start - due))
+            if "s" in rec and rec["s"] != resp.status_code:
+                mismatched[0] += 1
+
+    t0 = records[0]["t"] if records else 0.0
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for rec in records:
+            due = started + ((rec["t"] - t0) / speed if speed > 0 else 0.0)
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(one, rec, due)
+    wall = time.perf_counter() - started
+    return per_route, np.array(lags), mismatched[0], wall
+
+
+def _parse_args(argv):
+    ap = argparse.ArgumentParser(prog="python -m bench.replay", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("captures", nargs="+", help="capture files or globs (.jsonl / .jsonl.gz)")
+    ap.add_argument("--fixtures", required=True, help="fixture store directory")
+    ap.add_argument("--record", action="store_true", help="call real upstreams and save fixtures")
+    ap.add_argument("--speed", type=float, default=1.0, help="1 = original pacing, 2 = twice as fast, 0 = no pacing")
+    ap.add_argument("--concurrency", type=int, default=64)
+    ap.add_argument("--latency-scale", type=float, default=1.0, help="multiplier for recorded upstream latency")
+    ap.add_argument("--miss-latency-ms", type=float, default=50.0, help="latency of synthetic fallback responses")
+    ap.add_argument("--limit", type=int, default=0, help="replay only the first N requests")
+    ap.add_argument("--json", dest="json_out", default="")
+    ap.add_argument("--baseline", default="")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    ap.add_argument("--verbose", action="store_true")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    records = load_records(args.captures, args.limit or None)
+    if not records:
+        print("no captured requests found")
+        return 1
+
+    quiet = contextlib.nullcontext if args.verbose else (lambda: contextlib.redirect_stdout(io.StringIO()))
+    with quiet():
+        app, store = build_app(args)
+        per_route, lags, mismatched, wall = replay(app, records, args.speed, args.concurrency)
+
+    results = [
+        summarize(route, np.array(latencies), statuses, wall)
+        for route, (latencies, statuses) in sorted(per_route.items())
+    ]
+    print_report(results)
+    span = records[-1]["t"] - records[0]["t"]
+    print()
+    print(f"replayed {len(records)} requests in {wall:.1f}s (captured span {span:.1f}s, speed {args.speed})")
+    if len(lags):
+        print(f"dispatch lag p50 {np.percentile(lags, 50) * 1000:.1f}ms, p99 {np.percentile(lags, 99) * 1000:.1f}ms")
+    print(f"status differs from capture: {mismatched}")
+    print("fixtures: " + ", ".join(f"{k}={v}" for k, v in store.stats().items()))
+
+    if args.json_out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_out)), exist_ok=True)
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results, "fixtures": store.stats(),
+                       "status_mismatch": mismatched}, f, indent=2)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for route, before, after in regressions:
+            print(f"REGRESSION {route}: p95 {before:.1f}ms -> {after:.1f}ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
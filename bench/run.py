@@ -0,0 +1,307 @@
+# bench/run.py
+"""
+yfinance_api 의 모든 라우트를 가짜 upstream 위에서 동시 요청으로 두드리고
+라우트별 처리량(req/s)과 p50 / p95 / p99 지연을 보고한다. 네트워크는 쓰지 않는다.
+
+    python -m bench.run
+    python -m bench.run --requests 500 --concurrency 32 --yahoo-latency-ms 120 --llm-latency-ms 800
+    python -m bench.run --only quote,search --json out/bench.json
+    python -m bench.run --baseline out/bench.json --tolerance 0.2   # p95 가 20% 넘게 느려지면 exit 1
+    python -m bench.run --only quote,search --yahoo-max-rps 20 --yahoo-rate 30   # throttling / backoff 확인
+
+요청은 Flask test client 로 in-process 로 보낸다 (WSGI 서버 오버헤드 제외, 앱 코드 + upstream 대기만 측정).
+심볼은 --symbols 개의 풀에서 돌려 쓰므로 캐시 hit / miss 가 섞인다.
+Yahoo rate limiter(backend.rate_limit)는 기본적으로 사실상 꺼 두고(--yahoo-rate 0),
+상태 파일은 임시 디렉터리에 둔다.
+"""
+import argparse
+import atexit
+import contextlib
+import io
+import itertools
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from bench.fakes import FakeOpenAI, FakeQwenServer, Upstream, install_yahoo
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_FAQ_PATH = os.path.join(_ROOT, "customer_faq_data_6095.jsonl")
+
+US_SYMBOLS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "GOOGL", "META", "AMD", "NFLX", "O",
+              "JPM", "V", "KO", "PEP", "COST", "INTC", "QCOM", "ADBE", "CRM", "ORCL"]
+KR_SYMBOLS = ["005930.KS", "000660.KS", "035420.KS", "035720.KS", "051910.KS",
+              "247540.KQ", "086520.KQ", "091990.KQ", "068270.KS", "005380.KS"]
+SEARCH_QUERIES = ["apple", "tesla", "samsung", "nvidia", "realty income", "microsoft", "AMD", "bank"]
+KNOWLEDGE_QUERIES = ["통장 사본", "비밀번호 변경", "해외 송금", "카드 분실", "대출 금리", "계좌 해지"]
+
+
+class Scenario:
+    """name + (i, symbol 풀) -> (method, path, json body)."""
+
+    def __init__(self, name, build, max_requests=None):
+        self.name = name
+        self.build = build
+        self.max_requests = max_requests
+
+
+def _holdings(pool, i, n=8):
+    return [
+        {"symbol": pool[(i + k) % len(pool)], "quantity": 1 + k, "avg_price": 100 + 5 * k}
+        for k in range(n)
+    ]
+
+
+def _qa_pairs(i):
+    return [
+        {"question": "What happened recently?", "answer": f"I lost some money in trade {i}."},
+        {"question": "How did you react?", "answer": "I looked for opportunities to buy more."},
+        {"question": "What will you do next?", "answer": "Keep investing with a plan."},
+    ]
+
+
+SCENARIOS = [
+    Scenario("index", lambda i, p: ("GET", "/", None)),
+    Scenario("quote", lambda i, p: ("GET", f"/api/quote?symbol={p[i % len(p)]}", None)),
+    Scenario("quote_risk", lambda i, p: ("GET", f"/api/quote?symbol={p[i % len(p)]}&risk=1", None)),
+    Scenario("search", lambda i, p: ("GET", f"/api/search?query={SEARCH_QUERIES[i % len(SEARCH_QUERIES)]}", None)),
+    Scenario("news", lambda i, p: ("GET", f"/api/news?symbol={p[i % len(p)]}", None)),
+    # 시장 뉴스는 요청마다 같은 5종목을 모두 조회하므로 요청 수를 제한
+    Scenario("market_news", lambda i, p: ("GET", "/api/news", None), max_requests=4),
+    Scenario("news_portfolio", lambda i, p: ("GET", "/api/news?symbols=" + ",".join(p[(i + k) % len(p)] for k in range(5)), None)),
+    Scenario("history", lambda i, p: ("GET", f"/api/history?symbol={p[i % len(p)]}&range=1y", None)),
+    Scenario("history_intraday", lambda i, p: ("GET", f"/api/history?symbol={p[i % len(p)]}&range=5d", None)),
+    Scenario("knowledge", lambda i, p: (
+        "GET", f"/api/knowledge/search?q={KNOWLEDGE_QUERIES[i % len(KNOWLEDGE_QUERIES)]}", None)),
+    Scenario("portfolio", lambda i, p: ("POST", "/api/portfolio/valuation",
+                                        {"holdings": _holdings(p, i), "include_risk": i % 2 == 0})),
+    Scenario("backtest", lambda i, p: ("POST", "/api/backtest", {
+        "symbols": [p[(i + k) % len(p)] for k in range(5)], "rebalance": "monthly"})),
+    Scenario("news_sentiment", lambda i, p: ("POST", "/api/news-sentiment", {
+        "title": f"{p[i % len(p)]} beats estimates", "summary": "Revenue grew 12%.", "symbols": [p[i % len(p)]]})),
+    Scenario("dashboard_learning", lambda i, p: ("GET", f"/api/dashboard-learning?seed={i}", None)),
+    Scenario("dashboard_quizzes", lambda i, p: ("GET", f"/api/dashboard-quizzes?seed={i}", None)),
+    Scenario("dashboard_learning_stream", lambda i, p: ("GET", f"/api/dashboard-learning?seed={i}&stream=1", None)),
+    # 구역들을 동시에: 학습 카드 / 퀴즈 (LLM) 중 느린 쪽 정도의 지연이어야 한다. seed 는 위 시나리오들과 겹치지 않게
+    Scenario("dashboard_bundle", lambda i, p: ("GET", f"/api/dashboard?symbols={p[i % len(p)]},{p[(i + 1) % len(p)]}"
+                                                      f"&seed={10000 + i}", None)),
+    Scenario("persona", lambda i, p: ("POST", "/api/persona/classify",
+                                      {"qa_pairs": _qa_pairs(i), "current_persona": "STRUGGLER"})),
+    Scenario("security_chat", lambda i, p: ("POST", "/api/security-chat", {
+        "history": [{"role": "user", "content": f"What is zero trust? ({i})"}]})),
+    Scenario("negative_cache_stats", lambda i, p: ("GET", "/api/negative-cache/stats", None)),
+]
+
+
+def _load_knowledge_docs(limit=2000):
+    rows = []
+    if not os.path.exists(_FAQ_PATH):
+        return rows
+    with open(_FAQ_PATH, encoding="utf-8") as f:
+        for i, line in enumerate(itertools.islice(f, limit)):
+            try:
+                item = json.loads(line)
+            except ValueError:
+                continue
+            rows.append({
+                "doc_id": f"faq-{i}",
+                "title": item.get("instruction", ""),
+                "body": item.get("response", ""),
+                "press": "FAQ",
+                "published_at": None,
+            })
+    return rows
+
+
+def prepare_environment(verbose=False):
+    """
+    임시 작업 디렉터리에 history / knowledge 저장소를 두고 repo root 를 import 경로에 넣는다.
+    작업 디렉터리는 프로세스 종료 시 지운다 (atexit 은 역순이라 나중에 등록되는 snapshot flush 가 먼저 돈다).
+    """
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    # 앱 로그는 비동기 handler 가 stdout 에 직접 쓰므로 레벨로 조절
+    os.environ.setdefault("LOG_LEVEL", "INFO" if verbose else "ERROR")
+    os.environ["HISTORY_DIR"] = os.path.join(workdir, "history")
+    os.environ["KNOWLEDGE_BACKEND"] = "sqlite"
+    os.environ["KNOWLEDGE_SQLITE_PATH"] = os.path.join(workdir, "knowledge.sqlite3")
+    os.environ["YAHOO_RATE_STATE"] = os.path.join(workdir, "yahoo-rate-limit.state")
+    os.environ["SNAPSHOT_DIR"] = os.path.join(workdir, "snapshots")
+    if _ROOT not in sys.path:
+        sys.path.insert(0, _ROOT)
+    return workdir
+
+
+def load_app(llm=None, qwen_url=None):
+    """yfinance_api 를 import 하고 LLM 클라이언트 / Qwen URL 을 바꿔 끼운다 (upstream 교체 후 호출)."""
+    import yfinance_api as api
+    from backend import llm_client
+    from services import knowledge_search
+
+    if llm is not None:
+        llm_client.set_openai_client(llm)
+    if qwen_url:
+        api.MY_API_URL = qwen_url
+
+    knowledge_search.init_index()
+    knowledge_search.load_sqlite_docs(_load_knowledge_docs())
+    return api.app
+
+
+def build_app(args):
+    """가짜 upstream 을 설치하고 yfinance_api.app 과 upstream 핸들들을 돌려준다."""
+    prepare_environment(args.verbose)
+    # rate limiter 설정은 import 시점에 읽히므로 앱을 불러오기 전에 정한다
+    yahoo_rate = args.yahoo_rate if args.yahoo_rate > 0 else 100000
+    os.environ["YAHOO_RATE"] = os.environ["YAHOO_RATE_MAX"] = str(yahoo_rate)
+    os.environ["YAHOO_BURST"] = str(max(10, yahoo_rate))
+    upstreams = {
+        "yahoo": Upstream("yahoo", args.yahoo_latency_ms, args.jitter_ms, args.error_rate, seed=1,
+                          max_rps=args.yahoo_max_rps),
+        "gpt5": Upstream("gpt5", args.llm_latency_ms, args.jitter_ms, args.error_rate, seed=2),
+        "qwen": Upstream("qwen", args.qwen_latency_ms, args.jitter_ms, args.error_rate, seed=3,
+                         slow_rate=args.qwen_slow_rate, slow_ms=args.qwen_slow_ms),
+    }
+    install_yahoo(upstreams["yahoo"])
+    qwen = FakeQwenServer(upstreams["qwen"]).start()
+    app = load_app(llm=FakeOpenAI(upstreams["gpt5"]), qwen_url=qwen.url)
+    return app, upstreams, qwen
+
+
+def summarize(name, latencies, statuses, wall):
+    """지연 배열(초) + status Counter -> 보고용 dict."""
+    n = len(latencies)
+    p50, p95, p99 = np.percentile(latencies * 1000, [50, 95, 99]) if n else (0.0, 0.0, 0.0)
+    return {
+        "route": name,
+        "requests": n,
+        "errors": sum(c for s, c in statuses.items() if s >= 400),
+        "statuses": {str(s): c for s, c in sorted(statuses.items())},
+        "rps": n / wall if wall > 0 else 0.0,
+        "p50_ms": float(p50),
+        "p95_ms": float(p95),
+        "p99_ms": float(p99),
+        "max_ms": float(latencies.max() * 1000) if n else 0.0,
+    }
+
+
+def run_scenario(app, scenario, pool, requests, concurrency):
+    n = min(requests, scenario.max_requests) if scenario.max_requests else requests
+    local = threading.local()
+    latencies = np.zeros(n)
+    statuses = Counter()
+    lock = threading.Lock()
+
+    def one(i):
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = app.test_client()
+        method, path, body = scenario.build(i, pool)
+        t0 = time.perf_counter()
+        resp = client.open(path, method=method, json=body)
+        resp.get_data()
+        latencies[i] = time.perf_counter() - t0
+        with lock:
+            statuses[resp.status_code] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool_exec:
+        list(pool_exec.map(one, range(n)))
+    return summarize(scenario.name, latencies, statuses, time.perf_counter() - started)
+
+
+def print_report(results, upstreams=None):
+    header = f"{'route':<30}{'n':>6}{'err':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(f"{r['route']:<30}{r['requests']:>6}{r['errors']:>6}{r['rps']:>10.1f}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+    if upstreams:
+        print()
+        print("upstream calls: " + ", ".join(
+            f"{name}={u.calls} (errors {u.errors}, throttled {u.throttled})" for name, u in upstreams.items()))
+
+
+def compare(results, baseline_path, tolerance):
+    """baseline 대비 p95 가 tolerance 이상 나빠진 라우트 목록."""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {r["route"]: r for r in json.load(f)["results"]}
+    regressions = []
+    for r in results:
+        base = baseline.get(r["route"])
+        if base and base["p95_ms"] > 0 and r["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append((r["route"], base["p95_ms"], r["p95_ms"]))
+    return regressions
+
+
+def _parse_args(argv):
+    ap = argparse.ArgumentParser(prog="python -m bench.run", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--requests", type=int, default=100, help="requests per route")
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--symbols", type=int, default=20, help="distinct symbols to rotate through")
+    ap.add_argument("--only", default="", help="comma separated route names")
+    ap.add_argument("--yahoo-latency-ms", type=float, default=50.0)
+    ap.add_argument("--llm-latency-ms", type=float, default=300.0)
+    ap.add_argument("--qwen-latency-ms", type=float, default=300.0)
+    ap.add_argument("--qwen-slow-rate", type=float, default=0.0,
+                    help="fraction of Qwen calls that hit a slow replica (QWEN_HEDGE=0 to compare without hedging)")
+    ap.add_argument("--qwen-slow-ms", type=float, default=3000.0, help="extra latency of a slow Qwen replica")
+    ap.add_argument("--jitter-ms", type=float, default=0.0, help="uniform extra latency 0..N ms")
+    ap.add_argument("--error-rate", type=float, default=0.0, help="fraction of upstream calls that fail")
+    ap.add_argument("--yahoo-max-rps", type=float, default=0.0,
+                    help="fake Yahoo answers 429 above this many calls per second (0 = never)")
+    ap.add_argument("--yahoo-rate", type=float, default=0.0,
+                    help="starting / max rate of the app's Yahoo rate limiter (0 = effectively unlimited)")
+    ap.add_argument("--json", dest="json_out", default="", help="write results to this file")
+    ap.add_argument("--baseline", default="", help="compare p95 against a previous --json output")
+    ap.add_argument("--tolerance", type=float, default=0.2)
+    ap.add_argument("--verbose", action="store_true", help="keep the app's own log output")
+    return ap.parse_args(argv)
+
+
+def main(argv=None):
+    args = _parse_args(argv)
+    pool = (US_SYMBOLS + KR_SYMBOLS)[: max(1, args.symbols)]
+    scenarios = SCENARIOS
+    if args.only:
+        wanted = {s.strip() for s in args.only.split(",") if s.strip()}
+        scenarios = [s for s in SCENARIOS if s.name in wanted]
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        app, upstreams, qwen = build_app(args)
+    results = []
+    try:
+        for scenario in scenarios:
+            with (contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())):
+                results.append(run_scenario(app, scenario, pool, args.requests, args.concurrency))
+    finally:
+        qwen.stop()
+
+    print_report(results, upstreams)
+    if args.json_out:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json_out)), exist_ok=True)
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"args": vars(args), "results": results,
+                       "upstreams": {k: u.stats() for k, u in upstreams.items()}}, f, indent=2)
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for route, before, after in regressions:
+            print(f"REGRESSION {route}: p95 {before:.1f}ms -> {after:.1f}ms")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,26 @@
+# gunicorn.conf.py
+"""
+gunicorn 설정 (Procfile 참고). 읽기 전용 데이터 공유는 backend.preload 참고.
+
+    gunicorn --preload -c gunicorn.conf.py 'yfinance_api:create_app()'
+"""
+import os
+
+worker_class = "gthread"
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads = int(os.getenv("GUNICORN_THREADS", "32"))
+bind = f"0.0.0.0:{os.getenv('PORT', '5002')}"
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # master 가 fork 직전까지 만든 객체도 GC 영구 세대로 (create_app 이후 생긴 것 포함)
+    import gc
+
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from backend import preload
+
+    preload.after_fork(worker.age)
@@ -1,5 +1,184 @@
 # qwen_client.py
-import requests
+"""
+Qwen finsec 모델 (/generate) 호출.
+
+느린 replica 에 걸리면 120s 를 다 기다리는 대신 hedging 을 한다:
+- 최근 응답 지연(QWEN_HEDGE_WINDOW 개)의 QWEN_HEDGE_PERCENTILE 분위수가 지나도 답이 없으면
+  같은 요청을 한 번 더 보내고 먼저 끝난 성공(200) 응답을 쓴다. 진 쪽은 소켓을 닫아 취소한다.
+  취소된 첫 요청은 그때까지 걸린 시간을 지연 표본(하한)으로 남긴다.
+  (표본이 QWEN_HEDGE_MIN_SAMPLES 개 미만이면 QWEN_HEDGE_INITIAL_DELAY 초)
+- 예산: 요청 1건마다 QWEN_HEDGE_BUDGET 만큼 credit 이 쌓이고(최대 QWEN_HEDGE_BURST) hedge 1번에 1 을 쓴다.
+  따라서 추가 upstream 호출은 장기적으로 요청 수의 QWEN_HEDGE_BUDGET 배를 넘지 않는다 (worker 별).
+- 요청을 도중에 끊을 수 있도록 requests 대신 http.client 로 직접 보낸다.
+"""
+import http.client
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+from backend import metrics
+from backend.metrics import mark_upstream_error
+
+QWEN_TIMEOUT = float(os.getenv("QWEN_TIMEOUT", "120"))
+QWEN_HEDGE = os.getenv("QWEN_HEDGE", "1") not in ("0", "false", "")
+QWEN_HEDGE_PERCENTILE = float(os.getenv("QWEN_HEDGE_PERCENTILE", "95"))
+QWEN_HEDGE_BUDGET = float(os.getenv("QWEN_HEDGE_BUDGET", "0.1"))
+QWEN_HEDGE_BURST = float(os.getenv("QWEN_HEDGE_BURST", "3"))
+QWEN_HEDGE_WINDOW = int(os.getenv("QWEN_HEDGE_WINDOW", "200"))
+QWEN_HEDGE_MIN_SAMPLES = int(os.getenv("QWEN_HEDGE_MIN_SAMPLES", "20"))
+QWEN_HEDGE_INITIAL_DELAY = float(os.getenv("QWEN_HEDGE_INITIAL_DELAY", "10"))
+QWEN_HEDGE_MIN_DELAY = float(os.getenv("QWEN_HEDGE_MIN_DELAY", "0.2"))
+
+log = logging.getLogger(__name__)
+
+
+class _HedgePolicy:
+    """최근 지연 분포로 hedge 시점을 정하고, credit 으로 hedge 횟수를 제한한다."""
+
+    def __init__(self):
+        self._latencies = deque(maxlen=QWEN_HEDGE_WINDOW)
+        self._credits = QWEN_HEDGE_BURST
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def delay(self) -> float:
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < QWEN_HEDGE_MIN_SAMPLES:
+            return QWEN_HEDGE_INITIAL_DELAY
+        idx = min(len(samples) - 1, int(round(QWEN_HEDGE_PERCENTILE / 100 * (len(samples) - 1))))
+        return max(QWEN_HEDGE_MIN_DELAY, samples[idx])
+
+    def on_request(self):
+        with self._lock:
+            self._credits = min(QWEN_HEDGE_BURST, self._credits + QWEN_HEDGE_BUDGET)
+
+    def try_hedge(self) -> bool:
+        with self._lock:
+            if self._credits < 1:
+                return False
+            self._credits -= 1
+            return True
+
+
+_policy = _HedgePolicy()
+
+
+class _Attempt:
+    """POST 한 번을 별도 스레드에서. cancel() 은 소켓을 닫아 진행 중인 읽기를 끝낸다."""
+
+    def __init__(self, endpoint, headers, body, finished):
+        self.endpoint = endpoint
+        self.headers = headers
+        self.body = body
+        self.status = None
+        self.text = None
+        self.error = None
+        self.cancelled = False
+        self.started = None
+        self.done = threading.Event()
+        self._finished = finished  # 어느 attempt 든 끝나면 set 되는 공유 Event
+        self._conn = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        threading.Thread(target=self._run, name="qwen-attempt", daemon=True).start()
+        return self
+
+    @property
+    def ok(self):
+        # 4xx (429 포함) 는 다른 attempt 의 200 을 기다린다. 모두 실패하면 _hedged_post 가 마지막 응답을 돌려준다
+        return self.done.is_set() and self.error is None and self.status == 200
+
+    def _run(self):
+        parts = urlsplit(self.endpoint)
+        conn_cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+        try:
+            self._conn = conn_cls(parts.hostname, parts.port, timeout=QWEN_TIMEOUT)
+            if self.cancelled:
+                return
+            target = (parts.path or "/") + ("?" + parts.query if parts.query else "")
+            self._conn.request("POST", target, body=self.body, headers=self.headers)
+            resp = self._conn.getresponse()
+            self.status = resp.status
+            self.text = resp.read().decode("utf-8", "replace")
+        except Exception as e:
+            self.error = e
+        finally:
+            if self._conn is not None:
+                self._conn.close()
+            if not self.cancelled:
+                elapsed = time.perf_counter() - self.started
+                metrics.UPSTREAM_LATENCY.labels("qwen", "generate").observe(elapsed)
+                if self.error is None and self.status == 200:
+                    _policy.record(elapsed)
+                else:
+                    mark_upstream_error("qwen", "generate")
+            self.done.set()
+            self._finished.set()
+
+    def cancel(self):
+        self.cancelled = True
+        sock = getattr(self._conn, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+def _hedged_post(endpoint, headers, body):
+    """
+    (status, text). 첫 요청이 hedge 지연 안에 끝나지 않으면(예산이 있으면) 한 번 더 보내고
+    먼저 끝난 성공 응답을 쓴다. 둘 다 실패하면 마지막 실패를 돌려준다(또는 raise).
+    """
+    finished = threading.Event()
+    deadline = time.monotonic() + QWEN_TIMEOUT
+    _policy.on_request()
+    attempts = [_Attempt(endpoint, headers, body, finished).start()]
+
+    if QWEN_HEDGE and not attempts[0].done.wait(_policy.delay()):
+        if _policy.try_hedge():
+            metrics.UPSTREAM_HEDGES.labels("qwen", "sent").inc()
+            attempts.append(_Attempt(endpoint, headers, body, finished).start())
+        else:
+            metrics.UPSTREAM_HEDGES.labels("qwen", "budget_exhausted").inc()
+
+    winner = None
+    while winner is None:
+        finished.clear()
+        winner = next((a for a in attempts if a.ok), None)
+        if winner is not None or all(a.done.is_set() for a in attempts):
+            break
+        if not finished.wait(max(0.0, deadline - time.monotonic())):
+            break  # 전체 timeout
+
+    for a in attempts:
+        if a is not winner and not a.done.is_set():
+            a.cancel()
+            if a is attempts[0]:
+                # 느린 첫 요청의 실제 지연은 모르지만 적어도 지금까지는 걸렸다. 이 하한이라도 넣지 않으면
+                # hedge 로 끊긴 느린 표본만 빠져서 percentile (= hedge 지연) 이 점점 내려간다
+                _policy.record(time.perf_counter() - a.started)
+    if winner is None:
+        last = next((a for a in reversed(attempts) if a.done.is_set()), None)
+        if last is None:
+            raise TimeoutError(f"no response within {QWEN_TIMEOUT:.0f}s")
+        if last.error is not None:
+            raise last.error
+        winner = last
+    elif winner is not attempts[0]:
+        metrics.UPSTREAM_HEDGES.labels("qwen", "won").inc()
+    return winner.status, winner.text
+
 
 def call_qwen_finsec_model(api_url: str, api_key: str, prompt: str, max_tokens: int = 512):
     base_url = api_url.rstrip("/")
@@ -16,14 +195,14 @@ def call_qwen_finsec_model(api_url: str, api_key: str, prompt: str, max_tokens:
     }
    
     try:
-        print(f"📡 모델 호출 중... ({endpoint})")
-        response = requests.post(endpoint, headers=headers, json=payload, timeout=120)
+        log.debug("calling Qwen model (%s)", endpoint)
+        status, text = _hedged_post(endpoint, headers, json.dumps(payload).encode("utf-8"))
        
-        if response.status_code == 200:
-            result_text = response.text.strip().strip('"').replace(r'\n', '\n')
+        if status == 200:
+            result_text = text.strip().strip('"').replace(r'\n', '\n')
             return result_text
         else:
-            return f"❌ 에러 발생 (Status {response.status_code}): {response.text}"
+            return f"❌ 에러 발생 (Status {status}): {text}"
            
     except Exception as e:
         return f"❌ 연결 실패: {str(e)}"
@@ -0,0 +1,95 @@
+import logging
+import math
+
+import numpy as np
+from flask import Blueprint, request, jsonify
+
+from backend import backtest_engine
+from backend.quotes import normalize_symbols
+
+MAX_SYMBOLS = 50
+
+log = logging.getLogger(__name__)
+
+# Blueprint definition
+backtest_bp = Blueprint("backtest", __name__)
+
+
+@backtest_bp.route("/api/backtest", methods=["POST"])
+def run_backtest():
+    """
+    POST endpoint for "what if I had bought X" style backtests on cached daily history.
+    Expects JSON:
+      {
+        "symbols": [str, ...],                # up to 50
+        "weights": [number, ...],             # optional, default equal weight
+        "rebalance": "none"|"daily"|"weekly"|"monthly"|"quarterly",  # default "monthly"
+        "start": "YYYY-MM-DD", "end": "YYYY-MM-DD",                  # optional
+        "initial_capital": number             # optional, default 10000
+      }
+    Responds:
+      { "dates": ["YYYY-MM-DD", ...], "equity": [...], "drawdown": [...],
+        "summary": { total_return, cagr, volatility, sharpe, max_drawdown, rebalance_count },
+        "assets": [ { "symbol", "weight", "return" }, ... ] }
+    """
+    try:
+        data = request.get_json(force=True) or {}
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+    if not isinstance(data, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+
+    raw_symbols = data.get("symbols")
+    if not isinstance(raw_symbols, list) or not raw_symbols:
+        return jsonify({"error": "symbols must be a non-empty list"}), 400
+    symbols = normalize_symbols(raw_symbols)
+    if len(symbols) > MAX_SYMBOLS:
+        return jsonify({"error": f"at most {MAX_SYMBOLS} symbols are supported"}), 400
+    if len(symbols) != len(raw_symbols):
+        return jsonify({"error": "symbols must be unique, non-empty strings"}), 400
+
+    weights = data.get("weights")
+    if weights is not None:
+        # bool 은 int 의 하위 타입이고, Flask 의 JSON 파서는 NaN / Infinity 도 받아들인다
+        if not isinstance(weights, list) or not all(
+            isinstance(w, (int, float)) and not isinstance(w, bool) and math.isfinite(w) for w in weights
+        ):
+            return jsonify({"error": "weights must be a list of finite numbers"}), 400
+
+    rebalance = str(data.get("rebalance") or "monthly").strip().lower()
+    raw_capital = data.get("initial_capital", 10000)
+    try:
+        initial_capital = float(raw_capital)
+    except (TypeError, ValueError):
+        return jsonify({"error": "initial_capital must be a number"}), 400
+    if isinstance(raw_capital, bool) or not math.isfinite(initial_capital) or initial_capital <= 0:
+        return jsonify({"error": "initial_capital must be a positive number"}), 400
+
+    try:
+        result = backtest_engine.backtest(
+            symbols,
+            weights=weights,
+            rebalance=rebalance,
+            start=data.get("start") or None,
+            end=data.get("end") or None,
+            initial_capital=initial_capital,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        log.exception("/api/backtest error")
+        return jsonify({"error": str(e)}), 500
+
+    return jsonify({
+        "dates": np.datetime_as_string(result["days"].astype("datetime64[D]")).tolist(),
+        "equity": result["equity"].round(4).tolist(),
+        "drawdown": result["drawdown"].round(6).tolist(),
+        "summary": {
+            key: result[key]
+            for key in ("total_return", "cagr", "volatility", "sharpe", "max_drawdown", "rebalance_count")
+        },
+        "assets": [
+            {"symbol": sym, "weight": float(w), "return": float(r)}
+            for sym, w, r in zip(symbols, result["weights"], result["asset_returns"])
+        ],
+    })
@@ -0,0 +1,67 @@
+import logging
+
+from flask import Blueprint, request, jsonify
+
+from backend import history_store
+from backend.http_cache import json_response
+
+log = logging.getLogger(__name__)
+
+# Blueprint definition
+history_bp = Blueprint("history", __name__)
+
+
+@history_bp.route("/api/history", methods=["GET"])
+def get_history():
+    """
+    GET /api/history?symbol=SYMBOL&range=1y&interval=1d
+    로컬 컬럼 저장소에서 slice 를 잘라서 반환한다.
+    - 처음 보는 심볼은 한 번 backfill, 이후에는 갱신 주기가 지났을 때만 tail 을 받는다.
+    Responds (columnar):
+      { "symbol", "interval", "range", "t": [epoch sec...], "open": [...], "high": [...],
+        "low": [...], "close": [...], "volume": [...] }
+    """
+    symbol = (request.args.get("symbol") or "").strip().upper()
+    if not symbol:
+        return jsonify({"error": "no symbol"}), 400
+    if not history_store.valid_symbol(symbol):
+        return jsonify({"error": "invalid symbol"}), 400
+
+    range_ = (request.args.get("range") or "1y").strip()
+    if range_ not in history_store.RANGES:
+        return jsonify({"error": "range must be one of: " + ", ".join(history_store.RANGES)}), 400
+
+    interval = (request.args.get("interval") or "").strip() or \
+        history_store.DEFAULT_INTERVAL_FOR_RANGE.get(range_, "1d")
+    if interval not in history_store.INTERVALS:
+        return jsonify({"error": "interval must be one of: " + ", ".join(history_store.INTERVALS)}), 400
+
+    try:
+        history_store.ensure(symbol, interval)
+    except Exception as e:
+        # upstream 실패해도 이미 저장된 데이터가 있으면 그대로 서빙
+        log.warning("/api/history refresh error for %s %s: %s", symbol, interval, e)
+
+    try:
+        last_ts = history_store.last_timestamp(symbol, interval)
+        if last_ts is None:
+            return jsonify({"error": "No price data"}), 404
+
+        # range 는 마지막 bar 기준 (주말/휴장일에도 비어 있지 않도록)
+        span = history_store.RANGES[range_]
+        start_ts = last_ts - span if span is not None else None
+        cols = history_store.load(symbol, interval, start_ts=start_ts)
+
+        body = {
+            "symbol": symbol,
+            "interval": interval,
+            "range": range_,
+            "t": cols["ts"].tolist(),
+        }
+        for col in history_store.COLUMNS:
+            body[col] = cols[col].tolist()
+        # 일봉은 하루 몇 번만 바뀌므로 길게, intraday 는 짧게 캐시
+        return json_response(body, max_age=300 if interval == "1d" else 60)
+    except Exception as e:
+        log.exception("/api/history error")
+        return jsonify({"error": str(e)}), 500
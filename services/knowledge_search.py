@@ -0,0 +1,236 @@
+import logging
+import os
+import re
+import sqlite3
+import threading
+from flask import Blueprint, request, jsonify
+
+from backend.cache import TTLCache
+
+# --- Backend selection ---
+# KNOWLEDGE_BACKEND=postgres (기본, backend/db.py 의 pool 사용)
+# KNOWLEDGE_BACKEND=sqlite   (로컬 테스트용 FTS5, KNOWLEDGE_SQLITE_PATH 파일 사용)
+KNOWLEDGE_BACKEND = os.getenv("KNOWLEDGE_BACKEND", "postgres").strip().lower()
+KNOWLEDGE_SQLITE_PATH = os.getenv("KNOWLEDGE_SQLITE_PATH", "knowledge.sqlite3")
+KNOWLEDGE_CACHE_TTL = float(os.getenv("KNOWLEDGE_CACHE_TTL", "60"))
+MAX_TOP_K = 20
+
+# Same stop phrases as services/knowledgeService.ts (previous client-side search)
+STOP_PHRASES = [
+    "어떻게", "왜", "요즘", "지금", "좀", "알려줘", "궁금", "가능", "해줘",
+    "뭐야", "뭔가", "어떤", "관련", "대해", "대한", "정리", "설명", "뉴스",
+    "같은", "거", "것", "수", "있어", "있나", "해줄래", "부탁", "해봐",
+]
+
+# One-time migration: stored tsvector column + GIN index.
+# 쿼리 시점에 to_tsvector 를 두 번 계산하던 것을 저장 컬럼으로 옮겨 index scan 이 가능하게 한다.
+PG_SCHEMA_SQL = """
+ALTER TABLE doc
+  ADD COLUMN IF NOT EXISTS tsv tsvector
+  GENERATED ALWAYS AS (
+    to_tsvector('simple', coalesce(title,'') || ' ' || coalesce(body,''))
+  ) STORED;
+CREATE INDEX IF NOT EXISTS doc_tsv_gin ON doc USING GIN (tsv);
+"""
+
+PG_SEARCH_SQL = """
+SELECT doc_id,
+       coalesce(title,'') AS title,
+       coalesce(body,'')  AS body,
+       press,
+       published_at,
+       ts_rank_cd(tsv, q) AS rank
+  FROM doc, websearch_to_tsquery('simple', %s) AS q
+ WHERE tsv @@ q
+ ORDER BY rank DESC
+ LIMIT %s;
+"""
+
+SQLITE_SCHEMA_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS doc_fts USING fts5(
+  title, body,
+  doc_id UNINDEXED, press UNINDEXED, published_at UNINDEXED
+);
+"""
+
+# bm25() 는 작을수록 관련도가 높으므로 부호를 뒤집어 rank 로 사용
+SQLITE_SEARCH_SQL = """
+SELECT doc_id, title, body, press, published_at, -bm25(doc_fts) AS rank
+  FROM doc_fts
+ WHERE doc_fts MATCH ?
+ ORDER BY rank DESC
+ LIMIT ?;
+"""
+
+_result_cache = TTLCache(ttl=KNOWLEDGE_CACHE_TTL, maxsize=512, name="knowledge_search")
+_sqlite_local = threading.local()
+
+log = logging.getLogger(__name__)
+
+# Blueprint definition
+knowledge_bp = Blueprint("knowledge_search", __name__)
+
+
+def normalize_ko(q, max_len=60):
+    s = (q or "").strip()
+    if not s:
+        return ""
+    for w in STOP_PHRASES:
+        s = s.replace(w, " ")
+    s = re.sub(r"\s+", " ", s).strip()
+    return s[:max_len]
+
+
+def fallback_or(q, max_terms=5):
+    s = normalize_ko(q, 120)
+    toks = [t for t in s.split() if len(t) >= 2][:max_terms]
+    return " OR ".join(toks) if toks else (q or "")
+
+
+def query_variants(user_query):
+    """raw -> stop phrase 제거 -> OR fallback 순서의 검색어 후보 (중복 제거)."""
+    q_raw = (user_query or "").strip()
+    tries = []
+    for q in (q_raw, normalize_ko(q_raw), fallback_or(q_raw)):
+        if q and q not in tries:
+            tries.append(q)
+    return tries
+
+
+def _to_fts5_query(q):
+    """
+    websearch 스타일 검색어를 FTS5 MATCH 문법으로 변환한다.
+    - 각 토큰은 따옴표로 감싸 특수문자를 무력화
+    - 'OR' 는 그대로 연산자로 유지, 나머지는 암묵적 AND
+    """
+    parts = []
+    for tok in q.split():
+        if tok.upper() == "OR":
+            if parts and parts[-1] != "OR":
+                parts.append("OR")
+            continue
+        parts.append('"' + tok.replace('"', '""') + '"')
+    while parts and parts[-1] == "OR":
+        parts.pop()
+    return " ".join(parts)
+
+
+def _sqlite_connection():
+    conn = getattr(_sqlite_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(KNOWLEDGE_SQLITE_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(SQLITE_SCHEMA_SQL)
+        _sqlite_local.conn = conn
+    return conn
+
+
+def _serialize_row(row):
+    published_at = row["published_at"]
+    if hasattr(published_at, "isoformat"):
+        published_at = published_at.isoformat()
+    return {
+        "doc_id": row["doc_id"],
+        "title": row["title"] or "",
+        "body": row["body"] or "",
+        "press": row["press"],
+        "published_at": published_at,
+        "rank": float(row["rank"] or 0),
+    }
+
+
+def _search_postgres(q, top_k):
+    import psycopg2.extras
+    from backend.db import pooled_connection
+
+    with pooled_connection() as conn:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute(PG_SEARCH_SQL, (q, top_k))
+            return [_serialize_row(r) for r in cur.fetchall()]
+
+
+def _search_sqlite(q, top_k):
+    match = _to_fts5_query(q)
+    if not match:
+        return []
+    cur = _sqlite_connection().execute(SQLITE_SEARCH_SQL, (match, top_k))
+    return [_serialize_row(r) for r in cur.fetchall()]
+
+
+def search_docs(q, top_k=6):
+    """단일 검색어로 FTS 검색 (짧은 TTL 캐시 사용)."""
+    key = (KNOWLEDGE_BACKEND, q, top_k)
+    cached = _result_cache.get(key)
+    if cached is not None:
+        return cached
+    if KNOWLEDGE_BACKEND == "sqlite":
+        rows = _search_sqlite(q, top_k)
+    else:
+        rows = _search_postgres(q, top_k)
+    _result_cache.set(key, rows)
+    return rows
+
+
+def init_index():
+    """Apply the stored tsvector / FTS5 schema for the configured backend."""
+    if KNOWLEDGE_BACKEND == "sqlite":
+        _sqlite_connection().executescript(SQLITE_SCHEMA_SQL)
+        return
+    from backend.db import pooled_connection
+
+    with pooled_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute(PG_SCHEMA_SQL)
+
+
+def load_sqlite_docs(rows):
+    """
+    로컬 테스트용: doc 행(dict: doc_id, title, body, press, published_at)을 FTS5 테이블에 적재.
+    """
+    conn = _sqlite_connection()
+    conn.executemany(
+        "INSERT INTO doc_fts (doc_id, title, body, press, published_at) VALUES (?, ?, ?, ?, ?)",
+        [
+            (r.get("doc_id"), r.get("title") or "", r.get("body") or "",
+             r.get("press"), r.get("published_at"))
+            for r in rows
+        ],
+    )
+    conn.commit()
+    _result_cache.clear()
+
+
+@knowledge_bp.route("/api/knowledge/search", methods=["GET"])
+def knowledge_search():
+    """
+    GET /api/knowledge/search?q=QUERY&top_k=6
+    Tries raw -> normalized -> OR-fallback variants and returns the first non-empty hit.
+    Responds: { "query": used_variant, "docs": [ {doc_id, title, body, press, published_at, rank}, ... ] }
+    """
+    user_query = (request.args.get("q") or request.args.get("query") or "").strip()
+    if not user_query:
+        return jsonify({"query": "", "docs": []})
+    try:
+        top_k = int(request.args.get("top_k", "6"))
+    except ValueError:
+        top_k = 6
+    top_k = max(1, min(MAX_TOP_K, top_k))
+
+    used = user_query
+    docs = []
+    try:
+        for q in query_variants(user_query):
+            docs = search_docs(q, top_k)
+            used = q
+            if docs:
+                break
+        return jsonify({"query": used, "docs": docs})
+    except Exception as e:
+        log.warning("/api/knowledge/search error: %s", e)
+        return jsonify({"error": str(e), "query": used, "docs": []}), 500
+
+
+if __name__ == "__main__":
+    # python -m services.knowledge_search  → tsv 컬럼/GIN 인덱스(또는 FTS5 테이블) 생성
+    init_index()
+    print(f"[knowledge_search] index ready (backend={KNOWLEDGE_BACKEND})")
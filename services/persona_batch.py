@@ -0,0 +1,180 @@
+# services/persona_batch.py
+"""
+여러 사용자의 persona 를 한 번에 다시 분류하는 오프라인 작업 (프롬프트 변경 후 코호트 재분류 등).
+
+    python -m services.persona_batch users.jsonl personas.jsonl [--concurrency 8]
+
+- 입력: 한 줄에 하나 {"user_id", "qa_pairs": [3개], "current_persona"} (/api/persona/classify 와 같은 형식)
+- 출력: 한 줄에 하나 {"user_id", "persona", "label", "changed"} 또는 {"user_id", "error"}
+  (완료 순서대로 append 하므로 입력 순서와 다를 수 있다)
+- 입력은 한 줄씩 읽고, 진행 중인 호출은 concurrency 의 2배까지만 잡아 둔다 (파일 크기와 무관한 메모리).
+  동시 호출 수 기본값은 llm_gateway 의 모델 동시성 한도라서, 처리량은 왕복 지연이 아니라 이 한도로 정해진다.
+- 체크포인트 = 출력 파일: 다시 실행하면 이미 persona 가 기록된 user_id 는 건너뛴다 (error 줄은 재시도).
+  같은 user_id 가 여러 번 나오면 마지막 줄이 최신 결과.
+"""
+import json
+import logging
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from backend import llm_gateway
+from services.persona_engine import classify, validate_input
+
+PERSONA_BATCH_RETRIES = int(os.getenv("PERSONA_BATCH_RETRIES", "2"))
+PERSONA_BATCH_PROGRESS = int(os.getenv("PERSONA_BATCH_PROGRESS", "500"))  # N 건마다 진행 상황 로그
+
+log = logging.getLogger(__name__)
+
+
+def default_concurrency() -> int:
+    model = llm_gateway.DEFAULT_MODEL
+    return llm_gateway.LLM_MODEL_CONCURRENCY.get(model, llm_gateway.LLM_MAX_CONCURRENCY)
+
+
+def completed_ids(out_path) -> set:
+    """출력 파일에서 이미 분류가 끝난 user_id 들 (잘린 마지막 줄 등 깨진 줄은 무시)."""
+    done = set()
+    try:
+        with open(out_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(row, dict) and "persona" in row:
+                    done.add(str(row.get("user_id")))
+    except FileNotFoundError:
+        pass
+    return done
+
+
+def _classify_one(record):
+    """입력 한 건 -> 출력 dict. LLMBusy 나 일시적 오류는 PERSONA_BATCH_RETRIES 번까지 다시 시도."""
+    user_id = record.get("user_id")
+    qa_pairs = record.get("qa_pairs")
+    current_persona = record.get("current_persona")
+    error = validate_input(qa_pairs, current_persona)
+    if error:
+        return {"user_id": user_id, "error": error}
+    for attempt in range(PERSONA_BATCH_RETRIES + 1):
+        try:
+            return dict(classify(qa_pairs, current_persona), user_id=user_id)
+        except llm_gateway.LLMUnavailable:
+            raise
+        except Exception as e:
+            if attempt == PERSONA_BATCH_RETRIES:
+                return {"user_id": user_id, "error": str(e), "type": type(e).__name__}
+            time.sleep(min(30.0, 2.0 ** attempt))
+
+
+def _records(src, skip, counts):
+    """입력 파일을 한 줄씩 (line_no, record) 로. 형식이 틀린 줄은 (line_no, error dict)."""
+    for line_no, line in enumerate(src, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_no, {"error": f"invalid JSON: {e}"}
+            continue
+        if not isinstance(record, dict) or record.get("user_id") in (None, ""):
+            yield line_no, {"error": "user_id is required"}
+            continue
+        user_id = str(record["user_id"])
+        if user_id in skip:
+            counts["skipped"] += 1
+            continue
+        skip.add(user_id)  # 입력에 같은 user_id 가 또 나오면 처음 것만
+        yield line_no, record
+
+
+def run(in_path, out_path, concurrency=None) -> dict:
+    """in_path 를 분류해서 out_path 에 append. 이번 실행의 집계를 돌려준다."""
+    if not llm_gateway.available():
+        raise llm_gateway.LLMUnavailable("SENTIMENT_API_KEY not configured")
+    concurrency = max(1, concurrency or default_concurrency())
+    skip = completed_ids(out_path)
+    counts = Counter()
+    started = time.perf_counter()
+
+    needs_newline = os.path.exists(out_path) and os.path.getsize(out_path) > 0
+    if needs_newline:
+        with open(out_path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) != b"\n"
+
+    with open(in_path, encoding="utf-8") as src, open(out_path, "a", encoding="utf-8") as out, \
+            ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="persona-batch") as pool:
+        if needs_newline:
+            out.write("\n")  # 지난 실행이 줄 중간에 끊김
+
+        def write(row):
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+            counts["ok" if "persona" in row else "errors"] += 1
+            total = counts["ok"] + counts["errors"]
+            if PERSONA_BATCH_PROGRESS and total % PERSONA_BATCH_PROGRESS == 0:
+                log.info("persona batch: %d done (%d errors), %.1f rows/s",
+                         total, counts["errors"], total / (time.perf_counter() - started))
+
+        def collect(pending, block):
+            finished, _ = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in finished:
+                pending.discard(future)
+                write(future.result())
+
+        pending = set()
+        for line_no, record in _records(src, skip, counts):
+            if "user_id" not in record:
+                write(dict(record, line=line_no))
+                continue
+            pending.add(pool.submit(_classify_one, record))
+            if len(pending) >= concurrency * 2:
+                collect(pending, block=True)
+            else:
+                collect(pending, block=False)
+        while pending:
+            collect(pending, block=True)
+
+    elapsed = time.perf_counter() - started
+    done = counts["ok"] + counts["errors"]
+    return {
+        "classified": counts["ok"],
+        "errors": counts["errors"],
+        "skipped": counts["skipped"],
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(done / elapsed, 1) if elapsed > 0 else 0.0,
+        "concurrency": concurrency,
+    }
+
+
+def _main(argv):
+    import argparse
+
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Classify personas for a JSONL file of users (resumable)")
+    parser.add_argument("input", help="JSONL: {user_id, qa_pairs, current_persona} per line")
+    parser.add_argument("output", help="JSONL results; also the checkpoint for resuming")
+    parser.add_argument("--concurrency", type=int, default=None,
+                        help="concurrent LLM calls (default: the gateway's per-model limit)")
+    args = parser.parse_args(argv)
+
+    load_dotenv(".env.local")
+    load_dotenv(".env")
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        summary = run(args.input, args.output, args.concurrency)
+    except llm_gateway.LLMUnavailable as e:
+        print(f"[persona_batch] {e}")
+        return 1
+    print(f"[persona_batch] {summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv[1:]))
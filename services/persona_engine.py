@@ -1,7 +1,10 @@
 
 
+import logging
 import os
-from flask import Blueprint, request, jsonify, current_app
+from flask import Blueprint, request, jsonify
+
+from backend import llm_gateway
 
 # --- Persona descriptions (single source of truth for backend) ---
 PERSONA_DESCRIPTIONS = {
@@ -23,6 +26,8 @@ PERSONA_DESCRIPTIONS = {
     },
 }
 
+log = logging.getLogger(__name__)
+
 # Blueprint definition
 persona_bp = Blueprint("persona_engine", __name__)
 
@@ -44,6 +49,67 @@ def _normalize_persona_code(raw):
         return first_word
     return None
 
+def validate_input(qa_pairs, current_persona):
+    """요청 형식 검사. 문제가 있으면 에러 메시지, 없으면 None."""
+    if not isinstance(qa_pairs, list) or len(qa_pairs) != 3:
+        return "qa_pairs must be a list of exactly 3 objects"
+    for idx, qa in enumerate(qa_pairs):
+        if not isinstance(qa, dict) or "question" not in qa or "answer" not in qa:
+            return f"qa_pairs[{idx}] must have 'question' and 'answer'"
+        if not isinstance(qa["question"], str) or not isinstance(qa["answer"], str):
+            return f"qa_pairs[{idx}] values must be strings"
+    if not isinstance(current_persona, str) or current_persona not in PERSONA_DESCRIPTIONS:
+        return "current_persona must be one of: " + ", ".join(PERSONA_DESCRIPTIONS.keys())
+    return None
+
+
+def build_prompt(qa_pairs):
+    persona_descs = []
+    for k, v in PERSONA_DESCRIPTIONS.items():
+        persona_descs.append(f"{k}: {v['label']} - {v['description']}")
+    persona_block = "\n".join(persona_descs)
+    answers_block = "\n".join(
+        [f"{i+1}. Q: {qa['question']}\n   A: {qa['answer']}" for i, qa in enumerate(qa_pairs)]
+    )
+    return (
+        "Below are 3 question-answer pairs from a user about their recent crisis or financial situation.\n"
+        "Read each answer and, based on the following 4 persona descriptions, select the single closest persona.\n\n"
+        "[Persona Descriptions]\n"
+        f"{persona_block}\n\n"
+        "[User QA Pairs]\n"
+        f"{answers_block}\n\n"
+        "Reply with ONLY the English code name of the closest persona (one of: HELPER_SEEKER, STRUGGLER, OPTIMIST, APATHETIC). No explanation."
+    )
+
+
+def classify(qa_pairs, current_persona):
+    """
+    검증된 입력 하나를 분류 (llm_gateway 경유, upstream 오류는 그대로 raise).
+    Returns {"persona", "label", "changed"} 또는 모델 답을 해석하지 못하면 {"error", "raw"}.
+    """
+    log.debug("persona classify: calling OpenAI with %d QA pairs", len(qa_pairs))
+    content = llm_gateway.chat(
+        [
+            {"role": "system", "content": "You are an expert persona classifier for financial users."},
+            {"role": "user", "content": build_prompt(qa_pairs)},
+        ],
+        operation="persona",
+    )
+    raw = content.strip().upper()
+    log.debug("persona classify: raw response %r", raw)
+    selected = _normalize_persona_code(raw)
+    if not selected:
+        log.warning("persona classify: could not normalize persona code from %r", raw)
+        return {"error": "Could not classify persona", "raw": raw}
+    changed = (selected != current_persona)
+    log.info("persona classify: selected persona %s, changed=%s", selected, changed)
+    return {
+        "persona": selected,
+        "label": PERSONA_DESCRIPTIONS[selected]["label"],
+        "changed": changed
+    }
+
+
 @persona_bp.route("/api/persona/classify", methods=["POST"])
 def classify_persona():
     """
@@ -54,11 +120,10 @@ def classify_persona():
         "current_persona": str
       }
     Responds: { "persona", "label", "changed" }
+    (여러 사용자를 한 번에 다시 분류할 때는 python -m services.persona_batch)
     """
-    openai_client = current_app.config.get("OPENAI_CLIENT")
-    if openai_client is None:
-        print("[ERROR] /api/persona/classify: OpenAI client is None")
-        print("[DEBUG] Check if SENTIMENT_API_KEY and SENTIMENT_API_URL are set in environment")
+    if not llm_gateway.available():
+        log.error("/api/persona/classify: OpenAI client is not configured (SENTIMENT_API_KEY / SENTIMENT_API_URL)")
         return jsonify({
             "error": "OpenAI client not configured. Please set SENTIMENT_API_KEY and SENTIMENT_API_URL environment variables.",
             "details": "The server could not initialize the OpenAI client. Check server logs for more information."
@@ -70,57 +135,12 @@ def classify_persona():
     qa_pairs = data.get("qa_pairs")
     current_persona = data.get("current_persona")
     # Validate input
-    if not isinstance(qa_pairs, list) or len(qa_pairs) != 3:
-        return jsonify({"error": "qa_pairs must be a list of exactly 3 objects"}), 400
-    for idx, qa in enumerate(qa_pairs):
-        if not isinstance(qa, dict) or "question" not in qa or "answer" not in qa:
-            return jsonify({"error": f"qa_pairs[{idx}] must have 'question' and 'answer'"}), 400
-        if not isinstance(qa["question"], str) or not isinstance(qa["answer"], str):
-            return jsonify({"error": f"qa_pairs[{idx}] values must be strings"}), 400
-    if not isinstance(current_persona, str) or current_persona not in PERSONA_DESCRIPTIONS:
-        return jsonify({"error": "current_persona must be one of: " + ", ".join(PERSONA_DESCRIPTIONS.keys())}), 400
+    error = validate_input(qa_pairs, current_persona)
+    if error:
+        return jsonify({"error": error}), 400
 
-    # Compose prompt
-    persona_descs = []
-    for k, v in PERSONA_DESCRIPTIONS.items():
-        persona_descs.append(f"{k}: {v['label']} - {v['description']}")
-    persona_block = "\n".join(persona_descs)
-    answers_block = "\n".join(
-        [f"{i+1}. Q: {qa['question']}\n   A: {qa['answer']}" for i, qa in enumerate(qa_pairs)]
-    )
-    prompt = (
-        "Below are 3 question-answer pairs from a user about their recent crisis or financial situation.\n"
-        "Read each answer and, based on the following 4 persona descriptions, select the single closest persona.\n\n"
-        "[Persona Descriptions]\n"
-        f"{persona_block}\n\n"
-        "[User QA Pairs]\n"
-        f"{answers_block}\n\n"
-        "Reply with ONLY the English code name of the closest persona (one of: HELPER_SEEKER, STRUGGLER, OPTIMIST, APATHETIC). No explanation."
-    )
     try:
-        print(f"[DEBUG] /api/persona/classify: Calling OpenAI with {len(qa_pairs)} QA pairs")
-        resp = openai_client.chat.completions.create(
-            model="openai/gpt-5",
-            messages=[
-                {"role": "system", "content": "You are an expert persona classifier for financial users."},
-                {"role": "user", "content": prompt},
-            ],
-        )
-        raw = (resp.choices[0].message.content or "").strip().upper()
-        print(f"[DEBUG] /api/persona/classify: OpenAI raw response: {raw}")
-        selected = _normalize_persona_code(raw)
-        if not selected:
-            print(f"[WARNING] /api/persona/classify: Could not normalize persona code from: {raw}")
-            return jsonify({"error": "Could not classify persona", "raw": raw}), 200
-        changed = (selected != current_persona)
-        print(f"[INFO] /api/persona/classify: Selected persona: {selected}, changed: {changed}")
-        return jsonify({
-            "persona": selected,
-            "label": PERSONA_DESCRIPTIONS[selected]["label"],
-            "changed": changed
-        })
+        return jsonify(classify(qa_pairs, current_persona))
     except Exception as e:
-        print(f"[ERROR] /api/persona/classify: Exception occurred: {e}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({"error": str(e), "type": type(e).__name__}), 500
\ No newline at end of file
+        log.exception("/api/persona/classify failed")
+        return jsonify({"error": str(e), "type": type(e).__name__}), 500
@@ -0,0 +1,191 @@
+import logging
+import math
+
+import numpy as np
+from flask import Blueprint, request, jsonify
+
+from backend.quotes import fetch_quotes, normalize_symbols, currency_for
+from backend.risk_metrics import get_metrics as get_risk_metrics
+
+MAX_POSITIONS = 500
+
+log = logging.getLogger(__name__)
+
+# Blueprint definition
+portfolio_bp = Blueprint("portfolio", __name__)
+
+
+def _parse_holdings(raw):
+    """
+    holdings: [ { "symbol": str, "quantity": number, "avg_price": number }, ... ]
+    같은 심볼이 여러 번 오면 수량 가중 평균 단가로 합친다.
+    Returns: (symbols[list], quantity[np], avg_price[np]) or raises ValueError
+    """
+    if not isinstance(raw, list) or not raw:
+        raise ValueError("holdings must be a non-empty list")
+    if len(raw) > MAX_POSITIONS:
+        raise ValueError(f"holdings must have at most {MAX_POSITIONS} positions")
+
+    merged = {}
+    for idx, h in enumerate(raw):
+        if not isinstance(h, dict):
+            raise ValueError(f"holdings[{idx}] must be an object")
+        syms = normalize_symbols([h.get("symbol")])
+        if not syms:
+            raise ValueError(f"holdings[{idx}].symbol is required")
+        try:
+            qty = float(h.get("quantity", 0))
+            avg = float(h.get("avg_price", 0))
+        except (TypeError, ValueError):
+            raise ValueError(f"holdings[{idx}] quantity/avg_price must be numbers")
+        if not (math.isfinite(qty) and math.isfinite(avg)):
+            # float("nan") / float("inf") 는 통과하므로 따로 막는다
+            raise ValueError(f"holdings[{idx}] quantity/avg_price must be finite")
+        if qty <= 0 or avg < 0:
+            continue
+        prev_qty, prev_cost = merged.get(syms[0], (0.0, 0.0))
+        merged[syms[0]] = (prev_qty + qty, prev_cost + qty * avg)
+
+    symbols = list(merged)
+    quantity = np.array([merged[s][0] for s in symbols], dtype=float)
+    cost = np.array([merged[s][1] for s in symbols], dtype=float)
+    avg_price = np.divide(cost, quantity, out=np.zeros_like(cost), where=quantity > 0)
+    return symbols, quantity, avg_price
+
+
+def _pct(num, den):
+    # 포지션이 없으면 np.bincount 가 int 배열을 돌려주므로 float 로 맞춘다
+    num = np.asarray(num, dtype=float)
+    return np.divide(num, den, out=np.zeros_like(num), where=den > 0) * 100
+
+
+def value_portfolio(symbols, quantity, avg_price, quotes, risk=None):
+    """
+    한 번의 벡터 연산으로 포지션별/통화별 평가금액, 손익, 비중, 당일 변동을 계산한다.
+    quotes 에 없는 심볼은 평균단가로 평가하고 quote_missing 으로 표시한다.
+    스냅샷 시세(stale_since 가 있는 quote)를 쓴 포지션에는 stale_since 를 그대로 붙인다.
+    risk({SYMBOL: metrics}) 가 주어지면 포지션별 변동성/beta 와 통화별 가중 beta 를 추가한다.
+    """
+    n = len(symbols)
+    has_quote = np.array([s in quotes for s in symbols], dtype=bool)
+    price = np.array([quotes[s]["price"] if s in quotes else np.nan for s in symbols], dtype=float)
+    prev = np.array([quotes[s]["prev_close"] if s in quotes else np.nan for s in symbols], dtype=float)
+    price = np.where(has_quote, price, avg_price)
+    prev = np.where(has_quote, prev, price)
+
+    market_value = quantity * price
+    cost_basis = quantity * avg_price
+    pnl = market_value - cost_basis
+    pnl_pct = _pct(pnl, cost_basis)
+    day_change = quantity * (price - prev)
+    day_change_pct = _pct(price - prev, prev)
+
+    # 통화별(USD/KRW) 합계: 원화/달러를 섞어서 더하지 않도록 그룹 단위로 집계
+    currencies = np.array([currency_for(s) for s in symbols]) if n else np.array([], dtype=str)
+    groups, inverse = np.unique(currencies, return_inverse=True)
+    g_value = np.bincount(inverse, weights=market_value, minlength=len(groups))
+    g_cost = np.bincount(inverse, weights=cost_basis, minlength=len(groups))
+    g_day = np.bincount(inverse, weights=day_change, minlength=len(groups))
+    weight = _pct(market_value, g_value[inverse]) if n else market_value
+
+    positions = [
+        {
+            "symbol": symbols[i],
+            "currency": str(currencies[i]),
+            "quantity": float(quantity[i]),
+            "avg_price": float(avg_price[i]),
+            "price": float(price[i]),
+            "prev_close": float(prev[i]),
+            "market_value": float(market_value[i]),
+            "cost_basis": float(cost_basis[i]),
+            "pnl": float(pnl[i]),
+            "pnl_pct": float(pnl_pct[i]),
+            "weight_pct": float(weight[i]),
+            "day_change": float(day_change[i]),
+            "day_change_pct": float(day_change_pct[i]),
+            "quote_missing": bool(not has_quote[i]),
+        }
+        for i in range(n)
+    ]
+    for pos in positions:
+        # upstream 장애로 스냅샷 시세를 쓴 포지션
+        stale = quotes.get(pos["symbol"], {}).get("stale_since")
+        if stale:
+            pos["stale_since"] = stale
+
+    g_beta = None
+    if risk is not None:
+        beta = np.array([
+            risk[s]["beta"] if s in risk and risk[s]["beta"] is not None else np.nan
+            for s in symbols
+        ], dtype=float)
+        has_beta = ~np.isnan(beta)
+        # beta 가 있는 포지션만으로 통화별 가중 평균
+        bw = np.bincount(inverse, weights=np.where(has_beta, market_value, 0.0), minlength=len(groups))
+        bsum = np.bincount(inverse, weights=np.where(has_beta, market_value * beta, 0.0), minlength=len(groups))
+        g_beta = np.divide(bsum, bw, out=np.full(len(groups), np.nan), where=bw > 0)
+        for i, pos in enumerate(positions):
+            m = risk.get(symbols[i]) or {}
+            pos["volatility"] = m.get("volatility")
+            pos["volatility_annual"] = m.get("volatility_annual")
+            pos["beta"] = m.get("beta")
+
+    g_pnl = g_value - g_cost
+    g_pnl_pct = _pct(g_pnl, g_cost)
+    g_day_pct = _pct(g_day, g_value - g_day)
+    totals = {
+        str(cur): {
+            "market_value": float(g_value[gi]),
+            "cost_basis": float(g_cost[gi]),
+            "pnl": float(g_pnl[gi]),
+            "pnl_pct": float(g_pnl_pct[gi]),
+            "day_change": float(g_day[gi]),
+            "day_change_pct": float(g_day_pct[gi]),
+        }
+        for gi, cur in enumerate(groups)
+    }
+    if g_beta is not None:
+        for gi, cur in enumerate(groups):
+            totals[str(cur)]["beta"] = float(g_beta[gi]) if np.isfinite(g_beta[gi]) else None
+    return {"positions": positions, "totals": totals}
+
+
+@portfolio_bp.route("/api/portfolio/valuation", methods=["POST"])
+def portfolio_valuation():
+    """
+    POST endpoint to value a whole portfolio with one bulk quote lookup.
+    Expects JSON:
+      { "holdings": [ { "symbol": str, "quantity": number, "avg_price": number }, ... ],
+        "include_risk": bool }   # optional: add volatility / beta per position and per currency
+    Responds:
+      { "positions": [ {symbol, currency, quantity, avg_price, price, market_value, pnl, pnl_pct,
+                        weight_pct, day_change, day_change_pct, quote_missing, ...}, ... ],
+        "totals": { "USD": {...}, "KRW": {...} } }
+    """
+    try:
+        data = request.get_json(force=True) or {}
+    except Exception:
+        return jsonify({"error": "Invalid JSON"}), 400
+    if not isinstance(data, dict):
+        return jsonify({"error": "body must be a JSON object"}), 400
+    try:
+        symbols, quantity, avg_price = _parse_holdings(data.get("holdings"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        quotes = fetch_quotes(symbols) if symbols else {}
+    except Exception as e:
+        # 시세 조회가 실패해도 평균단가 기준으로 응답은 돌려준다
+        log.warning("/api/portfolio/valuation quote error: %s", e)
+        quotes = {}
+
+    risk = None
+    if data.get("include_risk"):
+        try:
+            risk = get_risk_metrics(symbols) if symbols else {}
+        except Exception as e:
+            log.warning("/api/portfolio/valuation risk metrics error: %s", e)
+            risk = {}
+
+    return jsonify(value_portfolio(symbols, quantity, avg_price, quotes, risk))
@@ -0,0 +1,66 @@
+import json
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+
+from backend.quote_stream import hub, stream_updates, MAX_STREAM_SYMBOLS, StreamCapacityExceeded
+
+# Blueprint definition
+quote_stream_bp = Blueprint("quote_stream", __name__)
+
+
+@quote_stream_bp.route("/api/quotes/stream", methods=["GET"])
+def quotes_stream():
+    """
+    Server-Sent Events stream of live quotes.
+    GET /api/quotes/stream?symbols=AAPL,TSLA,005930.KS
+    Events:
+      event: quotes
+      data: { "SYMBOL": { "symbol", "price", "prev_close", "change_pct" }, ... }   # changed symbols only
+    A ": keepalive" comment is sent every 15s so proxies keep the connection open.
+    Each open stream holds a worker thread, so past QUOTE_STREAM_MAX_SUBSCRIBERS streams per worker
+    this returns 503 + Retry-After and the client falls back to polling /api/quote.
+    """
+    raw = request.args.get("symbols", "")
+    symbols = [s for s in raw.split(",") if s.strip()]
+    if not symbols:
+        return jsonify({"error": "no symbols"}), 400
+    if len(symbols) > MAX_STREAM_SYMBOLS:
+        return jsonify({"error": f"at most {MAX_STREAM_SYMBOLS} symbols per stream"}), 400
+
+    try:
+        sub = hub.subscribe(symbols)
+    except StreamCapacityExceeded as e:
+        resp = jsonify({"error": "too many open streams, poll /api/quote instead", "detail": str(e)})
+        resp.headers["Retry-After"] = "30"
+        return resp, 503
+
+    def generate():
+        try:
+            # 재접속 간격 힌트 (ms)
+            yield "retry: 5000\n\n"
+            for update in stream_updates(sub):
+                if update is None:
+                    yield ": keepalive\n\n"
+                else:
+                    yield f"event: quotes\ndata: {json.dumps(update)}\n\n"
+        finally:
+            # 클라이언트 연결이 끊기면 GeneratorExit 로 여기 도달
+            hub.unsubscribe(sub)
+
+    resp = Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # nginx 등에서 버퍼링하지 않도록
+        },
+    )
+    # generator 가 한 번도 돌지 않고 응답이 닫히면 finally 가 없으므로 여기서도 구독 해제 (중복 해제는 무시됨)
+    resp.call_on_close(lambda: hub.unsubscribe(sub))
+    return resp
+
+
+@quote_stream_bp.route("/api/quotes/stream/stats", methods=["GET"])
+def quotes_stream_stats():
+    """구독자 수 / distinct 심볼 수 / 폴링 횟수."""
+    return jsonify(hub.stats())
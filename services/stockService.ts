@@ -151,3 +151,57 @@ export async function searchNasdaqStocks(query: string): Promise<Stock[]> {
 }
 
 
+
+// --- 실시간 시세 스트림 (SSE): 서버가 distinct 심볼만 한 번씩 조회해서 모든 구독자에게 전달
+// 스트림을 쓸 수 없는 환경(별도 백엔드 없는 dev, Vercel 함수만 있는 배포)에서는 onError 가 호출되며
+// 호출하는 쪽에서 기존 폴링으로 fallback 하면 된다.
+export function subscribeQuotes(
+  symbols: string[],
+  onUpdate: (quotes: Record<string, { price: number; change_pct: number }>) => void,
+  onError: () => void
+): () => void {
+  const hasExternalBackend =
+    typeof API_BASE_URL === "string" && API_BASE_URL.trim().length > 0;
+  if (
+    symbols.length === 0 ||
+    typeof EventSource === "undefined" ||
+    (!hasExternalBackend && import.meta.env.DEV)
+  ) {
+    onError();
+    return () => {};
+  }
+
+  const url = apiUrl(
+    `/api/quotes/stream?symbols=${encodeURIComponent(symbols.join(","))}`
+  );
+  const source = new EventSource(url);
+  let receivedAny = false;
+
+  source.addEventListener("quotes", (ev) => {
+    receivedAny = true;
+    try {
+      const data = JSON.parse((ev as MessageEvent).data || "{}");
+      const quotes: Record<string, { price: number; change_pct: number }> = {};
+      for (const [symbol, q] of Object.entries<any>(data)) {
+        if (q && q.price > 0) {
+          quotes[symbol] = { price: q.price, change_pct: q.change_pct || 0 };
+        }
+      }
+      onUpdate(quotes);
+    } catch (err) {
+      console.warn("[yfinance] Failed to parse quote stream event:", err);
+    }
+  });
+
+  source.onerror = () => {
+    // 한 번도 데이터를 못 받았으면 스트림 미지원으로 보고 종료 → 폴링 fallback
+    // (데이터를 받은 뒤의 끊김은 EventSource 가 retry 간격에 맞춰 자동 재접속)
+    // 재접속이 503 (서버 스트림 한도) 등으로 실패하면 EventSource 가 CLOSED 로 끝나므로 그때도 폴링으로
+    if (!receivedAny || source.readyState === EventSource.CLOSED) {
+      source.close();
+      onError();
+    }
+  };
+
+  return () => source.close();
+}
@@ -0,0 +1,17 @@
+# tests/conftest.py
+"""
+네트워크 없이 도는 단위 테스트 공통 설정.
+스냅샷 / 히스토리 / 상태 파일은 저장소의 data/ 대신 임시 디렉터리에 쓴다 (모듈 상수가 import 시점에 읽으므로 먼저 설정).
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+_DATA_DIR = tempfile.mkdtemp(prefix="stock-tests-")
+os.environ.setdefault("SNAPSHOT_DIR", os.path.join(_DATA_DIR, "snapshots"))
+os.environ.setdefault("HISTORY_DIR", os.path.join(_DATA_DIR, "history"))
+os.environ.setdefault("YAHOO_RATE_STATE", os.path.join(_DATA_DIR, "yahoo-rate-limit.state"))
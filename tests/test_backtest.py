@@ -0,0 +1,30 @@
+import pytest
+from flask import Flask
+
+from services import backtest
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(backtest.backtest_engine, "backtest",
+                        lambda *a, **kw: pytest.fail("invalid request reached the engine"))
+    app = Flask(__name__)
+    app.register_blueprint(backtest.backtest_bp)
+    return app.test_client()
+
+
+@pytest.mark.parametrize("body", [
+    "[]",
+    '"AAPL"',
+    '{"symbols": ["AAPL", "MSFT"], "weights": [NaN, 1]}',
+    '{"symbols": ["AAPL", "MSFT"], "weights": [Infinity, 1]}',
+    '{"symbols": ["AAPL", "MSFT"], "weights": [true, 1]}',
+    '{"symbols": ["AAPL"], "initial_capital": 0}',
+    '{"symbols": ["AAPL"], "initial_capital": -5}',
+    '{"symbols": ["AAPL"], "initial_capital": NaN}',
+    '{"symbols": ["AAPL"], "initial_capital": true}',
+])
+def test_rejects_invalid_body(client, body):
+    resp = client.post("/api/backtest", data=body, content_type="application/json")
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
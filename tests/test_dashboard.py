@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+import yfinance_api as api
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, "_dashboard_pools", {})
+    monkeypatch.setattr(api, "_dashboard_inflight", {})
+    monkeypatch.setattr(api, "DASHBOARD_TIMEOUTS", dict(api.DASHBOARD_TIMEOUTS, quotes=1.0, news=1.0,
+                                                         learning=0.2, quizzes=1.0))
+    return api.app.test_client()
+
+
+def _drain():
+    deadline = time.monotonic() + 2
+    while api._dashboard_inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_sections_report_status_and_timeout(client, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def fake_section(name, symbols, count, seed):
+        calls.append(name)
+        if name == "learning":
+            release.wait(5)
+            return 200, {"cards": []}
+        if name == "news":
+            return 500, {"error": "boom"}
+        if name == "quizzes":
+            return 200, {"quizzes": [], "stale": True, "stale_since": "2024-01-01T00:00:00+00:00"}
+        return 200, {"quotes": {"AAPL": {"price": 1.0}}, "missing": []}
+
+    monkeypatch.setattr(api, "_fetch_dashboard_section", fake_section)
+    try:
+        body = client.get("/api/dashboard?symbols=AAPL").get_json()
+        sections = body["sections"]
+        assert sections["quotes"]["status"] == "ok"
+        assert sections["news"]["status"] == "error"
+        assert sections["quizzes"]["status"] == "stale"
+        assert sections["learning"]["status"] == "timeout"
+
+        # 시간을 넘긴 learning 호출이 아직 돌고 있으면 같은 (count, seed) 요청은 새로 제출하지 않는다
+        body = client.get("/api/dashboard?sections=learning").get_json()
+        assert body["sections"]["learning"]["status"] == "timeout"
+        assert calls.count("learning") == 1
+    finally:
+        release.set()
+
+    _drain()
+    body = client.get("/api/dashboard?sections=learning").get_json()
+    assert body["sections"]["learning"]["status"] == "ok"
+    assert calls.count("learning") == 2
+
+
+def test_full_section_pool_reports_busy(client, monkeypatch):
+    monkeypatch.setitem(api._dashboard_slots, "learning", threading.BoundedSemaphore(1))
+    release = threading.Event()
+
+    def fake_section(name, symbols, count, seed):
+        release.wait(5)
+        return 200, {"cards": []}
+
+    monkeypatch.setattr(api, "_fetch_dashboard_section", fake_section)
+    try:
+        first = client.get("/api/dashboard?sections=learning&seed=1").get_json()
+        assert first["sections"]["learning"]["status"] == "timeout"
+        other = client.get("/api/dashboard?sections=learning&seed=2").get_json()
+        assert other["sections"]["learning"]["status"] == "busy"
+    finally:
+        release.set()
+        _drain()  # 완료 콜백이 이 테스트의 semaphore 를 돌려놓을 때까지
+
+
+def test_bad_arguments(client):
+    assert client.get("/api/dashboard?sections=nope").status_code == 400
+    assert client.get("/api/dashboard?count=x").status_code == 400
@@ -0,0 +1,120 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import history_store
+
+
+@pytest.fixture(autouse=True)
+def history_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(history_store, "HISTORY_DIR", str(tmp_path))
+
+
+def _bars(start, n):
+    idx = pd.date_range(start, periods=n, freq="D", tz="UTC")
+    close = np.arange(n, dtype=float) + 100
+    return idx.asi8 // 10 ** 9, {c: close.copy() for c in history_store.COLUMNS}
+
+
+@pytest.mark.parametrize("symbol", ["AAPL", "005930.KS", "^GSPC", "BRK-B", "EURUSD=X"])
+def test_valid_symbols(symbol):
+    assert history_store.valid_symbol(symbol)
+
+
+@pytest.mark.parametrize("symbol", ["", ".", "..", "../etc", "A/B", "a b", "X" * 16])
+def test_invalid_symbols_rejected(symbol):
+    assert not history_store.valid_symbol(symbol)
+    with pytest.raises(ValueError):
+        history_store._symbol_dir(symbol, "1d")
+
+
+def test_update_replaces_last_bar_and_appends(monkeypatch):
+    fetches = []
+
+    def fake_fetch(symbol, interval, start_ts=None):
+        fetches.append(start_ts)
+        if start_ts is None:
+            return _bars("2024-01-01", 5)
+        ts, cols = _bars("2024-01-05", 3)  # 마지막 저장 bar (01-05) 부터
+        cols["close"] = cols["close"] + 50
+        return ts, cols
+
+    monkeypatch.setattr(history_store, "_fetch", fake_fetch)
+    assert history_store.update("AAPL") == 5
+    before = history_store.load("AAPL")
+    reader_close = before["close"]  # 교체 전에 열어 둔 memmap
+    assert history_store.update("AAPL") == 7
+    after = history_store.load("AAPL")
+    assert after["close"].tolist() == [100, 101, 102, 103, 150, 151, 152]
+    assert np.all(np.diff(after["ts"]) > 0)
+    # 예전 reader 는 예전 파일을 계속 본다
+    assert reader_close.tolist() == [100, 101, 102, 103, 104]
+    assert fetches[1] == int(before["ts"][-1])
+
+
+def test_ensure_rechecks_after_lock(monkeypatch):
+    calls = []
+    gate = threading.Event()
+
+    def fake_fetch(symbol, interval, start_ts=None):
+        calls.append(start_ts)
+        gate.wait(2)
+        return _bars("2024-01-01", 3)
+
+    monkeypatch.setattr(history_store, "_fetch", fake_fetch)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(history_store.ensure("MSFT"))) for _ in range(4)]
+    for t in threads:
+        t.start()
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert sorted(results) == [False, False, False, True]
+
+
+def _no_data_ticker(calls):
+    class Ticker:
+        def __init__(self, symbol):
+            self.symbol = symbol
+
+        def history(self, **kwargs):
+            import logging
+
+            calls.append(self.symbol)
+            logging.getLogger("yfinance").error(f"${self.symbol}: possibly delisted; no price data found  (period=10y)")
+            return pd.DataFrame()
+    return Ticker
+
+
+def test_unknown_symbol_backfill_leaves_nothing_and_is_cached(monkeypatch, tmp_path):
+    import yfinance as yf
+
+    from backend import negative_cache, rate_limit
+
+    monkeypatch.setattr(negative_cache, "_bad_symbols", negative_cache.TTLCache(ttl=300, name="neg-test"))
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: 0.0)
+    calls = []
+    monkeypatch.setattr(yf, "Ticker", _no_data_ticker(calls))
+
+    assert history_store.ensure("NOSUCH1") is True
+    assert history_store.last_timestamp("NOSUCH1") is None
+    assert not (tmp_path / "1d" / "NOSUCH1").exists()
+    assert negative_cache.is_known_bad("NOSUCH1")
+
+    # 두 번째 요청은 upstream 도, 디렉터리도 없이 끝난다
+    assert history_store.ensure("NOSUCH1") is False
+    assert calls == ["NOSUCH1"]
+    assert not (tmp_path / "1d" / "NOSUCH1").exists()
+
+
+def test_failed_backfill_removes_directory(monkeypatch, tmp_path):
+    def failing_fetch(symbol, interval, start_ts=None):
+        raise RuntimeError("connection reset")
+
+    monkeypatch.setattr(history_store, "_fetch", failing_fetch)
+    with pytest.raises(RuntimeError):
+        history_store.ensure("AAPL")
+    assert not (tmp_path / "1d" / "AAPL").exists()
@@ -0,0 +1,88 @@
+from flask import Flask
+
+from backend import http_cache
+from backend.http_cache import json_response
+
+
+def _app(calls):
+    app = Flask(__name__)
+    http_cache.init_app(app)
+
+    @app.route("/news")
+    def news():
+        calls.append(1)
+        return json_response({"news": ["x" * 2000]}, max_age=60)
+
+    @app.route("/nocache")
+    def nocache():
+        calls.append(1)
+        return json_response({"ok": True})
+
+    return app
+
+
+def test_etag_304_roundtrip_and_precheck(monkeypatch):
+    monkeypatch.setattr(http_cache, "_recent_etags", http_cache.TTLCache(ttl=60, name="etags-test"))
+    calls = []
+    client = _app(calls).test_client()
+
+    first = client.get("/news?symbols=AAPL", headers={"Accept-Encoding": "gzip"})
+    assert first.status_code == 200
+    assert first.headers["Content-Encoding"] == "gzip"
+    etag = first.headers["ETag"]
+    assert etag.startswith('W/"')  # 압축본은 weak
+    assert first.headers["Cache-Control"] == "public, max-age=60"
+
+    again = client.get("/news?symbols=AAPL", headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.data == b""
+    assert again.headers["Cache-Control"] == "public, max-age=60"
+    assert len(calls) == 1  # max-age 안의 같은 ETag 는 handler 를 다시 돌리지 않음
+
+    # 다른 query 는 따로
+    other = client.get("/news?symbols=MSFT", headers={"If-None-Match": etag})
+    assert other.status_code == 304  # 내용이 같으니 after_request 에서 304
+    assert len(calls) == 2
+
+    stale = client.get("/news?symbols=AAPL", headers={"If-None-Match": '"nope"'})
+    assert stale.status_code == 200
+    assert len(calls) == 3
+
+
+def test_no_max_age_always_runs_handler(monkeypatch):
+    monkeypatch.setattr(http_cache, "_recent_etags", http_cache.TTLCache(ttl=60, name="etags-test"))
+    calls = []
+    client = _app(calls).test_client()
+    etag = client.get("/nocache").headers["ETag"]
+    resp = client.get("/nocache", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert len(calls) == 2
+
+
+def test_precheck_304_still_counted_by_metrics(monkeypatch):
+    from types import SimpleNamespace
+
+    import pandas as pd
+    from prometheus_client import REGISTRY
+
+    import yfinance_api as api
+    from backend import rate_limit
+
+    class Ticker:
+        def __init__(self, symbol):
+            pass
+
+        def history(self, **kwargs):
+            return pd.DataFrame({"Close": [1.0, 2.0]}, index=pd.date_range("2024-01-02", periods=2))
+
+    monkeypatch.setattr(http_cache, "_recent_etags", http_cache.TTLCache(ttl=60, name="etags-test"))
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: 0.0)
+    monkeypatch.setattr(api, "yf", SimpleNamespace(Ticker=Ticker))
+    labels = {"route": "/api/quote", "method": "GET", "status": "304"}
+    before = REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0
+
+    client = api.app.test_client()
+    etag = client.get("/api/quote?symbol=ETAGTEST").headers["ETag"]
+    assert client.get("/api/quote?symbol=ETAGTEST", headers={"If-None-Match": etag}).status_code == 304
+    assert REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) == before + 1
+    assert REGISTRY.get_sample_value("http_requests_in_flight", {"route": "/api/quote"}) == 0
@@ -0,0 +1,31 @@
+from backend.json_stream import ArrayStreamParser, salvage_array
+
+
+def test_items_come_out_as_they_close():
+    parser = ArrayStreamParser()
+    assert parser.feed('```json\n[{"a": 1}, {"b": "x, ]') == [{"a": 1}]
+    assert parser.feed('y"}, {"c": [1, 2]}') == [{"b": "x, ]y"}]
+    assert parser.feed("]\n```") == [{"c": [1, 2]}]
+    assert parser.done and not parser.pending and parser.broken == 0
+
+
+def test_truncated_output_drops_only_the_last_item():
+    parser = ArrayStreamParser()
+    items = parser.feed('[{"q": "one"}, {"q": "two"}, {"q": "thr')
+    assert items == [{"q": "one"}, {"q": "two"}]
+    assert parser.pending and not parser.done
+
+
+def test_broken_item_is_skipped():
+    text = '[{"q": 1}, {"q": 2,,}, {"q": 3}]'
+    assert salvage_array(text) == [{"q": 1}, {"q": 3}]
+    parser = ArrayStreamParser()
+    parser.feed(text)
+    assert parser.broken == 1
+
+
+def test_salvage_without_array():
+    assert salvage_array("sorry, I can't") == []
+    assert salvage_array("") == []
+    assert salvage_array(None) == []
+    assert salvage_array("[]") == []
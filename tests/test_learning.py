@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+import yfinance_api as api
+from backend import llm_gateway, snapshots
+
+
+def _card(i):
+    return {"title": f"Card {i}", "content": "body", "duration": "3 min", "category": "Basic Term"}
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(snapshots, "learning", snapshots.SnapshotStore("learning"))
+    monkeypatch.setattr(llm_gateway, "available", lambda: True)
+    return api.app.test_client()
+
+
+def _streaming(content):
+    def stream(prompt, parser=None):
+        yield from parser.feed(content)
+    return stream
+
+
+def test_salvaged_cards_are_served_but_not_snapshotted(client, monkeypatch):
+    monkeypatch.setattr(api, "call_openai_json", lambda prompt, max_tokens=800: [_card(1), _card(2)])
+    body = client.get("/api/dashboard-learning?count=3&seed=7").get_json()
+    assert len(body["cards"]) == 2
+    assert snapshots.learning.get("cards:3:7") is None
+
+    monkeypatch.setattr(api, "call_openai_json", lambda prompt, max_tokens=800: [_card(i) for i in range(3)])
+    client.get("/api/dashboard-learning?count=3&seed=7")
+    assert len(snapshots.learning.get("cards:3:7")[0]) == 3
+
+
+def test_truncated_stream_is_not_snapshotted(client, monkeypatch):
+    truncated = json.dumps([_card(i) for i in range(3)])[:-40]
+    monkeypatch.setattr(api, "stream_openai_json_array", _streaming(truncated))
+    lines = client.get("/api/dashboard-learning?count=2&seed=1&stream=1").get_data(as_text=True).splitlines()
+    assert json.loads(lines[-1]) == {"done": True, "count": 2}
+    assert snapshots.learning.get("cards:2:1") is None
+
+    monkeypatch.setattr(api, "stream_openai_json_array", _streaming(json.dumps([_card(i) for i in range(2)])))
+    client.get("/api/dashboard-learning?count=2&seed=1&stream=1").get_data()
+    assert len(snapshots.learning.get("cards:2:1")[0]) == 2
+
+
+def test_stream_with_broken_quiz_is_not_snapshotted(client, monkeypatch):
+    quiz = {"question": "Q", "options": ["a", "b", "c", "d"], "correctIndex": 1, "explanation": "e"}
+    content = "[" + json.dumps(quiz) + ", {\"question\": oops}, " + json.dumps(quiz) + "]"
+    monkeypatch.setattr(api, "stream_openai_json_array", _streaming(content))
+    client.get("/api/dashboard-quizzes?count=2&seed=3&stream=1").get_data()
+    assert snapshots.learning.get("quizzes:2:3") is None
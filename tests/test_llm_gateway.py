@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from backend import llm_gateway
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    calls = []
+    replies = []
+
+    def fake_call(model, messages, params, operation):
+        calls.append(operation)
+        return replies.pop(0) if replies else "[1, 2]"
+
+    monkeypatch.setattr(llm_gateway, "_call_upstream", fake_call)
+    monkeypatch.setattr(llm_gateway, "_cache", llm_gateway.TTLCache(ttl=60, name="llm-test"))
+    return calls, replies
+
+
+MESSAGES = [{"role": "user", "content": "cards please"}]
+
+
+def test_parse_is_part_of_the_key(upstream):
+    calls, _ = upstream
+    raw = llm_gateway.chat(MESSAGES)
+    parsed = llm_gateway.chat(MESSAGES, parse=json.loads)
+    assert raw == "[1, 2]"
+    assert parsed == [1, 2]
+    assert len(calls) == 2
+    assert llm_gateway.chat(MESSAGES, parse=json.loads) == [1, 2]
+    assert len(calls) == 2  # 같은 parse 는 캐시 hit
+
+
+def test_partial_results_are_not_cached(upstream):
+    calls, replies = upstream
+    replies.extend(["[1, 2, {broken", "[1, 2, 3]"])
+
+    def parse(content):
+        try:
+            return json.loads(content)
+        except ValueError:
+            return llm_gateway.Partial([1, 2])
+
+    assert llm_gateway.chat(MESSAGES, parse=parse) == [1, 2]
+    assert llm_gateway.chat(MESSAGES, parse=parse) == [1, 2, 3]
+    assert llm_gateway.chat(MESSAGES, parse=parse) == [1, 2, 3]
+    assert len(calls) == 2
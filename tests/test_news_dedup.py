@@ -0,0 +1,38 @@
+from backend import news_dedup
+
+
+def test_cluster_indices_groups_headline_variants():
+    texts = [
+        "Apple shares rise after strong iPhone sales beat estimates in the holiday quarter",
+        "Fed holds interest rates steady and signals two cuts later this year",
+        "Apple shares rise after strong iPhone sales beat estimates in holiday quarter - Reuters",
+        "",
+        "Tesla recalls 200,000 vehicles over rear camera software issue",
+    ]
+    assert news_dedup.cluster_indices(texts) == [[0, 2], [1], [3], [4]]
+
+
+def test_cluster_indices_threshold_one_needs_identical_tokens():
+    texts = ["Samsung Electronics quarterly profit jumps", "Samsung Electronics quarterly profit jumps sharply"]
+    assert news_dedup.cluster_indices(texts, threshold=1.0) == [[0], [1]]
+    assert news_dedup.cluster_indices([texts[0], texts[0].upper()], threshold=1.0) == [[0, 1]]
+
+
+def test_signature_is_deterministic_and_none_for_empty():
+    tokens = news_dedup.shingles("The Fed holds rates")
+    assert "fed holds" in tokens and "the" not in tokens
+    assert (news_dedup.signature(tokens) == news_dedup.signature(set(tokens))).all()
+    assert news_dedup.signature(set()) is None
+
+
+def test_merge_keeps_first_and_unions_symbols():
+    articles = [
+        {"title": "Apple shares rise after strong iPhone sales beat estimates", "summary": "",
+         "related_symbols": ["AAPL"]},
+        {"title": "Apple shares rise after strong iPhone sales beat estimates", "summary": "",
+         "related_symbols": ["QQQ", "AAPL"]},
+        {"title": "Oil falls as OPEC output climbs", "summary": "", "related_symbols": ["XOM"]},
+    ]
+    merged = news_dedup.merge_near_duplicates(articles)
+    assert [a["related_symbols"] for a in merged] == [["AAPL", "QQQ"], ["XOM"]]
+    assert merged[0] is articles[0]
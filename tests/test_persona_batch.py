@@ -0,0 +1,74 @@
+import json
+
+import pytest
+
+from services import persona_batch
+
+QA = [{"question": f"q{i}", "answer": f"a{i}"} for i in range(3)]
+
+
+def _write_users(path, user_ids):
+    with open(path, "w", encoding="utf-8") as f:
+        for uid in user_ids:
+            f.write(json.dumps({"user_id": uid, "qa_pairs": QA, "current_persona": "OPTIMIST"}) + "\n")
+
+
+def _rows(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.fixture
+def classified(monkeypatch):
+    seen = []
+
+    def fake_classify(qa_pairs, current_persona):
+        seen.append(current_persona)
+        return {"persona": "STRUGGLER", "label": "Solo Struggler", "changed": True}
+
+    monkeypatch.setattr(persona_batch.llm_gateway, "available", lambda: True)
+    monkeypatch.setattr(persona_batch, "classify", fake_classify)
+    return seen
+
+
+def test_resume_skips_completed_and_retries_errors(tmp_path, classified):
+    src, out = tmp_path / "users.jsonl", tmp_path / "out.jsonl"
+    _write_users(src, ["u1", "u2", "u3", "u2"])
+    # 지난 실행: u1 완료, u2 는 error, 마지막 줄은 쓰다 끊김
+    out.write_text(
+        json.dumps({"user_id": "u1", "persona": "OPTIMIST"}) + "\n"
+        + json.dumps({"user_id": "u2", "error": "LLMBusy"}) + "\n"
+        + '{"user_id": "u3", "pers',
+        encoding="utf-8",
+    )
+    assert persona_batch.completed_ids(out) == {"u1"}
+
+    summary = persona_batch.run(src, out, concurrency=2)
+    assert summary["classified"] == 2  # u2 (재시도), u3
+    assert summary["skipped"] == 2  # 완료된 u1 + 입력에 두 번 나온 u2
+    assert len(classified) == 2
+
+    lines = out.read_text(encoding="utf-8").splitlines()
+    assert lines[2] == '{"user_id": "u3", "pers'  # 끊긴 줄 뒤에 줄바꿈을 넣고 이어 쓴다
+    new = [json.loads(line) for line in lines[3:]]
+    assert sorted(r["user_id"] for r in new) == ["u2", "u3"]
+    assert persona_batch.completed_ids(out) == {"u1", "u2", "u3"}
+
+    again = persona_batch.run(src, out, concurrency=2)
+    assert again["classified"] == 0 and again["skipped"] == 4
+
+
+def test_invalid_lines_are_reported(tmp_path, classified):
+    src, out = tmp_path / "users.jsonl", tmp_path / "out.jsonl"
+    src.write_text(
+        "not json\n"
+        + json.dumps({"qa_pairs": QA}) + "\n"
+        + json.dumps({"user_id": "u9", "qa_pairs": QA[:2], "current_persona": "OPTIMIST"}) + "\n",
+        encoding="utf-8",
+    )
+    summary = persona_batch.run(src, out, concurrency=1)
+    assert summary["errors"] == 3
+    rows = _rows(out)
+    assert [r.get("line") for r in rows if "line" in r] == [1, 2]
+    assert any(r.get("user_id") == "u9" and "qa_pairs" in r["error"] for r in rows)
+    assert classified == []
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from services import portfolio
+
+
+def test_parse_holdings_merges_and_rejects_non_finite():
+    symbols, qty, avg = portfolio._parse_holdings([
+        {"symbol": "aapl", "quantity": 1, "avg_price": 100},
+        {"symbol": "AAPL", "quantity": 3, "avg_price": 200},
+        {"symbol": "MSFT", "quantity": 0, "avg_price": 10},  # 수량 0 은 무시
+    ])
+    assert symbols == ["AAPL"]
+    assert qty.tolist() == [4.0]
+    assert avg.tolist() == [175.0]
+    for bad in ("nan", "inf", float("-inf")):
+        with pytest.raises(ValueError, match="finite"):
+            portfolio._parse_holdings([{"symbol": "AAPL", "quantity": bad, "avg_price": 1}])
+    with pytest.raises(ValueError):
+        portfolio._parse_holdings([{"symbol": "AAPL", "quantity": "x", "avg_price": 1}])
+
+
+def test_value_portfolio_totals_per_currency_and_beta():
+    symbols = ["AAPL", "005930.KS", "MSFT", "NOQ"]
+    qty = np.array([10.0, 5.0, 10.0, 2.0])
+    avg = np.array([100.0, 70000.0, 200.0, 50.0])
+    quotes = {
+        "AAPL": {"price": 110.0, "prev_close": 100.0},
+        "005930.KS": {"price": 80000.0, "prev_close": 80000.0, "stale_since": "2024-01-01T00:00:00+00:00"},
+        "MSFT": {"price": 300.0, "prev_close": 300.0},
+    }
+    risk = {"AAPL": {"beta": 1.0}, "MSFT": {"beta": 2.0}, "005930.KS": {"beta": None}}
+    out = portfolio.value_portfolio(symbols, qty, avg, quotes, risk)
+
+    usd = out["totals"]["USD"]
+    # AAPL 1100 + MSFT 3000 + NOQ(시세 없음, 평균단가) 100
+    assert usd["market_value"] == pytest.approx(4200.0)
+    assert usd["cost_basis"] == pytest.approx(3100.0)
+    assert usd["day_change"] == pytest.approx(100.0)
+    # beta 가 있는 포지션만 가중: (1100*1 + 3000*2) / 4100
+    assert usd["beta"] == pytest.approx(7100.0 / 4100.0)
+    krw = out["totals"]["KRW"]
+    assert krw["market_value"] == pytest.approx(400000.0)
+    assert krw["beta"] is None
+
+    pos = {p["symbol"]: p for p in out["positions"]}
+    assert pos["NOQ"]["quote_missing"] and pos["NOQ"]["price"] == 50.0
+    assert pos["005930.KS"]["stale_since"] == "2024-01-01T00:00:00+00:00"
+    assert pos["005930.KS"]["weight_pct"] == pytest.approx(100.0)
+    assert pos["AAPL"]["day_change_pct"] == pytest.approx(10.0)
+
+
+def test_value_portfolio_empty():
+    out = portfolio.value_portfolio([], np.array([]), np.array([]), {})
+    assert out == {"positions": [], "totals": {}}
+
+
+@pytest.mark.parametrize("body", ["[]", '"x"', "3", "not json"])
+def test_valuation_rejects_non_object_body(body):
+    from flask import Flask
+
+    app = Flask(__name__)
+    app.register_blueprint(portfolio.portfolio_bp)
+    resp = app.test_client().post("/api/portfolio/valuation", data=body, content_type="application/json")
+    assert resp.status_code == 400
@@ -0,0 +1,43 @@
+import threading
+
+from flask import Flask
+
+from backend.profiling import Profiler
+
+
+class _GatedLock:
+    """sampler 스레드만 gate 가 열릴 때까지 잠금 앞에서 멈추게 한다 (샘플링 도중인 상태를 재현)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.gate = threading.Event()
+        self.waiting = threading.Event()
+
+    def __enter__(self):
+        if threading.current_thread().name == "profiler-sampler" and not self.gate.is_set():
+            self.waiting.set()
+            self.gate.wait(5)
+        return self._lock.__enter__()
+
+    def __exit__(self, *exc):
+        return self._lock.__exit__(*exc)
+
+
+def test_reenable_while_sampling_keeps_one_sampler(tmp_path):
+    profiler = Profiler(interval=0.01, out_dir=str(tmp_path))
+    profiler._app = Flask(__name__)
+    profiler._lock = _GatedLock()
+
+    profiler.configure(sample_rate=1.0)
+    first = profiler._sampler
+    assert profiler._lock.waiting.wait(2)  # 첫 sampler 가 샘플링 도중
+    profiler.configure(sample_rate=0.0)
+    profiler.configure(sample_rate=1.0)
+    profiler._lock.gate.set()
+
+    first.join(2)
+    assert not first.is_alive()
+    assert profiler._sampler is not first and profiler._sampler.is_alive()
+    profiler.configure(sample_rate=0.0)
+    profiler._sampler.join(2)
+    assert not profiler._sampler.is_alive()
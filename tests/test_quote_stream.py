@@ -0,0 +1,35 @@
+import pytest
+
+from backend.quote_stream import QuoteHub, StreamCapacityExceeded
+
+
+def test_subscriber_cap_rejects_then_frees():
+    hub = QuoteHub(interval=3600, fetch=lambda symbols, fresh=False: {}, max_subscribers=2)
+    a = hub.subscribe(["AAPL"])
+    hub.subscribe(["MSFT"])
+    with pytest.raises(StreamCapacityExceeded):
+        hub.subscribe(["TSLA"])
+    assert hub.stats()["rejected"] == 1
+    hub.unsubscribe(a)
+    hub.subscribe(["TSLA"])
+    assert hub.stats()["subscribers"] == 2
+
+
+
+def test_unsubscribes_when_stream_is_never_iterated(monkeypatch):
+    from flask import Flask
+    from werkzeug.test import EnvironBuilder
+
+    from services import quote_stream
+
+    hub = QuoteHub(interval=3600, fetch=lambda symbols, fresh=False: {}, max_subscribers=1)
+    monkeypatch.setattr(quote_stream, "hub", hub)
+    app = Flask(__name__)
+    app.register_blueprint(quote_stream.quote_stream_bp)
+
+    # WSGI 서버가 본문을 한 번도 읽지 않고 닫는 경우 (클라이언트가 헤더만 받고 끊김 등)
+    environ = EnvironBuilder(path="/api/quotes/stream", query_string="symbols=AAPL").get_environ()
+    body = app.wsgi_app(environ, lambda status, headers, exc_info=None: None)
+    assert hub.stats()["subscribers"] == 1
+    body.close()
+    assert hub.stats()["subscribers"] == 0
@@ -0,0 +1,202 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import negative_cache, quotes, rate_limit, snapshots
+
+
+def _frame(closes):
+    """{SYMBOL: [close...]} -> yf.download(group_by="column") 모양의 frame."""
+    n = max(len(v) for v in closes.values())
+    idx = pd.date_range("2024-01-01", periods=n, freq="B")
+    df = pd.DataFrame({("Close", s): v for s, v in closes.items()}, index=idx)
+    df.columns = pd.MultiIndex.from_tuples(df.columns, names=["Price", "Ticker"])
+    return df
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch, tmp_path):
+    monkeypatch.setattr(quotes, "_quote_cache", quotes.TTLCache(ttl=60, name="quotes-test"))
+    monkeypatch.setattr(negative_cache, "_bad_symbols", negative_cache.TTLCache(ttl=300, name="neg-test"))
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path))
+    monkeypatch.setattr(snapshots, "quotes", snapshots.SnapshotStore("quotes"))
+
+
+def _fake_download(df, errors=None, exc=None):
+    def download(symbols, **kwargs):
+        if exc is not None:
+            raise exc
+        return df, dict(errors or {})
+    return download
+
+
+def test_missing_symbol_marked_when_others_returned(monkeypatch):
+    df = _frame({"AAPL": [1.0, 2.0], "ZZZZ": [np.nan, np.nan]})
+    monkeypatch.setattr(rate_limit, "download", _fake_download(df))
+    out = quotes.fetch_quotes(["AAPL", "ZZZZ"])
+    assert set(out) == {"AAPL"}
+    assert out["AAPL"]["change_pct"] == pytest.approx(100.0)
+    assert negative_cache.is_known_bad("ZZZZ")
+    assert not negative_cache.is_known_bad("AAPL")
+
+
+def test_throttled_symbol_not_marked_even_if_others_returned(monkeypatch):
+    df = _frame({"AAPL": [1.0, 2.0], "MSFT": [np.nan, np.nan]})
+    errors = {"MSFT": "YFRateLimitError('Too Many Requests. Rate limited. Try after a while.')"}
+    monkeypatch.setattr(rate_limit, "download", _fake_download(df, errors))
+    quotes.fetch_quotes(["AAPL", "MSFT"])
+    assert not negative_cache.is_known_bad("MSFT")
+
+
+def test_empty_frame_never_marks(monkeypatch):
+    monkeypatch.setattr(rate_limit, "download", _fake_download(pd.DataFrame()))
+    assert quotes.fetch_quotes(["AAPL", "MSFT"]) == {}
+    assert not negative_cache.is_known_bad("AAPL")
+    assert not negative_cache.is_known_bad("MSFT")
+
+
+def test_empty_frame_marks_only_reported_no_data(monkeypatch):
+    errors = {"OLDCO": "possibly delisted; no price data found  (period=5d)"}
+    monkeypatch.setattr(rate_limit, "download", _fake_download(pd.DataFrame(), errors))
+    quotes.fetch_quotes(["OLDCO"])
+    assert negative_cache.is_known_bad("OLDCO")
+
+
+def test_empty_frame_serves_snapshot(monkeypatch):
+    snapshots.quotes.put("AAPL", {"symbol": "AAPL", "price": 5.0, "prev_close": 4.0, "change_pct": 25.0})
+    monkeypatch.setattr(rate_limit, "download", _fake_download(pd.DataFrame()))
+    out = quotes.fetch_quotes(["AAPL", "MSFT"])
+    assert out["AAPL"]["price"] == 5.0
+    assert "stale_since" in out["AAPL"]
+    assert "MSFT" not in out
+    assert not negative_cache.is_known_bad("MSFT")
+
+
+def test_exception_without_snapshot_reraises(monkeypatch):
+    monkeypatch.setattr(rate_limit, "download", _fake_download(None, exc=rate_limit.YahooThrottled("429")))
+    with pytest.raises(rate_limit.YahooThrottled):
+        quotes.fetch_quotes(["AAPL"])
+    assert not negative_cache.is_known_bad("AAPL")
+
+
+def test_error_capture_only_keeps_calling_thread():
+    capture = rate_limit._YFErrorCapture()
+    yf_log = logging.getLogger("yfinance")
+    yf_log.addHandler(capture)
+    try:
+        yf_log.error("\n2 Failed downloads:")
+        yf_log.error("['AAPL', 'msft']: YFRateLimitError('Too Many Requests. Rate limited. Try after a while.')")
+        import threading
+        t = threading.Thread(target=yf_log.error, args=("['TSLA']: possibly delisted",))
+        t.start()
+        t.join()
+    finally:
+        yf_log.removeHandler(capture)
+    assert set(capture.errors) == {"AAPL", "MSFT"}
+    assert rate_limit.is_throttle_error(capture.errors["AAPL"])
+
+
+def test_download_raises_on_swallowed_429(monkeypatch):
+    import yfinance as yf
+
+    costs = []
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: costs.append(cost))
+    throttles = []
+    monkeypatch.setattr(rate_limit.yahoo, "on_throttle", lambda retry_after=0.0: throttles.append(retry_after))
+    monkeypatch.setattr(rate_limit.yahoo, "on_success", lambda: pytest.fail("429 counted as success"))
+
+    def swallowing_download(symbols, **kwargs):
+        logging.getLogger("yfinance").error(f"{symbols}: YFRateLimitError('Too Many Requests.')")
+        return pd.DataFrame()
+
+    monkeypatch.setattr(yf, "download", swallowing_download)
+    with pytest.raises(rate_limit.YahooThrottled):
+        rate_limit.download(["AAPL", "MSFT", "TSLA"])
+    assert costs == [3]
+    assert len(throttles) == 1
+
+
+def test_download_empty_without_errors_is_not_success(monkeypatch):
+    import yfinance as yf
+
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: 0.0)
+    monkeypatch.setattr(rate_limit.yahoo, "on_success", lambda: pytest.fail("empty counted as success"))
+    monkeypatch.setattr(rate_limit.yahoo, "on_throttle", lambda retry_after=0.0: pytest.fail("not a 429"))
+    monkeypatch.setattr(yf, "download", lambda symbols, **kwargs: pd.DataFrame())
+    df, errors = rate_limit.download(["AAPL"])
+    assert df.empty and errors == {}
+
+
+def test_other_errors_not_marked_even_if_others_returned(monkeypatch):
+    df = _frame({"AAPL": [1.0, 2.0], "MSFT": [np.nan, np.nan]})
+    errors = {"MSFT": "ReadTimeout('Read timed out. (read timeout=10)')"}
+    monkeypatch.setattr(rate_limit, "download", _fake_download(df, errors))
+    quotes.fetch_quotes(["AAPL", "MSFT"])
+    assert not negative_cache.is_known_bad("MSFT")
+
+
+def test_is_no_data_error():
+    assert rate_limit.is_no_data_error("$OLDCO: possibly delisted; no price data found  (period=2d)")
+    assert not rate_limit.is_no_data_error(None)
+    assert not rate_limit.is_no_data_error("YFRateLimitError('Too Many Requests.')")
+    assert not rate_limit.is_no_data_error(
+        "$AAPL: possibly delisted; no price data found  (period=2d)(Yahoo status_code = 500)")
+
+
+class _Ticker:
+    def __init__(self, message=None):
+        self.message = message
+
+    def history(self, **kwargs):
+        if self.message:
+            logging.getLogger("yfinance").error(self.message)
+        return pd.DataFrame()
+
+
+def test_history_returns_swallowed_error(monkeypatch):
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: 0.0)
+    monkeypatch.setattr(rate_limit.yahoo, "on_success", lambda: pytest.fail("empty counted as success"))
+    df, error = rate_limit.history(_Ticker("$OLDCO: possibly delisted; no price data found  (period=2d)"))
+    assert df.empty
+    assert rate_limit.is_no_data_error(error)
+    assert rate_limit.history(_Ticker())[1] is None
+
+
+def test_history_raises_on_swallowed_429(monkeypatch):
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: 0.0)
+    throttles = []
+    monkeypatch.setattr(rate_limit.yahoo, "on_throttle", lambda retry_after=0.0: throttles.append(retry_after))
+    with pytest.raises(rate_limit.YahooThrottled):
+        rate_limit.history(_Ticker("AAPL: YFRateLimitError('Too Many Requests.')"))
+    assert len(throttles) == 1
+
+
+@pytest.mark.parametrize("message, marked", [
+    ("$ZZZZ: possibly delisted; no price data found  (period=2d)", True),
+    (None, False),
+])
+def test_get_quote_marks_only_confirmed_no_data(monkeypatch, message, marked):
+    from types import SimpleNamespace
+
+    import yfinance_api as api
+
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: 0.0)
+    monkeypatch.setattr(api, "yf", SimpleNamespace(Ticker=lambda symbol: _Ticker(message)))
+    resp = api.app.test_client().get("/api/quote?symbol=ZZZZ")
+    assert resp.status_code == 404
+    assert negative_cache.is_known_bad("ZZZZ") is marked
+
+
+def test_get_quote_empty_history_serves_snapshot(monkeypatch):
+    from types import SimpleNamespace
+
+    import yfinance_api as api
+
+    snapshots.quotes.put("AAPL", {"symbol": "AAPL", "price": 5.0, "prev_close": 4.0, "change_pct": 25.0})
+    monkeypatch.setattr(rate_limit.yahoo, "acquire", lambda priority=None, cost=1.0: 0.0)
+    monkeypatch.setattr(api, "yf", SimpleNamespace(Ticker=lambda symbol: _Ticker()))
+    body = api.app.test_client().get("/api/quote?symbol=AAPL").get_json()
+    assert body["price"] == 5.0 and body["stale"] is True
+    assert not negative_cache.is_known_bad("AAPL")
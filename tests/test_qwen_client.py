@@ -0,0 +1,121 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import qwen_client
+
+
+@pytest.fixture
+def policy(monkeypatch):
+    p = qwen_client._HedgePolicy()
+    monkeypatch.setattr(qwen_client, "_policy", p)
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE_MIN_SAMPLES", 5)
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE_MIN_DELAY", 0.01)
+    return p
+
+
+def test_delay_uses_initial_value_then_percentile(policy, monkeypatch):
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE_INITIAL_DELAY", 7.0)
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE_PERCENTILE", 50)
+    for s in (0.1, 0.2, 0.3, 0.4):
+        policy.record(s)
+    assert policy.delay() == 7.0
+    policy.record(0.5)
+    assert policy.delay() == pytest.approx(0.3)
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE_PERCENTILE", 100)
+    assert policy.delay() == pytest.approx(0.5)
+
+
+def test_budget_limits_hedges(monkeypatch):
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE_BURST", 2)
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE_BUDGET", 0.25)
+    p = qwen_client._HedgePolicy()
+    assert p.try_hedge() and p.try_hedge()
+    assert not p.try_hedge()
+    for _ in range(3):
+        p.on_request()
+    assert not p.try_hedge()  # 0.75 credit
+    p.on_request()
+    assert p.try_hedge()
+
+
+class _Server:
+    """요청마다 replies 에서 (지연 초, status) 를 하나씩 꺼내 응답하는 로컬 서버."""
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.paths = []
+        lock = threading.Lock()
+        outer = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                with lock:
+                    outer.paths.append(self.path)
+                    delay, status = outer.replies.pop(0)
+                time.sleep(delay)
+                data = json.dumps(f"reply {status}").encode("utf-8")
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        host, port = self.httpd.server_address[:2]
+        self.url = f"http://{host}:{port}/generate?key=abc"
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def _hedge_after(policy, monkeypatch, seconds):
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE", True)
+    monkeypatch.setattr(policy, "delay", lambda: seconds)
+    policy._credits = 3
+
+
+def test_hedge_wins_and_slow_primary_is_recorded(policy, monkeypatch):
+    _hedge_after(policy, monkeypatch, 0.1)
+    server = _Server([(2.0, 200), (0.0, 200)])
+    try:
+        status, text = qwen_client._hedged_post(server.url, {}, b"{}")
+    finally:
+        server.close()
+    assert status == 200
+    assert server.paths == ["/generate?key=abc"] * 2  # query string 유지
+    # 취소된 첫 요청도 (하한) 지연 표본으로 남는다: 적어도 hedge 지연만큼
+    assert max(policy._latencies) >= 0.1
+
+
+def test_error_status_does_not_win(policy, monkeypatch):
+    _hedge_after(policy, monkeypatch, 0.05)
+    server = _Server([(0.2, 200), (0.0, 429)])
+    try:
+        status, _ = qwen_client._hedged_post(server.url, {}, b"{}")
+    finally:
+        server.close()
+    assert status == 200
+
+
+def test_all_failures_return_last_response(policy, monkeypatch):
+    monkeypatch.setattr(qwen_client, "QWEN_HEDGE", False)
+    server = _Server([(0.0, 404)])
+    try:
+        status, text = qwen_client._hedged_post(server.url, {}, b"{}")
+    finally:
+        server.close()
+    assert status == 404 and "404" in text
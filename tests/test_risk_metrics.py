@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from backend import risk_metrics
+from backend.quotes import _last_two_valid
+
+
+def test_prev_close_is_bar_before_last_valid():
+    nan = np.nan
+    # 열 0: 마지막 날 다른 시장만 열려서 NaN (주말 / 휴장일과 같은 모양)
+    # 열 1: bar 하나뿐, 열 2: 데이터 없음
+    closes = np.array([
+        [100.0, nan, nan],
+        [110.0, nan, nan],
+        [nan, 50.0, nan],
+    ])
+    m = risk_metrics.compute_metrics(closes, closes)
+    assert m["last_close"][0] == 110.0
+    assert m["prev_close"][0] == 100.0
+    assert m["last_close"][1] == 50.0
+    assert np.isnan(m["prev_close"][1])
+    assert np.isnan(m["last_close"][2])
+
+    price, prev = _last_two_valid(closes[:, :2])
+    assert price[0] == m["last_close"][0] and prev[0] == m["prev_close"][0]
+
+
+def test_last_two_valid_skips_nan_rows():
+    close = np.array([
+        [10.0, 100.0, np.nan],
+        [11.0, np.nan, np.nan],
+        [np.nan, 110.0, 5.0],
+    ])
+    price, prev = _last_two_valid(close)
+    assert price.tolist() == [11.0, 110.0, 5.0]
+    # 직전 유효값이 없으면 price 자신
+    assert prev.tolist() == [10.0, 100.0, 5.0]
+
+
+def test_volatility_and_beta():
+    rng = np.random.default_rng(0)
+    bench_rets = rng.normal(0, 0.01, 120)
+    bench = 100 * np.exp(np.concatenate([[0.0], np.cumsum(bench_rets)]))
+    stock = 50 * np.exp(np.concatenate([[0.0], np.cumsum(2 * bench_rets)]))  # beta 2, 잔차 없음
+    closes = np.column_stack([stock])
+    benches = np.column_stack([bench])
+    m = risk_metrics.compute_metrics(closes, benches)
+    assert m["beta"][0] == pytest.approx(2.0)
+    expected = np.std(2 * bench_rets, ddof=1) * np.sqrt(risk_metrics.TRADING_DAYS)
+    assert m["annual_vol"][0] == pytest.approx(expected)
+    assert risk_metrics.volatility_bucket(m["annual_vol"][0]) in ("low", "medium", "high")
+
+
+def test_change_pct():
+    assert risk_metrics.change_pct(110.0, 100.0) == pytest.approx(10.0)
+    assert risk_metrics.change_pct(110.0, None) == 0.0
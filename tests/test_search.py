@@ -0,0 +1,41 @@
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+import yfinance_api as api
+from backend import negative_cache
+
+
+class _Ticker:
+    def __init__(self, symbol):
+        self.ticker = symbol
+
+    @property
+    def info(self):
+        return {"symbol": self.ticker, "longName": "Samsung Electronics", "sector": "Technology"}
+
+    def history(self, period=None, **kwargs):
+        idx = pd.date_range("2024-01-02", periods=2, freq="B")
+        return pd.DataFrame({"Close": [100.0, 110.0]}, index=idx)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(negative_cache, "_bad_symbols", negative_cache.TTLCache(ttl=300, name="neg-test"))
+    monkeypatch.setattr(api, "yf", SimpleNamespace(Ticker=_Ticker))
+    monkeypatch.setattr(api, "yahoo_search_symbols", lambda query: [])
+    return api.app.test_client()
+
+
+def test_change_pct_uses_same_history_as_price(client, monkeypatch):
+    # 장 시작 전에 캐시된 risk 지표: prev_close 가 두 거래일 전 종가
+    monkeypatch.setattr(api, "get_risk_metrics", lambda symbols: {
+        s.upper(): {"prev_close": 50.0, "volatility": "low", "beta": 1.2} for s in symbols
+    })
+    body = client.get("/api/search?query=005930.KS").get_json()
+    (result,) = body["results"]
+    assert result["price"] == 110.0
+    assert result["change_pct"] == pytest.approx(10.0)
+    assert result["volatility"] == "low"
+    assert result["beta"] == 1.2
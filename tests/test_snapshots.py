@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from backend import snapshots
+
+
+@pytest.fixture(autouse=True)
+def snapshot_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(snapshots, "SNAPSHOT_DIR", str(tmp_path))
+
+
+def test_encode_roundtrip():
+    entries = {"AAPL": [1.0, {"price": 1.5}]}
+    assert snapshots.decode(snapshots.encode(entries)) == entries
+    with pytest.raises(ValueError):
+        snapshots.decode(b"nope")
+
+
+def test_flush_merges_with_other_worker():
+    a = snapshots.SnapshotStore("quotes")
+    b = snapshots.SnapshotStore("quotes")
+    a.put("AAPL", {"price": 1.0})
+    a.put("MSFT", {"price": 2.0})
+    assert a.flush()
+    assert not a.flush()  # 바뀐 게 없으면 쓰지 않는다
+
+    b.put("AAPL", {"price": 3.0})  # b 가 더 최근
+    b.put("TSLA", {"price": 4.0})
+    assert b.flush()
+
+    c = snapshots.SnapshotStore("quotes")
+    c.load()
+    assert c.get("AAPL")[0] == {"price": 3.0}
+    assert c.get("MSFT")[0] == {"price": 2.0}
+    assert c.get("TSLA")[0] == {"price": 4.0}
+
+
+def test_merge_keeps_newest_and_drops_expired(monkeypatch):
+    store = snapshots.SnapshotStore("news", max_entries=2)
+    now = time.time()
+    store._loaded = True
+    store._merge({
+        "old": [now - snapshots.SNAPSHOT_MAX_AGE - 1, "x"],
+        "a": [now - 30, "a"],
+        "b": [now - 20, "b"],
+        "c": [now - 10, "c"],
+    })
+    assert sorted(k for k, _, _ in store.items()) == ["b", "c"]
+    store._merge({"c": [now - 100, "stale c"]})
+    assert store.get("c")[0] == "c"
+
+
+def test_get_max_age_and_latest():
+    store = snapshots.SnapshotStore("learning")
+    store._loaded = True
+    now = time.time()
+    store._merge({"learning:3:1": [now - 600, "old"], "learning:5:2": [now - 5, "new"], "other": [now, "x"]})
+    assert store.get("learning:3:1", max_age=60) is None
+    assert store.get("learning:3:1")[0] == "old"
+    key, value, _ = store.latest("learning:")
+    assert (key, value) == ("learning:5:2", "new")
@@ -1,58 +1,91 @@
-from flask import Flask, request, jsonify
+from backend import startup  # 부팅 시간 측정 기준점이므로 가장 먼저 import
+
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
-import yfinance as yf
-import time
 import os
 import json
+import hashlib
+import logging
 import re
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
 
 from dotenv import load_dotenv
 from qwen_client import call_qwen_finsec_model, build_security_prompt
-from openai import OpenAI
 
+from backend.risk_metrics import get_metrics as get_risk_metrics, change_pct as risk_change_pct
+from backend.krx_listing import get_listing as get_krx_listing
+from backend.quotes import fetch_quotes, normalize_symbols, stale_quotes
+from backend import negative_cache
+from backend import http_cache
+from backend.http_cache import json_response
+from backend.json_stream import ArrayStreamParser, salvage_array
+from backend.news_dedup import merge_near_duplicates
+from backend import llm_gateway, logging_config, metrics, preload, profiling, snapshots, traffic_capture
+from backend import rate_limit
+from backend.rate_limit import RateLimitTimeout, is_no_data_error, is_throttle_error, yahoo_call
+from backend.lazy import lazy_module
 from services.persona_engine import persona_bp
+from services.knowledge_search import knowledge_bp
+from services.history import history_bp
+from services.portfolio import portfolio_bp
+from services.backtest import backtest_bp
+from services.quote_stream import quote_stream_bp
+
+# yfinance (+ pandas) 는 첫 upstream 호출 때 import
+yf = lazy_module("yfinance")
+
+log = logging.getLogger(__name__)
 
 # Load environment variables from .env.local (for Vite compatibility) and .env
 load_dotenv(".env.local")
 load_dotenv(".env")  # Also try .env if it exists
 
 app = Flask(__name__)
+logging_config.init_app(app)  # queue 기반 비동기 로깅 + X-Request-ID (다른 훅보다 먼저)
 CORS(app)  # allow all origins for /api/*
+metrics.init_app(app)  # Prometheus /metrics
+profiling.init_app(app)  # 샘플링 프로파일러 (기본 꺼짐)
+traffic_capture.init_app(app)  # TRAFFIC_CAPTURE_DIR 설정 시 요청 기록
+# ETag / 304 + gzip·brotli 압축. before_request 의 304 는 뒤의 훅을 건너뛰므로 지표 / 기록 훅보다 나중에
+http_cache.init_app(app)
 
-# ---- OpenAI client setup (must be before blueprint registration) ----
-# Try both VITE_ prefixed (from .env.local) and non-prefixed versions
-SENTIMENT_API_URL = (
-    os.getenv("VITE_MLAPI_BASE_URL") or
-    os.getenv("MLAPI_BASE_URL") or
-    os.getenv("SENTIMENT_API_URL") or
-    "https://mlapi.run/daef5150-72ef-48ff-8861-df80052ea7ac/v1"
-)
-SENTIMENT_API_KEY = (
-    os.getenv("VITE_SENTIMENT_API_KEY") or
-    os.getenv("SENTIMENT_API_KEY") or
-    ""
-)
-
-# Initialize OpenAI client with error logging
-if SENTIMENT_API_KEY and SENTIMENT_API_URL:
-    try:
-        openai_client = OpenAI(base_url=SENTIMENT_API_URL, api_key=SENTIMENT_API_KEY)
-        print(f"[INFO] OpenAI client initialized successfully")
-        print(f"[DEBUG] API URL: {SENTIMENT_API_URL[:60]}...")
-        print(f"[DEBUG] API Key: {'***' + SENTIMENT_API_KEY[-4:] if len(SENTIMENT_API_KEY) > 4 else '***'}")
-    except Exception as e:
-        print(f"[ERROR] Failed to initialize OpenAI client: {e}")
-        openai_client = None
-else:
-    openai_client = None
-    print("[WARNING] OpenAI client not initialized: SENTIMENT_API_KEY or SENTIMENT_API_URL not set")
-    print(f"[DEBUG] SENTIMENT_API_URL: {SENTIMENT_API_URL}")
-    print(f"[DEBUG] SENTIMENT_API_KEY: {'Set' if SENTIMENT_API_KEY else 'Not set'}")
-
-app.config["OPENAI_CLIENT"] = openai_client
+# GPT-5 호출은 모두 backend.llm_gateway 경유 (캐시 / single-flight / 동시성 제한).
+# 클라이언트는 backend.llm_client 가 첫 LLM 요청 때 만든다.
 
-# Register persona blueprint (after openai_client is set in app.config)
+# Register blueprints
 app.register_blueprint(persona_bp)
+app.register_blueprint(knowledge_bp)
+app.register_blueprint(history_bp)
+app.register_blueprint(portfolio_bp)
+app.register_blueprint(backtest_bp)
+app.register_blueprint(quote_stream_bp)
+
+# KRX 상장 종목표는 첫 검색 때 로드된다 (파일이 갱신되면 get_krx_listing() 이 다시 읽음)
+
+# /api/news
+MARKET_NEWS_SYMBOLS = ['AAPL', 'GOOGL', 'TSLA', 'MSFT', 'NVDA']
+MAX_NEWS_SYMBOLS = 30
+NEWS_MULTI_LIMIT = 100
+NEWS_FETCH_WORKERS = int(os.getenv("NEWS_FETCH_WORKERS", "8"))
+_news_pool = None  # 첫 여러 종목 요청 때 생성
+_news_pool_lock = threading.Lock()
+
+# /api/dashboard: 구역별 제한 시간(초), "news=4,learning=20" 형식으로 덮어쓰기
+DASHBOARD_SECTIONS = ("quotes", "news", "learning", "quizzes")
+DASHBOARD_TIMEOUTS = {"quotes": 3.0, "news": 5.0, "learning": 15.0, "quizzes": 15.0}
+for _part in os.getenv("DASHBOARD_TIMEOUTS", "").split(","):
+    _name, _, _value = _part.strip().partition("=")
+    if _name in DASHBOARD_TIMEOUTS and _value:
+        DASHBOARD_TIMEOUTS[_name] = float(_value)
+# 구역마다 따로 pool (느린 LLM 구역이 시세 / 뉴스 스레드를 잡지 않도록), 대기는 스레드 수만큼까지
+DASHBOARD_SECTION_WORKERS = int(os.getenv("DASHBOARD_SECTION_WORKERS", "8"))
+_dashboard_pools = {}
+_dashboard_slots = {name: threading.BoundedSemaphore(2 * DASHBOARD_SECTION_WORKERS) for name in DASHBOARD_SECTIONS}
+_dashboard_inflight = {}  # (구역, 인자) -> 아직 도는 Future
+_dashboard_lock = threading.Lock()
 
 
 def yahoo_search_symbols(query: str):
@@ -73,7 +106,7 @@ def yahoo_search_symbols(query: str):
         params = {"q": query, "quotesCount": 8, "newsCount": 0, "listsCount": 0}
         url = f"{base_url}?{urlencode(params)}"
 
-        with urllib.request.urlopen(url, timeout=5) as resp:
+        with yahoo_call("search"), urllib.request.urlopen(url, timeout=5) as resp:
             raw = resp.read()
             try:
                 data = json.loads(raw.decode("utf-8"))
@@ -92,10 +125,10 @@ def yahoo_search_symbols(query: str):
             if s not in symbols:
                 symbols.append(s)
 
-        print(f"[yahoo_search_symbols] query='{query}' -> {symbols}")
+        log.debug("yahoo search %r -> %s", query, symbols)
         return symbols
     except Exception as e:
-        print("[yahoo_search_symbols] error:", e)
+        log.warning("yahoo search failed for %r: %s", query, e)
         return []
 
 @app.route("/")
@@ -103,9 +136,21 @@ def index():
     return jsonify({
         "message": "yfinance API server is running",
         "endpoints": [
-            "/api/quote?symbol=SYMBOL",
+            "/api/quote?symbol=SYMBOL (optional risk=1)",
             "/api/search?query=QUERY",
-            "/api/news?symbol=SYMBOL (optional)"
+            "/api/news?symbol=SYMBOL (optional) | /api/news?symbols=A,B,C",
+            "/api/knowledge/search?q=QUERY&top_k=6",
+            "/api/history?symbol=SYMBOL&range=1y (optional interval=1d|1h|5m)",
+            "POST /api/portfolio/valuation",
+            "POST /api/backtest",
+            "/api/negative-cache/stats",
+            "/api/llm/stats",
+            "/api/snapshots/stats",
+            "/api/dashboard-learning | /api/dashboard-quizzes (optional stream=1, NDJSON)",
+            "/api/dashboard?symbols=A,B,C&count=3&seed=0 (optional sections=quotes,news,learning,quizzes)",
+            "/api/quotes/stream?symbols=A,B,C (SSE)",
+            "/metrics (Prometheus)",
+            "GET|POST /api/profiling (X-Profiling-Token)"
         ]
     })
 
@@ -114,21 +159,76 @@ def get_quote():
     symbol = request.args.get('symbol')
     if not symbol:
         return jsonify({'error': "no symbol"}), 400
+    # 최근에 가격 데이터가 없던 심볼이면 upstream 호출 없이 바로 404
+    if negative_cache.is_known_bad(symbol):
+        return jsonify({"error": "No price data"}), 404
     try:
         ticker = yf.Ticker(symbol)
-        data = ticker.history(period="2d")
+        data, error = rate_limit.history(ticker, period="2d")
         if data.empty:
+            # yfinance 는 일시 오류에도 빈 frame 을 주므로 no data / delisted 로 확인된 것만 기록
+            if is_no_data_error(error):
+                negative_cache.mark_bad(symbol, error)
+            else:
+                stale = stale_quotes([symbol.upper()]).get(symbol.upper())
+                if stale is not None:
+                    log.warning("quote for %s came back empty (%s), serving snapshot from %s",
+                                symbol, error, stale["stale_since"])
+                    return _stale_quote_response(symbol, stale)
             return jsonify({"error": "No price data"}), 404
         last_row = data.iloc[-1]
         price = float(last_row["Close"])
         prev_row = data.iloc[-2] if len(data) > 1 else last_row
         prev_close = float(prev_row["Close"])
         change_pct = (price - prev_close) / prev_close * 100 if prev_close > 0 else 0
-        return jsonify({"symbol": symbol, "price": price, "change_pct": change_pct})
+        snapshots.quotes.put(symbol.upper(), {
+            "symbol": symbol.upper(), "price": price, "prev_close": prev_close, "change_pct": change_pct,
+        })
+        body = {"symbol": symbol, "price": price, "change_pct": change_pct}
+        # ?risk=1 이면 변동성 / beta 도 함께 (심볼·거래일 단위 캐시)
+        if request.args.get('risk') in ('1', 'true'):
+            try:
+                m = get_risk_metrics([symbol]).get(symbol.upper())
+            except Exception as e:
+                log.warning("quote risk metrics error for %s: %s", symbol, e)
+                m = None
+            if m:
+                body.update({
+                    "volatility": m["volatility"],
+                    "volatility_annual": m["volatility_annual"],
+                    "beta": m["beta"],
+                })
+        return json_response(body, max_age=15)
     except Exception as e:
-        print("quote error", e)
+        stale = stale_quotes([symbol.upper()]).get(symbol.upper())
+        if stale is not None:
+            # upstream 장애: 마지막으로 받은 시세를 stale_since 와 함께
+            log.warning("quote error for %s, serving snapshot from %s: %s", symbol, stale["stale_since"], e)
+            return _stale_quote_response(symbol, stale)
+        log.exception("quote error for %s", symbol)
         return jsonify({"error": str(e)}), 500
 
+def _stale_quote_response(symbol, stale):
+    return json_response({
+        "symbol": symbol, "price": stale["price"], "change_pct": stale["change_pct"],
+        "stale": True, "stale_since": stale["stale_since"],
+    }, max_age=5)
+
+@app.route("/api/negative-cache/stats")
+def negative_cache_stats():
+    """Negative cache 상태 + 지금까지 생략한 upstream 호출 수."""
+    return jsonify(negative_cache.stats())
+
+@app.route("/api/snapshots/stats")
+def snapshot_stats():
+    """last-known-good 스냅샷 저장소별 항목 수 / 가장 오래된 항목 시각."""
+    return jsonify(snapshots.stats())
+
+@app.route("/api/llm/stats")
+def llm_stats():
+    """LLM gateway: 모델별 upstream / cache / coalesced 호출 수, 평균 지연, 토큰."""
+    return jsonify(llm_gateway.stats())
+
 @app.route("/api/search")
 def search_stocks():
     query = request.args.get('query', '').strip()
@@ -138,9 +238,18 @@ def search_stocks():
     results = []
     query_upper = query.upper()
     
+    krx = get_krx_listing()
+
+    def korean_candidates(code):
+        # KRX 상장표에 있으면 해당 시장 심볼 하나만, 없으면 기존처럼 .KS / .KQ 둘 다 시도
+        sym = krx.symbol_for(code)
+        return [sym] if sym else [f"{code}.KS", f"{code}.KQ"]
+
     # 1. 심볼 기반 후보 생성
     nasdaq_symbols = [query_upper]
     korean_symbols = []
+    name_symbols = []
+    resolved_locally = False
 
     # (1) 이미 .KS, .KQ가 붙어있으면 그대로 사용하고 나스닥은 제외
     if query_upper.endswith('.KS') or query_upper.endswith('.KQ'):
@@ -150,36 +259,51 @@ def search_stocks():
     else:
         m = re.search(r"\d{6}", query)
         code = m.group(0) if m else None
-        if code:
-            korean_symbols = [f"{code}.KS", f"{code}.KQ"]
-        elif query.isdigit() and len(query) < 6:
+        if not code and query.isdigit() and len(query) < 6:
             # 6자리 미만 숫자면 앞에 0을 붙여서 6자리로 만들고 시도
-            padded_query = query.zfill(6)
-            korean_symbols = [f"{padded_query}.KS", f"{padded_query}.KQ"]
+            code = query.zfill(6)
+        if code:
+            korean_symbols = korean_candidates(code)
+            if krx.symbol_for(code):
+                # 상장표로 시장이 확정되면 원문 그대로의 심볼 조회는 불필요
+                nasdaq_symbols = []
+                resolved_locally = True
         else:
             # 그 외는 나스닥 심볼로 가정 (예: AAPL, TSLA, TSLA.US)
             nasdaq_symbols = [query_upper]
-    
-    all_symbols = nasdaq_symbols + korean_symbols
+            # 한글 종목명은 로컬 KRX 상장표에서 바로 찾는다 (예: "삼성전자" -> 005930.KS)
+            if re.search(r"[가-힣]", query):
+                name_symbols = krx.search_names(query)
+                nasdaq_symbols = []
+                resolved_locally = bool(name_symbols)
+
+    all_symbols = nasdaq_symbols + korean_symbols + name_symbols
 
     # 2. 회사명/티커 검색을 위해 Yahoo Finance search API 결과를 추가 후보로 사용
-    try:
-        yahoo_syms = yahoo_search_symbols(query)
-        for s in yahoo_syms:
-            su = s.upper()
-            if su not in all_symbols:
-                all_symbols.append(su)
-    except Exception as e:
-        print("[/api/search] yahoo_search_symbols error:", e)
+    #    (KRX 상장표에서 코드/한글 종목명이 이미 확정됐으면 생략)
+    if not resolved_locally:
+        try:
+            yahoo_syms = yahoo_search_symbols(query)
+            for s in yahoo_syms:
+                su = s.upper()
+                if su not in all_symbols:
+                    all_symbols.append(su)
+        except Exception as e:
+            log.warning("/api/search yahoo_search_symbols error: %s", e)
     valid_korean_results = {'KS': None, 'KQ': None}
     
     for symbol in all_symbols:
+        # 최근 info/가격이 없던 심볼은 건너뜀 (info + history 두 번의 호출 절약)
+        if negative_cache.is_known_bad(symbol, upstream_calls=2):
+            continue
         try:
             ticker = yf.Ticker(symbol)
-            info = ticker.info
+            with yahoo_call("info"):
+                info = ticker.info
             
             # 유효한 종목인지 확인
             if not info or 'symbol' not in info:
+                negative_cache.mark_bad(symbol, "no info")
                 continue
             
             # 이름 가져오기
@@ -195,14 +319,22 @@ def search_stocks():
             
             # 실제 주가 데이터가 있어야 함 (가장 중요!)
             try:
-                data = ticker.history(period="2d")
+                data, error = rate_limit.history(ticker, period="2d")
                 if data.empty:
+                    # 429 / 일시 오류로 빈 경우는 심볼 문제가 아니므로 no data / delisted 일 때만 기록
+                    if is_no_data_error(error):
+                        negative_cache.mark_bad(symbol, error)
                     continue  # 주가 데이터가 없으면 유효하지 않음
                 price = float(data.iloc[-1]["Close"])
-            except:
+                prev_close = float(data.iloc[-2]["Close"]) if len(data) > 1 else price
+            except Exception as e:
                 # history 실패 시 info에서 가격 가져오기 시도
                 price = info.get('currentPrice', 0) or info.get('regularMarketPrice', 0) or 0
+                prev_close = info.get('regularMarketPreviousClose') or info.get('previousClose')
                 if price <= 0:
+                    # throttle 로 실패한 건 심볼 문제가 아니므로 negative cache 에 넣지 않음
+                    if not isinstance(e, RateLimitTimeout) and not is_throttle_error(e):
+                        negative_cache.mark_bad(symbol, "no price data")
                     continue  # 가격이 없으면 유효하지 않음
             
             # 가격이 0 이하면 제외
@@ -215,9 +347,11 @@ def search_stocks():
                 "symbol": symbol,
                 "name": name,
                 "price": price,
-                "change_pct": 0,
+                # get_quote 와 같은 기준 (같은 2d history 의 직전 bar). risk 캐시의 prev_close 는
+                # 장 시작 전에 채워지면 하루 종일 두 거래일 전 종가라서 쓰지 않는다
+                "change_pct": risk_change_pct(price, prev_close),
                 "sector": sector,
-                "volatility": "medium"
+                "volatility": "medium"  # 아래에서 실제 지표로 채움
             }
             
             # 나스닥 종목이면 바로 추가
@@ -241,12 +375,197 @@ def search_stocks():
         results.append(valid_korean_results['KS'])
     if valid_korean_results['KQ']:
         results.append(valid_korean_results['KQ'])
-    
-    return jsonify({"results": results[:20]})  # 최대 20개 반환
+
+    results = results[:20]  # 최대 20개 반환
+
+    # 실현 변동성 / beta: 결과 심볼 전체를 한 번에 계산
+    try:
+        metrics = get_risk_metrics([r["symbol"] for r in results])
+    except Exception as e:
+        log.warning("/api/search risk metrics error: %s", e)
+        metrics = {}
+    for r in results:
+        m = metrics.get(r["symbol"].upper())
+        if not m:
+            continue
+        r["volatility"] = m["volatility"]
+        r["beta"] = m["beta"]
+
+    return json_response({"results": results}, max_age=60)
+
+def _fetch_symbol_news(sym):
+    """Yahoo 뉴스 원본 리스트 (실패하면 빈 리스트)."""
+    try:
+        ticker = yf.Ticker(sym)
+        with yahoo_call("news"):
+            news = ticker.news
+        if not news or not isinstance(news, list) or len(news) == 0:
+            try:
+                with yahoo_call("news"):
+                    news = ticker._get_news()
+            except:
+                pass
+    except Exception as e:
+        log.warning("error getting news for %s: %s", sym, e)
+        news = []
+    return news if isinstance(news, list) else []
+
+
+def _fetch_news_feeds(symbols):
+    """
+    심볼별 뉴스를 동시에 가져온다 -> [(sym, news), ...] (입력 순서 유지).
+    호출 간격은 backend.rate_limit 이 조절하므로 여기서는 따로 쉬지 않는다.
+    """
+    global _news_pool
+    if len(symbols) <= 1:
+        return [(sym, _fetch_symbol_news(sym)) for sym in symbols]
+    with _news_pool_lock:
+        if _news_pool is None:
+            _news_pool = ThreadPoolExecutor(max_workers=NEWS_FETCH_WORKERS, thread_name_prefix="news-fetch")
+    # request id 등 contextvar 를 worker 스레드로 넘긴다
+    futures = [
+        _news_pool.submit(contextvars.copy_context().run, _fetch_symbol_news, sym)
+        for sym in symbols
+    ]
+    return [(sym, f.result()) for sym, f in zip(symbols, futures)]
+
+
+def _merge_news_feeds(feeds, per_symbol):
+    """
+    여러 종목의 뉴스를 모아서 같은 기사(제목+출처 기준, 이어서 MinHash near-duplicate)는 한 번만 남기고,
+    관련 심볼은 실제로 그 기사가 속해 있던 심볼 + Yahoo relatedTickers 의 합집합.
+    결과는 최신순.
+    """
+    article_map = {}  # key -> article dict (related_symbols 는 set 으로 유지)
+
+    for sym, news in feeds:
+        if news and isinstance(news, list) and len(news) > 0:
+            for idx, item in enumerate(news[:per_symbol]):
+                if not isinstance(item, dict):
+                    continue
+                
+                try:
+                    content = item.get('content', {})
+                    if not isinstance(content, dict):
+                        content = item
+                    
+                    title_val = content.get('title') or item.get('title') or content.get('headline') or ''
+                    title = str(title_val).strip() if title_val and not isinstance(title_val, dict) else ''
+                    if not title:
+                        continue
+                    
+                    pub_val = (content.get('publisher') or content.get('publisherName') or 
+                              content.get('provider') or item.get('publisher') or 
+                              item.get('publisherName') or 'Market News')
+                    publisher = str(pub_val).strip() if pub_val and not isinstance(pub_val, dict) else 'Market News'
+                    if not publisher or publisher.lower() in ['unknown', '']:
+                        publisher = 'Market News'
+                    
+                    pub_time = (content.get('providerPublishTime') or content.get('pubDate') or 
+                               content.get('publishedAt') or content.get('pubDateUTC') or
+                               item.get('providerPublishTime') or item.get('pubDate') or 
+                               item.get('publishedAt') or 0)
+                    if isinstance(pub_time, str):
+                        try:
+                            from datetime import datetime
+                            pub_time = int(datetime.fromisoformat(pub_time.replace('Z', '+00:00')).timestamp())
+                        except:
+                            pub_time = 0
+                    elif pub_time and isinstance(pub_time, (int, float)):
+                        pub_time = int(pub_time)
+                    else:
+                        pub_time = 0
+                    
+                    summary_val = (content.get('summary') or content.get('description') or 
+                                  content.get('text') or item.get('summary') or 
+                                  item.get('description') or title)
+                    summary = str(summary_val).strip() if summary_val and not isinstance(summary_val, dict) else title
+                    if not summary:
+                        summary = title
+                    
+                    id_val = content.get('id') or item.get('uuid') or item.get('id') or item.get('link')
+                    base_id = str(id_val) if id_val and not isinstance(id_val, dict) else title
+                    
+                    # 기사 중복을 줄이기 위한 키 (제목 + 출처 기준)
+                    key = f"{title.strip().lower()}|{publisher.strip().lower()}"
+
+                    if key not in article_map:
+                        # 링크 찾기
+                        raw_link_val = (
+                            content.get('link')
+                            or content.get('url')
+                            or content.get('canonicalUrl')
+                            or content.get('clickThroughUrl')
+                            or content.get('clickThroughURL')
+                            or item.get('link')
+                            or item.get('url')
+                            or item.get('canonicalUrl')
+                            or item.get('clickThroughUrl')
+                            or item.get('clickThroughURL')
+                            or ''
+                        )
+                        link = _normalize_link_value(raw_link_val)
+                        if not isinstance(link, str):
+                            link = ''
+                        # http/https 로 시작하지 않으면 버튼을 숨기기 위해 빈 문자열 처리
+                        if not link.startswith('http'):
+                            link = ''
+
+                        article_map[key] = {
+                            "id": f"{base_id}_{hash(key)}",
+                            "title": title,
+                            "source": publisher,
+                            "date": pub_time,
+                            "summary": summary,
+                            "impact": "neutral",
+                            "related_symbols": set(),
+                            "link": link,
+                        }
+                    
+                    # 이 기사는 최소한 sym 과 연관
+                    article_map[key]["related_symbols"].add(sym)
+                    
+                    # Yahoo relatedTickers 도 추가
+                    try:
+                        raw_related = content.get("relatedTickers") or item.get("relatedTickers") or []
+                        if isinstance(raw_related, list):
+                            for r in raw_related:
+                                if not r:
+                                    continue
+                                rsym = str(r).strip()
+                                if not rsym:
+                                    continue
+                                article_map[key]["related_symbols"].add(rsym)
+                    except Exception:
+                        pass
+                except Exception as e:
+                    log.debug("error processing news item %d for %s: %s", idx, sym, e)
+                    continue
+
+    # map → 리스트로 변환 + 심볼 set 을 정렬된 리스트로 변경
+    all_news = []
+    for art in article_map.values():
+        syms = sorted(art["related_symbols"])
+        art["related_symbols"] = syms
+        all_news.append(art)
+
+    all_news.sort(key=lambda x: x['date'], reverse=True)
+    # 제목만 조금 다른 같은 기사 (배급 / 헤드라인 변형) 를 한 건으로: 최신 기사를 남기고 심볼 합침
+    return merge_near_duplicates(all_news)
+
 
 @app.route("/api/news")
 def get_news():
+    """
+    ?symbol=SYM        : 한 종목 뉴스
+    ?symbols=A,B,C     : 여러 종목 뉴스를 동시에 가져와 중복 제거 후 최신순 한 목록으로
+    (둘 다 없으면)       : Market News (주요 종목 모음)
+    """
     symbol = request.args.get('symbol', '').strip()
+    symbols = normalize_symbols(request.args.get('symbols', '').split(','))
+    if len(symbols) > MAX_NEWS_SYMBOLS:
+        return jsonify({"error": f"at most {MAX_NEWS_SYMBOLS} symbols are supported", "news": []}), 400
+    snapshot_key = symbol.upper() if symbol else ("symbols:" + ",".join(symbols) if symbols else "market")
     
     try:
         news_items = []
@@ -259,15 +578,17 @@ def get_news():
                 news = []
                 try:
                     # 방법 1: news 속성 직접 접근
-                    news = ticker.news
+                    with yahoo_call("news"):
+                        news = ticker.news
                     if not news or not isinstance(news, list):
                         # 방법 2: _get_news 메서드 시도
                         try:
-                            news = ticker._get_news()
+                            with yahoo_call("news"):
+                                news = ticker._get_news()
                         except:
                             pass
                 except Exception as e:
-                    print(f"Error getting news for {symbol}: {e}")
+                    log.warning("error getting news for %s: %s", symbol, e)
                     news = []
                 
                 if news and isinstance(news, list) and len(news) > 0:
@@ -370,180 +691,50 @@ def get_news():
                                 "link": link
                             })
                         except Exception as e:
-                            print(f"Error processing news item {idx} for {symbol}: {e}")
+                            log.debug("error processing news item %d for %s: %s", idx, symbol, e)
                             continue
-            except Exception as e:
-                print(f"Error fetching news for {symbol}:", e)
-                import traceback
-                traceback.print_exc()
+            except Exception:
+                log.exception("error fetching news for %s", symbol)
+            news_items = merge_near_duplicates(news_items)
+        elif symbols:
+            # 포트폴리오 모드: 보유 종목 뉴스를 한 번에 (Market News 와 같은 방식으로 병합)
+            news_items = _merge_news_feeds(_fetch_news_feeds(symbols), per_symbol=20)[:NEWS_MULTI_LIMIT]
         else:
-            # Market News 모드: 여러 종목의 뉴스를 모아서
-            # 같은 기사(제목+출처 기준)는 한 번만 보여주고,
-            # 관련 심볼은 실제로 그 기사가 속해 있던 심볼 + Yahoo relatedTickers 로 구성
-            major_symbols = ['AAPL', 'GOOGL', 'TSLA', 'MSFT', 'NVDA']
-            article_map = {}  # key -> article dict (related_symbols 는 set 으로 유지)
-            
-            for sym in major_symbols:
-                try:
-                    ticker = yf.Ticker(sym)
-                    news = []
-                    try:
-                        news = ticker.news
-                        if not news or not isinstance(news, list) or len(news) == 0:
-                            try:
-                                news = ticker._get_news()
-                            except:
-                                pass
-                    except Exception as e:
-                        print(f"Error getting news for {sym}: {e}")
-                        news = []
-                    
-                    time.sleep(0.5)  # Yahoo rate limit 보호
-                    
-                    if news and isinstance(news, list) and len(news) > 0:
-                        for idx, item in enumerate(news[:8]):  # 각 종목당 최대 8개
-                            if not isinstance(item, dict):
-                                continue
-                            
-                            try:
-                                content = item.get('content', {})
-                                if not isinstance(content, dict):
-                                    content = item
-                                
-                                title_val = content.get('title') or item.get('title') or content.get('headline') or ''
-                                title = str(title_val).strip() if title_val and not isinstance(title_val, dict) else ''
-                                if not title:
-                                    continue
-                                
-                                pub_val = (content.get('publisher') or content.get('publisherName') or 
-                                          content.get('provider') or item.get('publisher') or 
-                                          item.get('publisherName') or 'Market News')
-                                publisher = str(pub_val).strip() if pub_val and not isinstance(pub_val, dict) else 'Market News'
-                                if not publisher or publisher.lower() in ['unknown', '']:
-                                    publisher = 'Market News'
-                                
-                                pub_time = (content.get('providerPublishTime') or content.get('pubDate') or 
-                                           content.get('publishedAt') or content.get('pubDateUTC') or
-                                           item.get('providerPublishTime') or item.get('pubDate') or 
-                                           item.get('publishedAt') or 0)
-                                if isinstance(pub_time, str):
-                                    try:
-                                        from datetime import datetime
-                                        pub_time = int(datetime.fromisoformat(pub_time.replace('Z', '+00:00')).timestamp())
-                                    except:
-                                        pub_time = 0
-                                elif pub_time and isinstance(pub_time, (int, float)):
-                                    pub_time = int(pub_time)
-                                else:
-                                    pub_time = 0
-                                
-                                summary_val = (content.get('summary') or content.get('description') or 
-                                              content.get('text') or item.get('summary') or 
-                                              item.get('description') or title)
-                                summary = str(summary_val).strip() if summary_val and not isinstance(summary_val, dict) else title
-                                if not summary:
-                                    summary = title
-                                
-                                id_val = content.get('id') or item.get('uuid') or item.get('id') or item.get('link')
-                                base_id = str(id_val) if id_val and not isinstance(id_val, dict) else title
-                                
-                                # 기사 중복을 줄이기 위한 키 (제목 + 출처 기준)
-                                key = f"{title.strip().lower()}|{publisher.strip().lower()}"
-
-                                if key not in article_map:
-                                    # 링크 찾기
-                                    raw_link_val = (
-                                        content.get('link')
-                                        or content.get('url')
-                                        or content.get('canonicalUrl')
-                                        or content.get('clickThroughUrl')
-                                        or content.get('clickThroughURL')
-                                        or item.get('link')
-                                        or item.get('url')
-                                        or item.get('canonicalUrl')
-                                        or item.get('clickThroughUrl')
-                                        or item.get('clickThroughURL')
-                                        or ''
-                                    )
-                                    link = _normalize_link_value(raw_link_val)
-                                    if not isinstance(link, str):
-                                        link = ''
-                                    # http/https 로 시작하지 않으면 버튼을 숨기기 위해 빈 문자열 처리
-                                    if not link.startswith('http'):
-                                        link = ''
-
-                                    article_map[key] = {
-                                        "id": f"{base_id}_{hash(key)}",
-                                        "title": title,
-                                        "source": publisher,
-                                        "date": pub_time,
-                                        "summary": summary,
-                                        "impact": "neutral",
-                                        "related_symbols": set(),
-                                        "link": link,
-                                    }
-                                
-                                # 이 기사는 최소한 sym 과 연관
-                                article_map[key]["related_symbols"].add(sym)
-                                
-                                # Yahoo relatedTickers 도 추가
-                                try:
-                                    raw_related = content.get("relatedTickers") or item.get("relatedTickers") or []
-                                    if isinstance(raw_related, list):
-                                        for r in raw_related:
-                                            if not r:
-                                                continue
-                                            rsym = str(r).strip()
-                                            if not rsym:
-                                                continue
-                                            article_map[key]["related_symbols"].add(rsym)
-                                except Exception:
-                                    pass
-                            except Exception as e:
-                                print(f"Error processing news item {idx} for {sym}: {e}")
-                                continue
-                except Exception as e:
-                    print(f"Error fetching news for {sym}:", e)
-                    continue
-            
-            # map → 리스트로 변환 + 심볼 set 을 정렬된 리스트로 변경
-            all_news = []
-            for art in article_map.values():
-                syms = sorted(art["related_symbols"])
-                art["related_symbols"] = syms
-                all_news.append(art)
-            
-            all_news.sort(key=lambda x: x['date'], reverse=True)
-            news_items = all_news[:30]
+            # Market News 모드: 주요 종목 뉴스를 모아서 병합
+            news_items = _merge_news_feeds(_fetch_news_feeds(MARKET_NEWS_SYMBOLS), per_symbol=8)[:30]
         
-        # 뉴스가 없으면 에러 메시지와 함께 빈 배열 반환
-        # (mock 데이터는 사용하지 않음 - 실제 데이터만 사용)
+        # 뉴스가 없으면 (upstream 장애 포함) 마지막으로 받은 목록을 stale_since 와 함께,
+        # 그것도 없으면 빈 배열 (mock 데이터는 사용하지 않음 - 실제 데이터만 사용)
         if len(news_items) == 0:
-            print("Warning: No news items found from yfinance")
+            log.info("no news items found from yfinance (symbol=%s)", symbol or "-")
+            stale = _stale_news(snapshot_key)
+            if stale is not None:
+                return stale
+        else:
+            snapshots.news.put(snapshot_key, news_items)
         
-        return jsonify({"news": news_items})
+        return json_response({"news": news_items}, max_age=60)
     except Exception as e:
-        print("news error", e)
-        import traceback
-        traceback.print_exc()
+        stale = _stale_news(snapshot_key)
+        if stale is not None:
+            log.warning("news error, serving snapshot: %s", e)
+            return stale
+        log.exception("news error")
         return jsonify({"error": str(e), "news": []}), 500
 
 
+def _stale_news(key):
+    found = snapshots.news.get(key)
+    if found is None:
+        return None
+    items, saved_at = found
+    return json_response({"news": items, "stale": True, "stale_since": snapshots.stale_since(saved_at)}, max_age=5)
+
+
 # -----------------------------
 # GPT-5 sentiment proxy  (/api/news-sentiment)
 # -----------------------------
 
-# (OpenAI client is already set up at top of file and injected into app.config)
-
-
-
-
-openai_client = (
-    OpenAI(base_url=SENTIMENT_API_URL, api_key=SENTIMENT_API_KEY)
-    if SENTIMENT_API_KEY
-    else None
-)
-
 
 def _normalize_link_value(raw):
     """
@@ -573,37 +764,153 @@ def _normalize_link_value(raw):
 def call_openai_json(prompt: str, max_tokens: int = 800):
     """
     Helper to call the GPT-5 (mlapi) chat completion endpoint and parse JSON from content.
-    Assumes openai_client is configured as an OpenAI(base_url=..., api_key=...).
+    Goes through backend.llm_gateway, so identical prompts are cached / coalesced.
     """
-    if openai_client is None:
+    if not llm_gateway.available():
         raise RuntimeError("SENTIMENT_API_KEY not configured")
 
     # NOTE:
     # - 예전에 max_completion_tokens 를 강제로 넣었을 때, mlapi 가 content 를 빈 문자열로
     #   돌려주는 문제가 있어서 여기서는 토큰 제한을 명시적으로 주지 않는다.
     # - 모델 기본값에 맡기고, 너무 길게 나오면 프롬프트 쪽에서 길이를 제한하는 방식으로 제어한다.
-    resp = openai_client.chat.completions.create(
-        model="openai/gpt-5",
-        messages=[
-            {
-                "role": "user",
-                "content": prompt,
-            }
-        ],
+    return llm_gateway.chat(
+        [{"role": "user", "content": prompt}],
+        operation="json",
+        parse=_parse_json_content,
     )
 
-    content = (resp.choices[0].message.content or "").strip()
+
+def _parse_json_content(content: str):
+    content = (content or "").strip()
     if not content:
         raise RuntimeError("Empty GPT response content.")
-
-    import json as _json
-
     try:
-        data = _json.loads(content)
+        return json.loads(content)
     except Exception as e:
+        # 배열 끝이 잘렸거나 원소 하나가 깨진 경우: 온전한 원소만 살린다 (일부뿐이므로 캐시하지 않음)
+        items = salvage_array(content)
+        if items:
+            log.warning("salvaged %d JSON array items from malformed GPT content: %s", len(items), e)
+            return llm_gateway.Partial(items)
         raise RuntimeError(f"Failed to parse JSON from GPT content: {e}")
 
-    return data
+
+def stream_openai_json_array(prompt: str, parser=None):
+    """
+    call_openai_json 의 스트리밍 버전 (JSON 배열 전용).
+    응답이 생성되는 동안 닫힌 원소부터 하나씩 yield, 깨진 원소는 건너뛴다.
+    parser 를 넘기면 끝난 뒤 잘림(parser.done) / 깨진 원소 수(parser.broken)를 호출한 쪽에서 볼 수 있다.
+    """
+    if not llm_gateway.available():
+        raise RuntimeError("SENTIMENT_API_KEY not configured")
+    parser = parser if parser is not None else ArrayStreamParser()
+    for delta in llm_gateway.stream([{"role": "user", "content": prompt}], operation="json"):
+        yield from parser.feed(delta)
+    if parser.broken or parser.pending:
+        log.warning("GPT array stream: %d broken item(s), truncated=%s", parser.broken, parser.pending)
+
+
+def _ndjson_items(items, key, fallback=None, snapshot_key=None, complete=None):
+    """
+    검증된 원소들을 한 줄에 하나씩 ({key: item}) 내보내고 마지막에 {"done": true, "count": n}.
+    snapshot_key 를 주면 끝까지 받은 목록을 learning 스냅샷에 남기고, 하나도 못 건지면
+    스냅샷(done 줄에 stale_since)을, 그것도 없으면 fallback 을 대신 보낸다.
+    complete(sent) 가 False 면 (잘린 응답 / 깨진 원소 / 개수 부족) 보내기만 하고 스냅샷에는 남기지 않는다.
+    """
+
+    def generate():
+        n = 0
+        sent = []
+        try:
+            for item in items:
+                n += 1
+                sent.append(item)
+                yield json.dumps({key: item}, ensure_ascii=False) + "\n"
+            if sent and snapshot_key and (complete is None or complete(sent)):
+                snapshots.learning.put(snapshot_key, sent)
+        except Exception as e:
+            log.warning("%s stream error after %d item(s): %s", key, n, e)
+            yield json.dumps({"error": str(e)}) + "\n"
+        stale = _stale_learning(snapshot_key) if n == 0 and snapshot_key else None
+        if stale is not None:
+            for item in stale[0]:
+                yield json.dumps({key: item}, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "count": len(stale[0]), "stale": True,
+                              "stale_since": snapshots.stale_since(stale[1])}) + "\n"
+            return
+        if n == 0 and fallback:
+            for item in fallback:
+                yield json.dumps({key: item}, ensure_ascii=False) + "\n"
+            yield json.dumps({"done": True, "count": len(fallback), "fallback": True}) + "\n"
+            return
+        yield json.dumps({"done": True, "count": n}) + "\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _learning_complete(items, count, parser=None) -> bool:
+    """
+    스냅샷에 남겨도 되는 온전한 결과인지: 요청한 개수가 다 있고, 스트림이면 배열이 닫혔고 깨진 원소가 없어야 한다.
+    (call_openai_json 은 잘린 JSON 에서 살린 일부도 돌려주므로 개수로 거른다. 스냅샷은 warm hit 으로 그대로 서빙된다)
+    """
+    if len(items) < count:
+        return False
+    return parser is None or (parser.done and not parser.broken)
+
+
+def _stale_learning(snapshot_key):
+    """"cards:3:0" 같은 키의 스냅샷, 없으면 같은 종류("cards:")의 가장 최근 것. (items, saved_at) 또는 None"""
+    found = snapshots.learning.get(snapshot_key)
+    if found is None:
+        latest = snapshots.learning.latest(snapshot_key.split(":", 1)[0] + ":")
+        found = latest[1:] if latest is not None else None
+    return found
+
+
+def _clean_learning_card(item, card_id):
+    if not isinstance(item, dict):
+        return None
+    title = str(item.get("title", "")).strip()
+    content = str(item.get("content", "")).strip()
+    duration = str(item.get("duration", "5 min")).strip()
+    category = str(item.get("category", "Learning")).strip()
+    if not title or not content:
+        return None
+    return {
+        "id": card_id,
+        "title": title,
+        "duration": duration,
+        "category": category,
+        "content": content,
+    }
+
+
+def _clean_quiz(item):
+    if not isinstance(item, dict):
+        return None
+    question = str(item.get("question", "")).strip()
+    options = item.get("options") or []
+    if not question or not isinstance(options, list) or len(options) != 4:
+        return None
+    options_clean = [str(o or "").strip() for o in options]
+    if any(not o for o in options_clean):
+        return None
+    correct_index = item.get("correctIndex")
+    if not isinstance(correct_index, int) or not (0 <= correct_index < 4):
+        return None
+    explanation = str(item.get("explanation", "")).strip()
+    if not explanation:
+        return None
+    return {
+        "question": question,
+        "options": options_clean,
+        "correctIndex": correct_index,
+        "explanation": explanation,
+    }
 
 
 @app.route("/api/news-sentiment", methods=["POST"])
@@ -613,10 +920,6 @@ def news_sentiment():
     body: { "title": str, "summary": str, "symbols": [str] }
     응답: { "sentiment": "positive"|"negative"|"neutral" }
     """
-    # 환경변수가 없더라도 UX는 깨지지 않도록 항상 200과 neutral을 반환
-    if openai_client is None:
-        return jsonify({"sentiment": "neutral", "error": "SENTIMENT_API_KEY not configured"}), 200
-
     data = request.get_json(force=True) or {}
     title = (data.get("title") or "").strip()
     summary = (data.get("summary") or "").strip()
@@ -625,11 +928,21 @@ def news_sentiment():
     if not title and not summary:
         return jsonify({"error": "empty_text", "sentiment": "neutral"}), 400
 
+    # 같은 기사(제목 + 요약)의 라벨은 바뀌지 않으므로 스냅샷에 있으면 그대로 (재시작 / 장애 후에도)
+    snapshot_key = hashlib.sha1(f"{title}\n{summary}".encode("utf-8")).hexdigest()
+    found = snapshots.sentiment.get(snapshot_key)
+    if found is not None:
+        return jsonify({"sentiment": found[0]})
+
+    # 환경변수가 없더라도 UX는 깨지지 않도록 항상 200과 neutral을 반환
+    if not llm_gateway.available():
+        return jsonify({"sentiment": "neutral", "error": "SENTIMENT_API_KEY not configured"}), 200
+
     try:
         user_text = f"Headline: {title[:200]}\n\nSummary: {summary[:600]}\nSymbols: {', '.join(symbols) if isinstance(symbols, list) else symbols}"
 
-        resp = openai_client.chat.completions.create(
-            model="openai/gpt-5",
+        content = llm_gateway.chat(
+            operation="sentiment",
             messages=[
                 {
                     "role": "system",
@@ -645,13 +958,15 @@ def news_sentiment():
             temperature=1,
         )
 
-        raw = (resp.choices[0].message.content or "").strip().upper()
+        raw = content.strip().upper()
         if raw not in {"POSITIVE", "NEGATIVE", "NEUTRAL"}:
             raw = "NEUTRAL"
+        else:
+            snapshots.sentiment.put(snapshot_key, raw.lower())
 
         return jsonify({"sentiment": raw.lower()})
     except Exception as e:
-        print("[/api/news-sentiment] error:", e)
+        log.warning("/api/news-sentiment error: %s", e)
         # 실패해도 200으로 중립 반환 (프론트 콘솔 에러 최소화)
         return jsonify({"sentiment": "neutral", "error": str(e)}), 200
 
@@ -661,8 +976,10 @@ def dashboard_learning():
     """
     Generate 5-minute learning cards for the dashboard using GPT-5.
     Response: { "cards": [ { "title", "duration", "category", "content" }, ... ] }
+    ?stream=1: NDJSON, one {"card": {...}} line per card as soon as it is generated,
+    then {"done": true, "count": n}.
     """
-    if openai_client is None:
+    if not llm_gateway.available():
         # 키가 없으면 기본 카드만 반환 (200)
         return jsonify({"cards": []})
 
@@ -695,37 +1012,47 @@ Requirements:
 - Do not add any text before or after the JSON.
 """.strip()
 
+    # 재시작 직후에도 LLM_CACHE_TTL 안에 만든 같은 (count, seed) 카드는 스냅샷에서 바로
+    snapshot_key = f"cards:{count}:{seed}"
+    warm = snapshots.learning.get(snapshot_key, max_age=llm_gateway.LLM_CACHE_TTL)
+    stream = request.args.get("stream") == "1"
+
+    if stream:
+        parser = ArrayStreamParser()
+
+        def cards_stream():
+            if warm is not None:
+                yield from warm[0]
+                return
+            for idx, item in enumerate(stream_openai_json_array(prompt, parser)):
+                card = _clean_learning_card(item, idx + 1)
+                if card is not None:
+                    yield card
+
+        return _ndjson_items(cards_stream(), "card", snapshot_key=None if warm else snapshot_key,
+                             complete=lambda sent: _learning_complete(sent, count, parser))
+
+    if warm is not None:
+        return jsonify({"cards": warm[0]})
+
     try:
         raw = call_openai_json(prompt, max_tokens=900)
         if not isinstance(raw, list) or not raw:
             raise RuntimeError("Model returned non-list or empty result.")
 
-        cards = []
-        for idx, item in enumerate(raw):
-            if not isinstance(item, dict):
-                continue
-            title = str(item.get("title", "")).strip()
-            content = str(item.get("content", "")).strip()
-            duration = str(item.get("duration", "5 min")).strip()
-            category = str(item.get("category", "Learning")).strip()
-            if not title or not content:
-                continue
-            cards.append(
-                {
-                    "id": idx + 1,
-                    "title": title,
-                    "duration": duration,
-                    "category": category,
-                    "content": content,
-                }
-            )
+        cards = [c for c in (_clean_learning_card(item, idx + 1) for idx, item in enumerate(raw)) if c]
 
         if not cards:
             raise RuntimeError("No valid learning cards extracted from GPT output.")
 
+        if _learning_complete(cards, count):
+            snapshots.learning.put(snapshot_key, cards)
         return jsonify({"cards": cards})
     except Exception as e:
-        print("[/api/dashboard-learning] error:", e)
+        log.warning("/api/dashboard-learning error: %s", e)
+        stale = _stale_learning(snapshot_key)
+        if stale is not None:
+            return jsonify({"cards": stale[0], "stale": True, "stale_since": snapshots.stale_since(stale[1])})
         return jsonify({"error": str(e), "cards": []})
 
 
@@ -734,6 +1061,8 @@ def dashboard_quizzes():
     """
     Generate multiple-choice quiz questions for the dashboard using GPT-5.
     Response: { "quizzes": [ { "question", "options", "correctIndex", "explanation" }, ... ] }
+    ?stream=1: NDJSON, one {"quiz": {...}} line per question as it is generated,
+    then {"done": true, "count": n} (fallback quizzes with "fallback": true if none were valid).
     """
     # 기본 샘플 퀴즈 (LLM 사용 불가 시 fallback)
     fallback_quizzes = [
@@ -772,7 +1101,7 @@ def dashboard_quizzes():
         },
     ]
 
-    if openai_client is None:
+    if not llm_gateway.available():
         # 환경변수 미설정 시에도 UI가 동작하도록 샘플 반환 (200)
         return jsonify({"quizzes": fallback_quizzes})
 
@@ -805,46 +1134,165 @@ Rules:
 - Use the numeric session seed {seed} to make question sets differ between calls.
 """.strip()
 
+    snapshot_key = f"quizzes:{count}:{seed}"
+    warm = snapshots.learning.get(snapshot_key, max_age=llm_gateway.LLM_CACHE_TTL)
+
+    if request.args.get("stream") == "1":
+        parser = ArrayStreamParser()
+        if warm is not None:
+            quiz_stream = iter(warm[0])
+        else:
+            quiz_stream = (q for q in map(_clean_quiz, stream_openai_json_array(prompt, parser)) if q)
+        return _ndjson_items(quiz_stream, "quiz", fallback=fallback_quizzes,
+                             snapshot_key=None if warm else snapshot_key,
+                             complete=lambda sent: _learning_complete(sent, count, parser))
+
+    if warm is not None:
+        return jsonify({"quizzes": warm[0]})
+
     try:
         raw = call_openai_json(prompt, max_tokens=900)
         if not isinstance(raw, list) or not raw:
             raise RuntimeError("Model returned non-list or empty result.")
 
-        quizzes = []
-        for item in raw:
-            if not isinstance(item, dict):
-                continue
-            question = str(item.get("question", "")).strip()
-            options = item.get("options") or []
-            if not question or not isinstance(options, list) or len(options) != 4:
-                continue
-            options_clean = [str(o or "").strip() for o in options]
-            if any(not o for o in options_clean):
-                continue
-            correct_index = item.get("correctIndex")
-            if not isinstance(correct_index, int) or not (0 <= correct_index < 4):
-                continue
-            explanation = str(item.get("explanation", "")).strip()
-            if not explanation:
-                continue
-            quizzes.append(
-                {
-                    "question": question,
-                    "options": options_clean,
-                    "correctIndex": correct_index,
-                    "explanation": explanation,
-                }
-            )
+        quizzes = [q for q in (_clean_quiz(item) for item in raw) if q]
 
         if not quizzes:
             raise RuntimeError("No valid quizzes extracted from GPT output.")
 
+        if _learning_complete(quizzes, count):
+            snapshots.learning.put(snapshot_key, quizzes)
         return jsonify({"quizzes": quizzes})
     except Exception as e:
-        print("[/api/dashboard-quizzes] error:", e)
+        log.warning("/api/dashboard-quizzes error: %s", e)
+        stale = _stale_learning(snapshot_key)
+        if stale is not None:
+            return jsonify({"quizzes": stale[0], "stale": True, "stale_since": snapshots.stale_since(stale[1])})
         # 실패 시에도 앱이 멈추지 않도록 fallback 반환 (200)
         return jsonify({"error": str(e), "quizzes": fallback_quizzes})
 
+def _dispatch_json(endpoint, args):
+    """
+    같은 프로세스 안에서 다른 GET 라우트를 호출하고 (status, JSON body) 를 돌려준다 (before / after 훅은 타지 않음).
+    app context 를 새로 열어야 바깥 요청의 g 를 같이 쓰지 않는다 (teardown 훅이 g 값을 꺼내 감).
+    """
+    with app.app_context(), app.test_request_context(query_string=args):
+        resp = app.make_response(app.view_functions[endpoint]())
+        return resp.status_code, resp.get_json(silent=True)
+
+
+def _dashboard_section(name, symbols, count, seed):
+    """(status, body, 걸린 초)"""
+    started = time.perf_counter()
+    status, body = _fetch_dashboard_section(name, symbols, count, seed)
+    return status, body, time.perf_counter() - started
+
+
+def _fetch_dashboard_section(name, symbols, count, seed):
+    if name == "quotes":
+        quotes = fetch_quotes(symbols) if symbols else {}
+        return 200, {"quotes": quotes, "missing": [s for s in symbols if s not in quotes]}
+    if name == "news":
+        return _dispatch_json("get_news", {"symbols": ",".join(symbols)} if symbols else {})
+    endpoint = "dashboard_learning" if name == "learning" else "dashboard_quizzes"
+    return _dispatch_json(endpoint, {"count": count, "seed": seed})
+
+
+def _submit_dashboard_section(name, symbols, count, seed):
+    """
+    구역 pool 에 제출하고 Future 를 돌려준다.
+    같은 인자로 아직 도는 호출(앞선 요청에서 시간을 넘긴 것 포함)이 있으면 새로 제출하지 않고 그 Future 를 쓴다.
+    그 구역의 실행 + 대기 자리가 다 찼으면 None.
+    """
+    key = (name, tuple(symbols)) if name in ("quotes", "news") else (name, count, seed)
+    with _dashboard_lock:
+        future = _dashboard_inflight.get(key)
+        if future is not None:
+            return future
+        if not _dashboard_slots[name].acquire(blocking=False):
+            return None
+        pool = _dashboard_pools.get(name)
+        if pool is None:
+            pool = _dashboard_pools[name] = ThreadPoolExecutor(
+                max_workers=DASHBOARD_SECTION_WORKERS, thread_name_prefix=f"dashboard-{name}"
+            )
+        future = pool.submit(contextvars.copy_context().run, _dashboard_section, name, symbols, count, seed)
+        _dashboard_inflight[key] = future
+    future.add_done_callback(lambda f: _dashboard_section_done(name, key, f))
+    return future
+
+
+def _dashboard_section_done(name, key, future):
+    with _dashboard_lock:
+        if _dashboard_inflight.get(key) is future:
+            del _dashboard_inflight[key]
+    _dashboard_slots[name].release()
+
+
+def _section_result(future):
+    status, body, elapsed = future.result(timeout=0)
+    body = body or {}
+    if status >= 400 or body.get("error"):
+        state = "error"
+    elif body.get("stale") or any(q.get("stale_since") for q in (body.get("quotes") or {}).values()):
+        state = "stale"
+    else:
+        state = "ok"
+    return dict(body, status=state, ms=round(elapsed * 1000, 1))
+
+
+@app.route("/api/dashboard", methods=["GET"])
+def dashboard_bundle():
+    """
+    대시보드에 필요한 시세 / 뉴스 / 학습 카드 / 퀴즈를 한 번에.
+    ?symbols=A,B,C (시세 + 포트폴리오 뉴스, 없으면 Market News) &count=3&seed=0
+    &sections=quotes,news (기본은 전부)
+
+    구역들은 동시에 가져오고 각자 DASHBOARD_TIMEOUTS 초까지만 기다리므로 응답 시간은 합이 아니라
+    가장 느린 구역 (또는 그 제한 시간). 끝난 구역만 담고, 구역마다 status 를 붙인다:
+      ok | stale (스냅샷으로 대체, stale_since 포함) | error | timeout | busy (그 구역 pool 이 꽉 참)
+    시간을 넘긴 호출은 백그라운드에서 끝까지 돌아 캐시 / 스냅샷을 채우고, 그동안 같은 인자의 요청은 그 호출을 같이 기다린다.
+    """
+    symbols = normalize_symbols(request.args.get("symbols", "").split(","))
+    if len(symbols) > MAX_NEWS_SYMBOLS:
+        return jsonify({"error": f"at most {MAX_NEWS_SYMBOLS} symbols are supported"}), 400
+    sections = [s for s in DASHBOARD_SECTIONS
+                if s in request.args.get("sections", ",".join(DASHBOARD_SECTIONS)).split(",")]
+    if not sections:
+        return jsonify({"error": "sections must be any of: " + ", ".join(DASHBOARD_SECTIONS)}), 400
+    try:
+        count = int(request.args.get("count", "3"))
+        seed = int(request.args.get("seed", "0"))
+    except ValueError:
+        return jsonify({"error": "count and seed must be integers"}), 400
+
+    started = time.perf_counter()
+    futures = {name: _submit_dashboard_section(name, symbols, count, seed) for name in sections}
+
+    result = {}
+    for name in sorted(sections, key=DASHBOARD_TIMEOUTS.get):
+        future = futures[name]
+        if future is None:
+            result[name] = {"status": "busy", "ms": 0.0}
+            continue
+        remaining = started + DASHBOARD_TIMEOUTS[name] - time.perf_counter()
+        try:
+            future.result(timeout=max(0.0, remaining))
+        except FuturesTimeout:
+            result[name] = {"status": "timeout", "ms": round(DASHBOARD_TIMEOUTS[name] * 1000, 1)}
+            continue
+        except Exception as e:
+            log.warning("/api/dashboard %s error: %s", name, e)
+            result[name] = {"status": "error", "error": str(e),
+                            "ms": round((time.perf_counter() - started) * 1000, 1)}
+            continue
+        result[name] = _section_result(future)
+
+    return json_response({
+        "sections": {name: result[name] for name in sections},
+        "ms": round((time.perf_counter() - started) * 1000, 1),
+    })
+
 # -----------------------------
 # Qwen Finsec proxy endpoint
 # -----------------------------
@@ -864,7 +1312,6 @@ def security_chat():
     프론트에서 body:
       { "history": [ { "role": "user"|"model", "content": "..." }, ... ] }
     """
-    print(">>> /api/security-chat hit, method =", request.method)
 
     # 브라우저 Preflight(OPTIONS) 대응
     if request.method == "OPTIONS":
@@ -882,11 +1329,25 @@ def security_chat():
     prev_history = history[:-1]
 
     prompt = build_security_prompt(prev_history, user_message)
-    print("[DEBUG] prompt head:", prompt[:200], "...")
+    # 대화 내용은 남기지 않고 크기만 기록
+    log.debug("security-chat prompt: %d chars, %d prior turns", len(prompt), len(prev_history))
 
     answer = call_qwen_finsec_model(MY_API_URL, MY_API_KEY, prompt)
     return jsonify({"answer": answer})
 
+metrics.STARTUP_SECONDS.set(startup.record_ready())
+
+
+def create_app():
+    """
+    gunicorn app factory: gunicorn --preload -c gunicorn.conf.py 'yfinance_api:create_app()'
+    --preload 면 master 에서 한 번만 불려 읽기 전용 데이터를 fork 전에 만들고 GC freeze 한다.
+    """
+    timings = preload.warm()
+    frozen = preload.freeze()
+    log.info("preloaded shared data %s, %d objects frozen, memory %s", timings, frozen, preload.memory_report())
+    return app
+
 if __name__ == "__main__":
     # 기존 yfinance + Qwen 프록시 엔드포인트들을 모두 포함한 서버
     app.run(host="0.0.0.0", port=5002, debug=True)
\ No newline at end of file